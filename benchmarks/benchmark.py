@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+'''
+Offline benchmarks of the public API hot paths
+
+The requests are answered from the mock responses of the test suite by a
+CallbackTransport, so the full request stack runs but nothing leaves the
+machine. For each benchmark the number of requests per call, the wall and
+CPU time, and the peak memory are reported; the import time of the package
+is measured in a fresh interpreter, and each installed JSON decoder is
+timed on the recorded responses. The memory used by a loaded page is
+reported with and without compact pages, along with the memory of a page
+handle.
+
+Requires python 3.4+. Usage, from the repository root:
+
+  $ python benchmarks/benchmark.py --repeat 20 --output results.json
+  $ python benchmarks/benchmark.py --compare results.json
+  $ python benchmarks/benchmark.py --recording traffic.jsonl.gz
+'''
+from __future__ import print_function
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wikipedia
+from wikipedia import wikipedia as wiki
+from wikipedia.transport import CallbackTransport, recorded_content
+from wikipedia.util import JSON_DECODERS, json_decoder, approximate_size
+from tests.request_mock_data import mock_data
+
+MOCK_CALLS = mock_data['_wiki_request calls']
+
+
+class MockServer(object):
+  ''' answer the requests from the mock data and count them '''
+
+  def __init__(self):
+    self.requests = 0
+
+  def __call__(self, url, params):
+    self.requests += 1
+    params = dict(params)
+    params.pop('format', None)
+    key = tuple(sorted(params.items()))
+    # the mock data omits the default action
+    if key not in MOCK_CALLS and params.get('action') == 'query':
+      del params['action']
+      key = tuple(sorted(params.items()))
+    return MOCK_CALLS[key]
+
+
+def setup_offline(server):
+  ''' route all requests to the mock server '''
+  wiki.set_transport(CallbackTransport(server))
+  wiki.set_response_cache(None)
+  wiki.set_rate_limiting(False)
+  wiki.set_retry_policy(max_retries=0)
+  wiki.WIKIPEDIA_GLOBALS['API_VERSION'] = '1.28.0'
+  wiki.WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = (1, 28,)
+  wiki.WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'] = ['TextExtracts', 'GeoData']
+
+
+def disambiguation():
+  ''' load a disambiguation page and parse its options '''
+  try:
+    wikipedia.page("Dodge Ram (disambiguation)", auto_suggest=False, redirect=False)
+  except wikipedia.DisambiguationError as e:
+    return e.options
+
+
+def cyclone_sections():
+  ''' load a page and its content outside of the timed call '''
+  cyclone = wikipedia.page("Tropical Depression Ten (2005)", auto_suggest=False)
+  cyclone.content
+  return cyclone
+
+
+def section_lookups(cyclone):
+  ''' look up every section of the page '''
+  return [cyclone.section(title) for title in cyclone.sections]
+
+
+# (name, setup, benchmark); the result of setup (if any) is passed to the benchmark
+BENCHMARKS = [
+  ('page', None, lambda: wikipedia.page("Celtuce")),
+  ('page(auto_suggest=False)', None, lambda: wikipedia.page("Tropical Depression Ten (2005)", auto_suggest=False)),
+  ('page(preload=True)', None, lambda: wikipedia.page("Tropical Depression Ten (2005)", auto_suggest=False, preload=True)),
+  ('summary', None, lambda: wikipedia.summary("Celtuce")),
+  ('search', None, lambda: wikipedia.search("Barack Obama")),
+  ('categorytree(depth=1)', None, lambda: wikipedia.categorytree("Mechanics", depth=1)),
+  ('categorytree(depth=2)', None, lambda: wikipedia.categorytree("Mechanics", depth=2)),
+  ('categorytree(depth=3)', None, lambda: wikipedia.categorytree("Mechanics", depth=3)),
+  ('disambiguation', None, disambiguation),
+  ('section', cyclone_sections, section_lookups),
+]
+
+
+def run_benchmark(server, setup, benchmark, repeat):
+  ''' time `repeat` cold calls, then measure the peak memory of one more '''
+  walls = list()
+  cpus = list()
+  for _ in range(repeat):
+    wiki.clear_cache()
+    args = (setup(),) if setup else ()
+    server.requests = 0
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    benchmark(*args)
+    cpus.append(time.process_time() - cpu)
+    walls.append(time.perf_counter() - wall)
+  requests = server.requests
+
+  wiki.clear_cache()
+  args = (setup(),) if setup else ()
+  tracemalloc.start()
+  benchmark(*args)
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+
+  walls.sort()
+  return {
+    'requests': requests,
+    'wall_min': walls[0],
+    'wall_median': walls[len(walls) // 2],
+    'cpu_mean': sum(cpus) / len(cpus),
+    'peak_memory': peak
+  }
+
+
+def import_time(repeat):
+  ''' the fastest time to import the package in a fresh interpreter '''
+  code = 'import time; start = time.perf_counter(); import wikipedia; print(time.perf_counter() - start)'
+  times = list()
+  for _ in range(repeat):
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    times.append(float(output.decode('utf-8').strip()))
+  return min(times)
+
+
+def recorded_responses(recording=None):
+  ''' the raw bodies of the mock responses, or of the responses in a RecordingTransport file '''
+  if recording is None:
+    return [json.dumps(response).encode('utf-8') for response in MOCK_CALLS.values()]
+  with gzip.open(recording, 'rb') as f:
+    return [recorded_content(json.loads(line.decode('utf-8'))) for line in f]
+
+
+def decoder_times(repeat, recording=None):
+  ''' the fastest time for each installed JSON decoder to decode all of the recorded responses '''
+  bodies = recorded_responses(recording)
+  results = {'responses': len(bodies), 'bytes': sum(len(body) for body in bodies), 'decoders': dict()}
+  for name in JSON_DECODERS:
+    try:
+      decode = json_decoder(name)
+    except ImportError:
+      continue
+    times = list()
+    for _ in range(repeat):
+      start = time.perf_counter()
+      for body in bodies:
+        decode(body)
+      times.append(time.perf_counter() - start)
+    results['decoders'][name] = min(times)
+  return results
+
+
+def page_memory():
+  ''' the bytes used by a page with its content and HTML loaded, with and without compact pages '''
+  results = dict()
+  for compact in (False, True):
+    wiki.set_compact_pages(compact)
+    wiki.clear_cache()
+    celtuce = wikipedia.page("Celtuce")
+    celtuce.content
+    celtuce.html()
+    results['compact' if compact else 'default'] = celtuce.memory_usage()
+  wiki.set_compact_pages(False)
+  return results
+
+
+def handle_memory(count=10000):
+  ''' the bytes per object of `count` pages and of their handles, as loaded without any property '''
+  wiki.clear_cache()
+  results = dict()
+  for name, build in (('page', lambda page: page), ('handle', lambda page: page.handle())):
+    page = wikipedia.page("Celtuce")
+    tracemalloc.start()
+    objects = [build(page.handle().page()) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    results[name] = {'traced': size / float(count), 'approximate': approximate_size(objects[0])}
+  return results
+
+
+def run(repeat, names=None, recording=None):
+  ''' run the benchmarks and return the results as a dict '''
+  server = MockServer()
+  setup_offline(server)
+
+  results = dict()
+  for name, setup, benchmark in BENCHMARKS:
+    if names and name not in names:
+      continue
+    results[name] = run_benchmark(server, setup, benchmark, repeat)
+  memory = page_memory()
+  handles = handle_memory()
+
+  return {
+    'version': wikipedia.__version__,
+    'python': platform.python_version(),
+    'platform': platform.platform(),
+    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    'repeat': repeat,
+    'import_time': import_time(min(repeat, 5)),
+    'json_decoding': decoder_times(repeat, recording),
+    'page_memory': memory,
+    'handle_memory': handles,
+    'benchmarks': results
+  }
+
+
+def report(results, baseline=None):
+  ''' print the results, with the change from the baseline results if given '''
+  print('wikipedia {0}, python {1}, {2} runs'.format(results['version'], results['python'], results['repeat']))
+  print('import time: {0:.2f} ms'.format(results['import_time'] * 1000))
+  print('{0:<28} {1:>8} {2:>12} {3:>12} {4:>12} {5:>10}'.format(
+    'benchmark', 'requests', 'median (ms)', 'min (ms)', 'cpu (ms)', 'peak (KB)'))
+  for name, result in results['benchmarks'].items():
+    line = '{0:<28} {1:>8} {2:>12.3f} {3:>12.3f} {4:>12.3f} {5:>10.1f}'.format(
+      name, result['requests'], result['wall_median'] * 1000, result['wall_min'] * 1000,
+      result['cpu_mean'] * 1000, result['peak_memory'] / 1024.0)
+    previous = (baseline or dict()).get('benchmarks', dict()).get(name)
+    if previous:
+      line += '  {0:+.0%} time, {1:+d} requests'.format(
+        result['wall_median'] / previous['wall_median'] - 1, result['requests'] - previous['requests'])
+    print(line)
+
+  print('page memory (KB):')
+  for mode, usage in sorted(results['page_memory'].items()):
+    print('  {0:<8} html {1:>8.1f}  content {2:>8.1f}  total {3:>8.1f}'.format(
+      mode, usage['html'] / 1024.0, usage['content'] / 1024.0, usage['total'] / 1024.0))
+
+  print('bytes per page object:')
+  for kind, usage in sorted(results['handle_memory'].items()):
+    print('  {0:<8} traced {1:>8.1f}  approximate {2:>8.1f}'.format(kind, usage['traced'], usage['approximate']))
+
+  decoding = results['json_decoding']
+  stdlib = decoding['decoders']['json']
+  print('JSON decoding of {0} responses ({1:.1f} KB):'.format(decoding['responses'], decoding['bytes'] / 1024.0))
+  for name, seconds in sorted(decoding['decoders'].items(), key=lambda item: item[1]):
+    print('  {0:<8} {1:>10.3f} ms  {2:>5.1f}x'.format(name, seconds * 1000, stdlib / seconds))
+
+
+def main():
+  ''' command line entry point '''
+  parser = argparse.ArgumentParser(description='Run the offline wikipedia benchmarks')
+  parser.add_argument('--repeat', type=int, default=10, help='the number of timed runs of each benchmark')
+  parser.add_argument('--output', help='save the results as JSON to this file')
+  parser.add_argument('--compare', help='compare with the results saved in this file')
+  parser.add_argument('--recording', help='time the JSON decoders on the responses of this RecordingTransport file')
+  parser.add_argument('names', nargs='*', help='only run these benchmarks')
+  args = parser.parse_args()
+
+  results = run(args.repeat, args.names, args.recording)
+  baseline = None
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+  report(results, baseline)
+
+  if args.output:
+    with open(args.output, 'w') as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+  main()
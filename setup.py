@@ -30,6 +30,10 @@ setuptools.setup(
   keywords = "python wikipedia API",
   url = "https://github.com/barrust/Wikipedia",
   install_requires = install_reqs,
+  extras_require = {
+    'async': ['aiohttp>=3.0'],
+    'fast': ['orjson'],
+  },
   packages = ['wikipedia'],
   long_description = local_file('README.rst').read(),
   classifiers = [
@@ -37,7 +41,16 @@ setuptools.setup(
     'Topic :: Software Development :: Libraries',
     'License :: OSI Approved :: MIT License',
     'Programming Language :: Python',
-    'Programming Language :: Python :: 3'
+    'Programming Language :: Python :: 2',
+    'Programming Language :: Python :: 2.7',
+    'Programming Language :: Python :: 3',
+    'Programming Language :: Python :: 3.3',
+    'Programming Language :: Python :: 3.4',
+    'Programming Language :: Python :: 3.5',
+    'Programming Language :: Python :: 3.6',
+    'Programming Language :: Python :: 3.7',
+    'Programming Language :: Python :: 3.8',
+    'Framework :: AsyncIO'
   ],
   test_suite="tests"
 )
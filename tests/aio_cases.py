@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+'''
+Tests of the asyncio client; requires python 3.5+, so only imported by aio_test.py on python 3.5+
+'''
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from wikipedia import wikipedia
+from wikipedia.aio import AsyncWikipedia, AsyncWikipediaPage
+from .request_mock_data import mock_data
+
+# the mock data keyed by the parameters as sent over HTTP
+HTTP_MOCK_DATA = dict()
+for key, value in mock_data["_wiki_request calls"].items():
+  params = dict(key, format='json')
+  params.setdefault('action', 'query')
+  HTTP_MOCK_DATA[tuple(sorted((name, '{0}'.format(param)) for name, param in params.items()))] = value
+
+
+class MockAsyncWikipedia(AsyncWikipedia):
+  ''' AsyncWikipedia with the HTTP requests served from the mock data '''
+
+  def __init__(self, *args, **kwargs):
+    super(MockAsyncWikipedia, self).__init__(*args, **kwargs)
+    self.api_version = '1.28'
+    self.api_version_major_minor = [1, 28]
+    self.installed_extensions = set(['TextExtracts', 'GeoData'])
+    self.calls = defaultdict(int)
+    self.failures = list()
+
+  async def _fetch(self, params):
+    ''' _fetch override; the queued failures are returned first '''
+    self.calls[params.__str__()] += 1
+    await asyncio.sleep(0)
+    if self.failures:
+      return self.failures.pop(0)
+    response = HTTP_MOCK_DATA[tuple(sorted((name, '{0}'.format(param)) for name, param in params.items()))]
+    return 200, dict(), json.dumps(response).encode('utf-8')
+
+
+def run(coroutine):
+  ''' run a coroutine to completion '''
+  loop = asyncio.new_event_loop()
+  try:
+    return loop.run_until_complete(coroutine)
+  finally:
+    loop.close()
+
+
+class TestAsyncWikipedia(unittest.TestCase):
+  """Test the functionality of the asyncio client."""
+
+  def setUp(self):
+    ''' set up the mocked client '''
+    self.wiki = MockAsyncWikipedia()
+
+  def test_search(self):
+    """Test parsing a Wikipedia request result."""
+    self.assertEqual(run(self.wiki.search("Barack Obama")), mock_data['data']["barack.search"])
+
+  def test_suggestion(self):
+    """Test getting a suggestion as well as search results."""
+    search, suggestion = run(self.wiki.search("hallelulejah", suggestion=True))
+    self.assertEqual(search, [])
+    self.assertEqual(suggestion, u'hallelujah')
+
+  def test_geosearch(self):
+    """Test parsing a Wikipedia location request result."""
+    self.assertEqual(
+      run(self.wiki.geosearch(Decimal('40.67693'), Decimal('117.23193'), radius=10000)),
+      mock_data['data']["great_wall_of_china.geo_seach_with_radius"]
+    )
+
+  def test_summary(self):
+    """Test the summary."""
+    self.assertEqual(run(self.wiki.summary("Celtuce")), mock_data['data']["celtuce.summary"])
+
+  def test_page_errors(self):
+    """Test that page raises the same errors as the module level API."""
+    self.assertRaises(wikipedia.PageError, run, self.wiki.page("purpleberry", auto_suggest=False))
+    self.assertRaises(wikipedia.RedirectError, run, self.wiki.page("Menlo Park, New Jersey", auto_suggest=False, redirect=False))
+    self.assertRaises(wikipedia.DisambiguationError, run, self.wiki.page("Dodge Ram (disambiguation)", auto_suggest=False))
+
+  def test_redirect(self):
+    """Test that a page successfully redirects a query."""
+    mp = run(self.wiki.page("Menlo Park, New Jersey"))
+    self.assertEqual(mp.title, "Edison, New Jersey")
+    self.assertEqual(mp.url, "http://en.wikipedia.org/wiki/Edison,_New_Jersey")
+
+  def test_properties(self):
+    """Test the awaitable page properties."""
+    async def load():
+      page = await self.wiki.page("Celtuce")
+      return page, await asyncio.gather(page.content, page.revision_id, page.links, page.categories, page.references)
+
+    page, (content, revid, links, categories, references) = run(load())
+    self.assertIsInstance(page, AsyncWikipediaPage)
+    self.assertEqual(content, mock_data['data']["celtuce.content"])
+    self.assertEqual(revid, mock_data['data']["celtuce.revid"])
+    self.assertEqual(links, mock_data['data']["celtuce.links"])
+    self.assertEqual(categories, mock_data['data']["celtuce.categories"])
+    self.assertEqual(references, mock_data['data']["celtuce.references"])
+    # content and revision_id share one request
+    self.assertEqual(sum(count for call, count in self.wiki.calls.items() if 'extracts|revisions' in call), 1)
+
+  def test_concurrent(self):
+    """Test that many lookups may be in flight at once."""
+    async def load():
+      titles = ["Celtuce", "Tropical Depression Ten (2005)", "Great Wall of China"]
+      pages = await asyncio.gather(*[self.wiki.page(title) for title in titles])
+      return [page.title for page in pages]
+
+    self.assertEqual(run(load()), ["Celtuce", "Tropical Depression Ten (2005)", "Great Wall of China"])
+
+
+class TestAsyncRequests(unittest.TestCase):
+  """Test that the asyncio client uses the retry policy, rate limiter, and response cache."""
+
+  def setUp(self):
+    ''' set up the mocked client '''
+    self.wiki = MockAsyncWikipedia()
+    self.tmpdir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    ''' turn the response cache and rate limiting back off '''
+    wikipedia.set_response_cache(None)
+    wikipedia.set_rate_limiting(False)
+    shutil.rmtree(self.tmpdir)
+
+  def test_retry(self):
+    """Test that transient failures are retried with the retry policy in use."""
+    lagged = json.dumps({'error': {'code': 'maxlag', 'info': 'Waiting for a database server'}}).encode('utf-8')
+    self.wiki.failures = [(503, dict(), b'<html>error</html>'), (200, {'Retry-After': '0'}, lagged)]
+    with wikipedia.using_retry_policy(max_retries=2, backoff_factor=0.001, jitter=False):
+      self.assertEqual(run(self.wiki.search("Barack Obama")), mock_data['data']["barack.search"])
+    self.assertEqual(sum(self.wiki.calls.values()), 3)
+
+    self.wiki.failures = [(200, {'Retry-After': '0'}, lagged)]
+    with wikipedia.using_retry_policy(max_retries=0):
+      self.assertEqual(run(self.wiki._request({'list': 'random'}))['error']['code'], 'maxlag')
+
+  def test_response_cache(self):
+    """Test that responses are stored in and served from the response cache."""
+    wikipedia.set_response_cache(os.path.join(self.tmpdir, 'responses.sqlite'))
+    run(self.wiki.summary("Celtuce"))
+    requests = sum(self.wiki.calls.values())
+    self.assertEqual(run(self.wiki.summary("Celtuce")), mock_data['data']["celtuce.summary"])
+    self.assertEqual(sum(self.wiki.calls.values()), requests)
+
+  def test_response_cache_executor(self):
+    """Test that the blocking response cache is used off the event loop thread."""
+    wikipedia.set_response_cache(os.path.join(self.tmpdir, 'responses.sqlite'))
+    response_cache = wikipedia.get_response_cache()
+    threads = list()
+
+    def recording(method):
+      ''' record the thread calling the response cache method '''
+      def call(*args):
+        threads.append((method.__name__, threading.current_thread()))
+        return method(*args)
+      return call
+
+    response_cache.get = recording(response_cache.get)
+    response_cache.set = recording(response_cache.set)
+    run(self.wiki.search("Barack Obama"))
+    self.assertEqual([name for name, thread in threads], ['get', 'set'])
+    self.assertTrue(all(thread is not threading.current_thread() for name, thread in threads))
+
+  def test_rate_limit(self):
+    """Test that requests wait on the shared rate limiter."""
+    async def search():
+      return await asyncio.gather(*[self.wiki.search("Barack Obama") for _ in range(3)])
+
+    wikipedia.set_rate_limiting(True, min_wait=timedelta(milliseconds=20))
+    start = time.time()
+    self.assertEqual(run(search()), [mock_data['data']["barack.search"]] * 3)
+    self.assertTrue(time.time() - start >= 0.035)
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+import sys
+import unittest
+
+# the asyncio client and its tests use async / await, a syntax error before python 3.5
+if sys.version_info >= (3, 5):
+  from .aio_cases import TestAsyncWikipedia, TestAsyncRequests
+else:
+  @unittest.skip('the asyncio client requires python 3.5+')
+  class TestAsyncWikipedia(unittest.TestCase):
+    """Test the functionality of the asyncio client."""
+
+    def test_requires_python_35(self):
+      """The asyncio client is not available before python 3.5."""
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import inspect
+import time
+import unittest
+
+from wikipedia import wikipedia
+from wikipedia.util import cache
+
+
+class TestCache(unittest.TestCase):
+  """Test the functionality of the util.cache decorator."""
+
+  def setUp(self):
+    ''' set up a counting function to be cached '''
+    self.calls = list()
+
+    def lookup(query, results=10, suggestion=False):
+      ''' record each real call '''
+      self.calls.append((query, results, suggestion))
+      return [query] * results
+
+    self.lookup = lookup
+
+  def test_canonical_keys(self):
+    """Test that positional, keyword, and default arguments share an entry."""
+    cached = cache(self.lookup)
+    cached("x", 10)
+    cached("x", results=10)
+    cached("x")
+    cached(query="x", suggestion=False)
+    self.assertEqual(len(self.calls), 1)
+    cached("x", 1)
+    self.assertEqual(len(self.calls), 2)
+
+  @unittest.skipUnless(hasattr(inspect, 'BoundArguments'), 'requires inspect.signature')
+  def test_canonical_keys_without_apply_defaults(self):
+    """Test that the keys are canonical where BoundArguments has no apply_defaults (python 3.3 and 3.4)."""
+    apply_defaults = inspect.BoundArguments.__dict__['apply_defaults']
+    del inspect.BoundArguments.apply_defaults
+    try:
+      cached = cache(self.lookup)
+      cached("x", 10)
+      cached("x", suggestion=False)
+      cached("x", 10, False)
+      cached(suggestion=False, query="x", results=10)
+      self.assertEqual(len(self.calls), 1)
+      cached("x", suggestion=True)
+      self.assertEqual(len(self.calls), 2)
+    finally:
+      inspect.BoundArguments.apply_defaults = apply_defaults
+
+  def test_lru_eviction(self):
+    """Test that the least recently used result is evicted at maxsize."""
+    cached = cache(maxsize=2)(self.lookup)
+    cached("a")
+    cached("b")
+    cached("a")  # a is now the most recently used
+    cached("c")  # evicts b
+    self.assertEqual(len(cached._cache), 2)
+    cached("a")
+    self.assertEqual(len(self.calls), 3)
+    cached("b")
+    self.assertEqual(len(self.calls), 4)
+
+  def test_ttl(self):
+    """Test that expired results are fetched again."""
+    cached = cache(ttl=0.01)(self.lookup)
+    cached("a")
+    cached("a")
+    self.assertEqual(len(self.calls), 1)
+    time.sleep(0.02)
+    cached("a")
+    self.assertEqual(len(self.calls), 2)
+
+  def test_set_limits(self):
+    """Test that shrinking the cache trims it to the new size."""
+    cached = cache(self.lookup)
+    for query in ("a", "b", "c"):
+      cached(query)
+    cached.set_limits(maxsize=1)
+    self.assertEqual(len(cached._cache), 1)
+    cached("c")
+    self.assertEqual(len(self.calls), 3)
+
+  def test_set_one_limit(self):
+    """Test that the limits not passed to set_limits are left unchanged."""
+    cached = cache(self.lookup)
+    cached.set_limits(maxsize=10, ttl=60)
+    cached.set_limits(maxsize=5000)
+    self.assertEqual((cached.maxsize, cached.ttl), (5000, 60))
+    cached.set_limits(ttl=None)
+    self.assertEqual((cached.maxsize, cached.ttl), (5000, None))
+
+  def test_clear_cache(self):
+    """Test that clearing the cache forces a new call."""
+    cached = cache(self.lookup)
+    cached("a")
+    cached.clear_cache()
+    cached("a")
+    self.assertEqual(len(self.calls), 2)
+    self.assertEqual(cached.__name__, 'lookup')
+
+  def test_cache_info(self):
+    """Test the hit, miss, eviction, and expiration counts."""
+    cached = cache(maxsize=1, ttl=0.01)(self.lookup)
+    cached("a")
+    cached("a")
+    cached("b")  # evicts a
+    time.sleep(0.02)
+    cached("b")  # expired
+    info = cached.cache_info()
+    self.assertEqual((info['hits'], info['misses']), (1, 3))
+    self.assertEqual(info['hit_rate'], 0.25)
+    self.assertEqual((info['evictions'], info['expirations']), (1, 1))
+    self.assertEqual((info['size'], info['maxsize']), (1, 1))
+    self.assertTrue(info['memory'] > 0)
+
+    cached.clear_cache()
+    self.assertEqual(cached.cache_info()['size'], 0)
+    self.assertEqual(cached.cache_info()['misses'], 3)
+    cached.reset_stats()
+    self.assertEqual(cached.cache_info()['misses'], 0)
+    self.assertEqual(cached.cache_info()['hit_rate'], None)
+
+
+class TestCacheStats(unittest.TestCase):
+  """Test the module level cache statistics."""
+
+  def test_cache_stats(self):
+    """Test that every cached function is reported."""
+    wikipedia.reset_cache_stats()
+    stats = wikipedia.cache_stats()
+    self.assertEqual(list(stats), ['search', 'suggest', 'summary', 'categorymembers', 'geosearch',
+                                   'opensearch', 'prefexsearch', 'languages'])
+    self.assertTrue(all(info['hits'] == 0 and info['misses'] == 0 for info in stats.values()))
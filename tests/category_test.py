@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wikipedia import wikipedia
+from .request_mock_data import mock_data
+
+
+# mock out _wiki_request
+def _wiki_request(params):
+  ''' _wiki_request override '''
+  return mock_data["_wiki_request calls"][tuple(sorted(params.items()))]
+wikipedia._wiki_request = _wiki_request
+wikipedia.WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = (1,28,)
+wikipedia.WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'] = ['TextExtracts', 'GeoData']
+
+
+class TestCategoryTree(unittest.TestCase):
+  """Test the functionality of wikipedia.categorytree."""
+
+  def test_depth(self):
+    """Test that sub-categories below depth are not expanded."""
+    tree = wikipedia.categorytree("Mechanics", depth=1)
+    mechanics = tree["Mechanics"]
+    self.assertEqual(mechanics['depth'], 0)
+    self.assertEqual(mechanics['links'], ['Force', 'Motion'])
+    self.assertEqual(mechanics['parent-categories'], ['Physics'])
+    self.assertEqual(sorted(mechanics['sub-categories']), ['Classical mechanics', 'Fluid mechanics'])
+
+    fluid = mechanics['sub-categories']['Fluid mechanics']
+    self.assertEqual(fluid['depth'], 1)
+    self.assertEqual(fluid['links'], ['Fluid'])
+    self.assertEqual(fluid['parent-categories'], ['Mechanics', 'Fluid dynamics'])
+    self.assertEqual(fluid['sub-categories'], {'Aerodynamics': None})
+
+  def test_full_tree(self):
+    """Test the full tree with a cycle back to the root."""
+    tree = wikipedia.categorytree("Mechanics", depth=0)
+    subcats = tree["Mechanics"]['sub-categories']
+    self.assertEqual(subcats['Classical mechanics']['sub-categories'], {'Mechanics': None})
+
+    aerodynamics = subcats['Fluid mechanics']['sub-categories']['Aerodynamics']
+    self.assertEqual(aerodynamics, {
+      'depth': 2,
+      'links': ['Lift (force)'],
+      'parent-categories': ['Fluid mechanics'],
+      'sub-categories': dict()
+    })
+
+  def test_list_of_categories(self):
+    """Test that each category in a list is a root of the tree."""
+    tree = wikipedia.categorytree(["Mechanics", "Aerodynamics"], depth=1)
+    self.assertEqual(sorted(tree), ['Aerodynamics', 'Mechanics'])
+    self.assertEqual(tree['Aerodynamics']['depth'], 0)
+
+  def test_missing(self):
+    """Test that a missing category raises a PageError."""
+    self.assertRaises(wikipedia.PageError, wikipedia.categorytree, "Nonexistent category")
+
+  def test_retry_policy(self):
+    """Test that a retry policy set with using_retry_policy applies to the concurrent requests."""
+    policies = list()
+    request = wikipedia._wiki_request
+
+    def recording_request(params):
+      ''' record the retry policy in use by the thread making the request '''
+      policies.append(wikipedia.get_retry_policy().max_retries)
+      return request(params)
+
+    wikipedia.clear_cache()
+    wikipedia._wiki_request = recording_request
+    try:
+      with wikipedia.using_retry_policy(max_retries=42):
+        tree = wikipedia.categorytree("Mechanics", depth=0)
+    finally:
+      wikipedia._wiki_request = request
+    self.assertEqual(tree["Mechanics"]['links'], ['Force', 'Motion'])
+    self.assertTrue(len(policies) > 4)
+    self.assertEqual(set(policies), set([42]))
+
+
+class TestIterCategoryTree(unittest.TestCase):
+  """Test the functionality of wikipedia.iter_categorytree."""
+
+  def test_records(self):
+    """Test that each category is yielded once with its depth, parents, pages, and sub-categories."""
+    records = sorted(wikipedia.iter_categorytree("Mechanics", depth=0), key=lambda record: (record[1], record[0]))
+    self.assertEqual(records, [
+      ('Mechanics', 0, ['Physics'], ['Force', 'Motion'], ['Classical mechanics', 'Fluid mechanics']),
+      ('Classical mechanics', 1, ['Mechanics'], ["Newton's laws of motion"], ['Mechanics']),
+      ('Fluid mechanics', 1, ['Mechanics', 'Fluid dynamics'], ['Fluid'], ['Aerodynamics']),
+      ('Aerodynamics', 2, ['Fluid mechanics'], ['Lift (force)'], []),
+    ])
+
+  def test_depth(self):
+    """Test that categories below depth are not yielded."""
+    self.assertEqual([record[0] for record in wikipedia.iter_categorytree("Mechanics", depth=1) if record[1] > 1], [])
+
+  def test_stop_early(self):
+    """Test that the walk may be stopped after the first category."""
+    records = wikipedia.iter_categorytree("Mechanics", depth=0)
+    self.assertEqual(next(records)[0], 'Mechanics')
+    records.close()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from wikipedia import wikipedia
+from wikipedia.fake_server import FakeMediaWiki, FakeMediaWikiServer, synthetic_corpus
+from wikipedia.transport import RequestsTransport
+
+
+def query(api, **params):
+  ''' answer the query with the fake API and parse the response '''
+  status, headers, body = api.handle(params)
+  return json.loads(body.decode('utf-8'))
+
+
+class TestFakeMediaWiki(unittest.TestCase):
+  """Test the responses of the fake MediaWiki API."""
+
+  def setUp(self):
+    ''' a small synthetic corpus '''
+    self.api = FakeMediaWiki(corpus=synthetic_corpus(pages=20, links=5, categories=4))
+
+  def test_siteinfo(self):
+    """Test that siteinfo reports the version and extensions."""
+    response = query(self.api, meta='siteinfo', siprop='extensions|general')
+    self.assertEqual(response['query']['general']['generator'], 'MediaWiki 1.28.0')
+    self.assertEqual([e['name'] for e in response['query']['extensions']], ['TextExtracts', 'GeoData', 'OpenSearch'])
+
+  def test_page_info(self):
+    """Test title normalization, redirects, and missing pages."""
+    response = query(self.api, prop='info|pageprops', inprop='url', ppprop='disambiguation',
+                     redirects='', titles='article_10|Article #10|Nope')
+    pages = response['query']['pages']
+    self.assertEqual(response['query']['normalized'], [{'from': 'article_10', 'to': 'Article 10'}])
+    self.assertEqual(response['query']['redirects'], [{'from': 'Article #10', 'to': 'Article 10'}])
+    self.assertEqual(pages['1010']['fullurl'], 'http://localhost/wiki/Article_10')
+    self.assertTrue('missing' in pages['-1'])
+
+    redirect = query(self.api, prop='info', titles='Article #10')['query']['pages']
+    self.assertEqual(list(redirect.values())[0]['redirect'], '')
+
+  def test_continuation(self):
+    """Test that list props are continued across requests."""
+    params = {'prop': 'links|categories', 'plnamespace': '0', 'pllimit': '3', 'titles': 'Article 1'}
+    links = list()
+    categories = list()
+    last_continue = dict()
+    while True:
+      request = dict(params)
+      request.update(last_continue)
+      response = query(self.api, **request)
+      page = response['query']['pages']['1001']
+      links.extend(link['title'] for link in page.get('links', list()))
+      categories.extend(category['title'] for category in page.get('categories', list()))
+      if 'continue' not in response:
+        break
+      last_continue = response['continue']
+
+    self.assertEqual(links, self.api.pages['Article 1']['links'])
+    self.assertEqual(categories, ['Category:Topic 1'])
+
+  def test_search(self):
+    """Test search results and suggestions."""
+    response = query(self.api, list='search', srsearch='Article 1', srlimit='3', srprop='')
+    self.assertEqual([hit['title'] for hit in response['query']['search']], ['Article 1', 'Article 10', 'Article 11'])
+    self.assertEqual(response['continue']['sroffset'], 3)
+
+    response = query(self.api, list='search', srsearch='Artcle 1', srinfo='suggestion', srprop='')
+    self.assertEqual(response['query']['searchinfo']['suggestion'], 'article 1')
+
+  def test_parse(self):
+    """Test the sections and HTML of the parse API."""
+    response = query(self.api, action='parse', page='Article 1', prop='sections|text')
+    self.assertEqual([s['line'] for s in response['parse']['sections']], ['History', 'Description', 'Details', 'See also'])
+    self.assertTrue('<h2>History</h2>' in response['parse']['text']['*'])
+    self.assertEqual(query(self.api, action='parse', page='Nope')['error']['code'], 'missingtitle')
+
+    section = query(self.api, action='parse', page='Article 1', prop='text', section='2')['parse']['text']['*']
+    self.assertEqual(section, '<h2>Description</h2>\n<p>Article 1 is described here.</p>\n<h3>Details</h3>\n<p>More details.</p>')
+    self.assertEqual(query(self.api, action='parse', page='Article 1', section='9')['error']['code'], 'nosuchsection')
+
+  def test_faults(self):
+    """Test the injected errors."""
+    self.assertEqual(FakeMediaWiki(error_rate=1).handle({})[0], 503)
+
+    status, headers, body = FakeMediaWiki(maxlag_rate=1, retry_after='2').handle({})
+    self.assertEqual(headers['Retry-After'], '2')
+    self.assertEqual(json.loads(body.decode('utf-8'))['error']['code'], 'maxlag')
+
+    status, headers, body = FakeMediaWiki(pool_full_rate=1).handle({})
+    self.assertEqual(json.loads(body.decode('utf-8'))['error']['info'], 'Pool queue is full')
+
+
+class TestFakeMediaWikiServer(unittest.TestCase):
+  """Test requests to the fake MediaWiki API server."""
+
+  def setUp(self):
+    ''' serve a small synthetic corpus '''
+    self.api = FakeMediaWiki(corpus=synthetic_corpus(pages=20, links=5, categories=4), seed=0)
+    self.server = FakeMediaWikiServer(self.api).start()
+    self.transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT']
+    wikipedia.set_transport(RequestsTransport())
+
+  def tearDown(self):
+    ''' stop the server and restore the transport '''
+    self.server.stop()
+    wikipedia.set_transport(self.transport)
+
+  def test_request(self):
+    """Test a compressed request over HTTP."""
+    r, response = wikipedia._send_request(self.server.url, {'action': 'opensearch', 'search': 'Article 1', 'limit': '2'})
+    self.assertEqual(r.headers['Content-Encoding'], 'gzip')
+    self.assertEqual(response[1], ['Article 1', 'Article 10'])
+
+  def test_retry(self):
+    """Test that the injected maxlag errors are retried."""
+    self.api.maxlag_rate = 0.5
+    self.api.retry_after = '0'
+    with wikipedia.using_retry_policy(max_retries=20, jitter=False):
+      for _ in range(5):
+        r, response = wikipedia._send_request(self.server.url, {'action': 'query', 'list': 'random', 'rnlimit': '1'})
+        self.assertEqual(len(response['query']['random']), 1)
+    self.assertTrue(self.api.requests > 5)
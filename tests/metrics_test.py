@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import timedelta
+
+from wikipedia import wikipedia
+from wikipedia.metrics import RequestMetrics
+from wikipedia.transport import CallbackTransport, Response
+
+API_URL = 'http://en.wikipedia.org/w/api.php'
+
+
+class TestRequestMetrics(unittest.TestCase):
+  """Test the counters of RequestMetrics."""
+
+  def test_counts(self):
+    """Test the counts by action, prop, and list and the latency histogram."""
+    metrics = RequestMetrics()
+    metrics.record_request({'action': 'query', 'prop': 'extracts|info', 'list': 'backlinks'}, 0.02, 100)
+    metrics.record_request({'action': 'parse'}, 20, 50, failed=True)
+    stats = metrics.snapshot()
+    self.assertEqual(stats['requests'], 2)
+    self.assertEqual(stats['errors'], 1)
+    self.assertEqual(stats['by_action'], {'query': 1, 'parse': 1})
+    self.assertEqual(stats['by_prop'], {'extracts': 1, 'info': 1})
+    self.assertEqual(stats['by_list'], {'backlinks': 1})
+    self.assertEqual(stats['bytes'], 150)
+    self.assertEqual(stats['latency']['max'], 20)
+    self.assertEqual(stats['latency']['histogram']['<=0.025'], 1)
+    self.assertEqual(stats['latency']['histogram']['>10.0'], 1)
+
+    metrics.reset()
+    self.assertEqual(metrics.snapshot()['requests'], 0)
+
+
+class TestStats(unittest.TestCase):
+  """Test the request metrics and hooks of the request layer."""
+
+  def setUp(self):
+    ''' answer the requests in process, failing the first `self.failures` with a maxlag error '''
+    self.transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT']
+    self.failures = 0
+
+    def answer(url, params):
+      ''' a maxlag error, then an empty query '''
+      if self.failures:
+        self.failures -= 1
+        return Response(200, {'Retry-After': '0'}, b'{"error": {"code": "maxlag"}}')
+      return {'query': {}}
+
+    wikipedia.set_transport(CallbackTransport(answer))
+    wikipedia.reset_stats()
+
+  def tearDown(self):
+    ''' restore the transport, hooks, and rate limiting '''
+    wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = self.transport
+    wikipedia.set_request_hooks()
+    wikipedia.set_rate_limiting(False)
+    wikipedia.reset_stats()
+
+  def test_stats(self):
+    """Test that requests, retries, bytes, and decoding are counted."""
+    self.failures = 2
+    wikipedia._send_request(API_URL, {'action': 'query', 'prop': 'extracts'})
+    stats = wikipedia.get_stats()
+    self.assertEqual(stats['requests'], 3)
+    self.assertEqual(stats['retries'], 2)
+    self.assertEqual(stats['by_prop'], {'extracts': 3})
+    self.assertEqual(stats['bytes'], 2 * len(b'{"error": {"code": "maxlag"}}') + len(b'{"query": {}}'))
+    self.assertTrue(stats['json_decode_time'] > 0)
+
+  def test_rate_limit_wait(self):
+    """Test that the time waited on the rate limiter is counted."""
+    wikipedia.set_rate_limiting(True, min_wait=timedelta(milliseconds=20))
+    for _ in range(3):
+      wikipedia._send_request(API_URL, {'action': 'query'})
+    self.assertTrue(wikipedia.get_stats()['rate_limit_wait'] >= 0.03)
+
+  def test_hooks(self):
+    """Test that the hooks are called around each attempt."""
+    calls = list()
+    wikipedia.set_request_hooks(
+      pre=lambda url, params: calls.append(('pre', url)),
+      post=lambda url, params, r, elapsed: calls.append(('post', r.status_code)))
+    self.failures = 1
+    wikipedia._send_request(API_URL, {'action': 'query'})
+    self.assertEqual(calls, [('pre', API_URL), ('post', 200), ('pre', API_URL), ('post', 200)])
+
+  def test_html_parse(self):
+    """Test that parsing disambiguation HTML is timed."""
+    wikipedia._parse_disambiguation('<ul><li><a title="Mercury (planet)">Mercury</a></li></ul>')
+    self.assertTrue(wikipedia.get_stats()['html_parse_time'] > 0)
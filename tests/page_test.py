@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 from decimal import Decimal
+import json
+import pickle
 import unittest
 
 from wikipedia import wikipedia
+from wikipedia.fake_server import FakeMediaWiki, synthetic_corpus
+from wikipedia.util import CompressedText
 from .request_mock_data import mock_data
 
 
@@ -14,6 +18,25 @@ wikipedia._wiki_request = _wiki_request
 wikipedia.WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = (1,28,)
 wikipedia.WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'] = ['TextExtracts', 'GeoData']
 
+class RecordingTestCase(unittest.TestCase):
+  """Base class recording the requests made by each test in self.requests."""
+
+  def setUp(self):
+    ''' record each request made through the mocked _wiki_request '''
+    self.requests = list()
+
+    def recording_request(params):
+      ''' record each request '''
+      self.requests.append(params)
+      return _wiki_request(params)
+
+    wikipedia._wiki_request = recording_request
+
+  def tearDown(self):
+    ''' restore the mocked _wiki_request '''
+    wikipedia._wiki_request = _wiki_request
+
+
 class TestPageSetUp(unittest.TestCase):
   """Test the functionality of wikipedia.page's __init__ and load functions."""
 
@@ -162,3 +185,470 @@ class TestPage(unittest.TestCase):
     lat, lon = self.great_wall_of_china.coordinates
     self.assertEqual(str(lat.quantize(Decimal('1.000'))), mock_data['data']['great_wall_of_china.coordinates.lat'])
     self.assertEqual(str(lon.quantize(Decimal('1.000'))), mock_data['data']['great_wall_of_china.coordinates.lon'])
+
+
+class TestSectionTree(unittest.TestCase):
+  """Test the section tree parsed from the plain text content."""
+
+  content = (u"Lead text.\n\n\n== Early life ==\nChildhood.\n\n\n=== Education ===\nSchool.\n\n\n"
+             u"==== College ====\nCollege.\n\n\n=== Family ===\nParents.\n\n\n== Career ==\nWork.")
+
+  def setUp(self):
+    ''' a page with nested sections, loaded without requests '''
+    self.page = wikipedia.WikipediaPage.__new__(wikipedia.WikipediaPage)
+    self.page._content = self.content
+
+  def test_section(self):
+    """Test the text of a section with and without its subsections."""
+    self.assertEqual(self.page.section("Early life", include_subsections=False), u"Childhood.")
+    self.assertEqual(self.page.section("Early life"),
+                     u"Childhood.\n\n\n=== Education ===\nSchool.\n\n\n==== College ====\nCollege.\n\n\n=== Family ===\nParents.")
+    self.assertEqual(self.page.section("College"), u"College.")
+    self.assertEqual(self.page.section("Career"), u"Work.")
+    self.assertEqual(self.page.section("Death"), None)
+
+  def test_tree(self):
+    """Test the levels, parents, and children of the sections."""
+    root = self.page.section_tree
+    self.assertEqual(root.text(include_subsections=False), u"Lead text.")
+    self.assertEqual([s.title for s in root.children], [u"Early life", u"Career"])
+    early_life = root.children[0]
+    self.assertEqual([s.title for s in early_life.children], [u"Education", u"Family"])
+    college = early_life.children[0].children[0]
+    self.assertEqual((college.title, college.level, college.parent.title), (u"College", 4, u"Education"))
+
+  def test_iteration_and_index(self):
+    """Test iterating over the sections and looking them up by index."""
+    titles = [u"Early life", u"Education", u"College", u"Family", u"Career"]
+    self.assertEqual([s.title for s in self.page.iter_sections()], titles)
+    self.assertEqual([s.index for s in self.page.iter_sections()], [1, 2, 3, 4, 5])
+    self.assertEqual(self.page.get_section(3).title, u"College")
+    self.assertEqual(self.page.get_section(0).title, None)
+    self.assertEqual(self.page.get_section(6), None)
+
+  def test_compact(self):
+    """Test that the compressed content is only decompressed once for all section lookups."""
+    self.page._content = CompressedText(self.content)
+    decoded = list()
+    decode = CompressedText.decode
+
+    def counting_decode(text):
+      ''' count the decompressions '''
+      decoded.append(text)
+      return decode(text)
+
+    CompressedText.decode = counting_decode
+    try:
+      self.assertEqual(self.page.section("College"), u"College.")
+      self.assertEqual(self.page.section("Career"), u"Work.")
+      self.assertEqual(self.page.get_section(2).text(include_subsections=False), u"School.")
+    finally:
+      CompressedText.decode = decode
+    self.assertEqual(len(decoded), 1)
+
+    self.page.compact()
+    self.assertEqual(self.page._section_tree, None)
+    self.assertEqual(self.page.section("Career"), u"Work.")
+
+
+class TestFetchSections(RecordingTestCase):
+  """Test fetching single sections with the parse API."""
+
+  def setUp(self):
+    ''' record the requests made for the sections '''
+    self.cyclone = wikipedia.page("Tropical Depression Ten (2005)")
+    super(TestFetchSections, self).setUp()
+
+  def test_fetch_section(self):
+    """Test that a section is fetched by title without loading the content, then cached."""
+    self.assertEqual(self.cyclone.fetch_section("Impact"), mock_data['data']["cyclone.section.impact"])
+    self.assertEqual([params['prop'] for params in self.requests], ['sections', 'text'])
+    self.assertFalse(hasattr(self.cyclone, '_content'))
+
+    self.cyclone.fetch_section("Impact")
+    self.assertEqual(len(self.requests), 2)
+
+  def test_fetch_lead(self):
+    """Test that the lead section is fetched by index, without styles."""
+    self.assertEqual(self.cyclone.fetch_section(0), mock_data['data']["cyclone.summary"].strip())
+
+  def test_fetch_sections(self):
+    """Test fetching several sections at once."""
+    sections = self.cyclone.fetch_sections(["Impact", 0, "History", 9])
+    self.assertEqual(sections, {
+      "Impact": mock_data['data']["cyclone.section.impact"],
+      0: mock_data['data']["cyclone.summary"].strip(),
+      "History": None,
+      9: None
+    })
+    self.assertEqual(len(self.requests), 4)
+
+  def test_api_error(self):
+    """Test that API errors other than a missing section are raised and not cached."""
+    def lagged_request(params):
+      ''' fail the section requests as lagged '''
+      if params.get('section') is not None:
+        return {'error': {'code': 'maxlag', 'info': 'Waiting for a database server: 5 seconds lagged.'}}
+      return _wiki_request(params)
+
+    wikipedia._wiki_request = lagged_request
+    self.assertRaises(wikipedia.WikipediaException, self.cyclone.fetch_section, "Impact")
+    self.assertRaises(wikipedia.WikipediaException, self.cyclone.fetch_sections, ["Impact", 0])
+
+    wikipedia._wiki_request = _wiki_request
+    self.assertEqual(self.cyclone.fetch_section("Impact"), mock_data['data']["cyclone.section.impact"])
+
+  def test_section_format(self):
+    """Test that a fetched section has the same text and headings as the section of the content."""
+    api = FakeMediaWiki(corpus=synthetic_corpus(pages=2))
+
+    def fake_request(params):
+      ''' answer the request with the fake API '''
+      params.setdefault('action', 'query')
+      return json.loads(api.handle(params)[2].decode('utf-8'))
+
+    wikipedia._wiki_request = fake_request
+    article = wikipedia.page("Article 1", auto_suggest=False)
+    description = article.fetch_section("Description")
+    self.assertEqual(description, 'Article 1 is described here.\n\n\n=== Details ===\nMore details.')
+    self.assertEqual(description, article.section("Description"))
+    self.assertEqual(article.fetch_section("Details"), article.section("Details"))
+    self.assertEqual(article.fetch_section(0), article.section_tree.text(include_subsections=False))
+
+
+class TestCompactPages(unittest.TestCase):
+  """Test the compressed storage of the page HTML and content."""
+
+  def tearDown(self):
+    ''' turn compact pages back off '''
+    wikipedia.set_compact_pages(False)
+
+  def test_compact_pages(self):
+    """Test that the text is stored compressed and decompressed on access."""
+    wikipedia.set_compact_pages(True, level=9)
+    celtuce = wikipedia.page("Celtuce")
+    self.assertEqual(celtuce.content, mock_data['data']["celtuce.content"])
+    self.assertEqual(celtuce.html(), mock_data['data']["celtuce.html"])
+    self.assertIsInstance(celtuce._content, CompressedText)
+    self.assertIsInstance(celtuce._html, CompressedText)
+
+    cyclone = wikipedia.page("Tropical Depression Ten (2005)")
+    self.assertEqual(cyclone.section("Impact"), mock_data['data']["cyclone.section.impact"])
+
+  def test_compact(self):
+    """Test that compacting a loaded page reduces its memory use."""
+    celtuce = wikipedia.page("Celtuce")
+    celtuce.content
+    celtuce.html()
+    before = celtuce.memory_usage()
+    celtuce.compact()
+    after = celtuce.memory_usage()
+    self.assertTrue(after['html'] < before['html'])
+    self.assertTrue(after['total'] < before['total'])
+    self.assertEqual(celtuce.html(), mock_data['data']["celtuce.html"])
+
+
+class TestPreload(RecordingTestCase):
+  """Test the functionality of wikipedia.page with preload == True."""
+
+  def setUp(self):
+    ''' preload a page while recording the requests made '''
+    super(TestPreload, self).setUp()
+    self.cyclone = wikipedia.page("Tropical Depression Ten (2005)", auto_suggest=False, preload=True)
+
+  def test_merged_query(self):
+    """Test that the query properties are loaded by a single continued query."""
+    merged = [params for params in self.requests if params.get('list') == 'backlinks']
+    self.assertEqual(len(merged), 2)
+    # info, the merged query (twice), summary, images, and sections
+    self.assertEqual(len(self.requests), 6)
+
+  def test_properties(self):
+    """Test that the preloaded properties do not make any further requests."""
+    def failing_request(params):
+      ''' fail on any request '''
+      raise AssertionError(params)
+
+    wikipedia._wiki_request = failing_request
+    self.assertEqual(self.cyclone.content, mock_data['data']["cyclone.content"])
+    self.assertEqual(self.cyclone.revision_id, mock_data['data']["cyclone.revid"])
+    self.assertEqual(self.cyclone.parent_id, mock_data['data']["cyclone.parentid"])
+    self.assertEqual(self.cyclone.summary, mock_data['data']["cyclone.summary"])
+    self.assertEqual(sorted(self.cyclone.images), mock_data['data']["cyclone.images"])
+    self.assertEqual(self.cyclone.references, mock_data['data']["cyclone.references"])
+    self.assertEqual(self.cyclone.links, mock_data['data']["cyclone.links"])
+    self.assertEqual(self.cyclone.categories, mock_data['data']["cyclone.categories"])
+    self.assertEqual(sorted(self.cyclone.sections), mock_data['data']["cyclone.sections"])
+    self.assertEqual(self.cyclone.redirects, ['Tropical Depression 10 (2005)'])
+    self.assertEqual(self.cyclone.backlinks, ['2005 Atlantic hurricane season'])
+    self.assertEqual(self.cyclone.coordinates, None)
+
+
+class TestIterators(RecordingTestCase):
+  """Test the functionality of the lazy WikipediaPage.iter_* methods."""
+
+  def setUp(self):
+    ''' record the requests made by the iterators '''
+    self.celtuce = wikipedia.page("Celtuce")
+    super(TestIterators, self).setUp()
+
+  def test_lazy(self):
+    """Test that no request is made until the first item is read."""
+    links = self.celtuce.iter_links()
+    self.assertEqual(self.requests, [])
+    self.assertEqual(next(links), mock_data['data']["celtuce.links"][0])
+    self.assertEqual(len(self.requests), 1)
+
+  def test_limit(self):
+    """Test that the limit caps the batch size and stops the continuation."""
+    # the mocked server returns 3 links per batch
+    self.assertEqual(list(self.celtuce.iter_links(limit=5)), mock_data['data']["celtuce.links"][:5])
+    self.assertEqual(len(self.requests), 2)
+    self.assertEqual(self.requests[0]['pllimit'], 5)
+
+  def test_loaded(self):
+    """Test that iterating over an already loaded list makes no requests."""
+    links = self.celtuce.links
+    self.assertEqual(list(self.celtuce.iter_links(limit=2)), links[:2])
+    self.assertEqual(list(self.celtuce.iter_links()), links)
+    self.assertEqual(len(self.requests), 1)
+
+  def test_properties(self):
+    """Test that the properties match their iterators."""
+    self.assertEqual(list(self.celtuce.iter_references()), mock_data['data']["celtuce.references"])
+    self.assertEqual(list(self.celtuce.iter_categories()), mock_data['data']["celtuce.categories"])
+    self.assertEqual(sorted(self.celtuce.iter_images()), mock_data['data']["celtuce.images"])
+
+
+class TestBacklinks(RecordingTestCase):
+  """Test the functionality of the bounded WikipediaPage backlinks methods."""
+
+  def setUp(self):
+    ''' record the requests made for the backlinks '''
+    self.celtuce = wikipedia.page("Celtuce")
+    super(TestBacklinks, self).setUp()
+
+  def test_backlinks(self):
+    """Test that the property loads all of the backlinks."""
+    self.assertEqual(self.celtuce.backlinks, mock_data['data']["celtuce.backlinks"])
+    self.assertEqual(len(self.requests), 2)
+
+  def test_get_backlinks(self):
+    """Test that get_backlinks returns a page of titles and a continuation to resume from."""
+    titles, continuation = self.celtuce.get_backlinks(limit=3)
+    self.assertEqual(titles, mock_data['data']["celtuce.backlinks"][:3])
+    self.assertEqual(len(self.requests), 1)
+
+    titles, continuation = self.celtuce.get_backlinks(limit=2, continuation=continuation)
+    self.assertEqual(titles, mock_data['data']["celtuce.backlinks"][3:])
+    self.assertEqual(continuation, None)
+
+  def test_iter_backlinks(self):
+    """Test that iter_backlinks stops requesting at the limit."""
+    self.assertEqual(list(self.celtuce.iter_backlinks(limit=3)), mock_data['data']["celtuce.backlinks"][:3])
+    self.assertEqual(len(self.requests), 1)
+
+  def test_count_backlinks(self):
+    """Test that counting stops at the threshold."""
+    self.assertEqual(self.celtuce.count_backlinks(threshold=3), 3)
+    self.assertEqual(len(self.requests), 1)
+    self.assertEqual(self.celtuce.count_backlinks(), 5)
+
+  def test_filter_redirects(self):
+    """Test that an unknown redirect filter raises a ValueError."""
+    self.assertRaises(ValueError, self.celtuce.iter_backlinks, filter_redirects='none')
+    self.assertEqual(self.requests, [])
+
+  def test_get_backlinks_limit(self):
+    """Test that get_backlinks requires a limit of at least 1."""
+    self.assertRaises(ValueError, self.celtuce.get_backlinks, limit=0)
+    self.assertEqual(self.requests, [])
+
+
+class TestDisambiguation(RecordingTestCase):
+  """Test the lazy loading of the DisambiguationError options."""
+
+  def test_lazy_options(self):
+    """Test that the rendered page is only requested when the options are accessed."""
+    with self.assertRaises(wikipedia.DisambiguationError) as raised:
+      wikipedia.page("Dodge Ram (disambiguation)", auto_suggest=False, redirect=False)
+    self.assertEqual(len(self.requests), 1)
+
+    error = raised.exception
+    self.assertEqual(error.options[0], u'Dodge Ramcharger')
+    self.assertEqual(error.details[0]['title'], u'Dodge Ramcharger')
+    self.assertEqual(len(self.requests), 2)
+    self.assertEqual(len(error.options), 10)
+    self.assertEqual(len(self.requests), 2)
+
+  def test_pickle(self):
+    """Test that pickling does not load the options and the copy loads them on access."""
+    error = wikipedia.pages(["Dodge Ram (disambiguation)"])[0]
+    copy = pickle.loads(pickle.dumps(error))
+    self.assertEqual(len(self.requests), 1)
+    self.assertEqual(copy.options, error.options)
+    self.assertEqual(copy.title, "Dodge Ram (disambiguation)")
+
+    loaded = pickle.loads(pickle.dumps(error))
+    self.assertEqual(len(self.requests), 3)
+    self.assertEqual(loaded.details, error.details)
+    self.assertEqual(len(self.requests), 3)
+
+  def test_str(self):
+    """Test that formatting the error does not load the options."""
+    error = wikipedia.pages(["Dodge Ram (disambiguation)"])[0]
+    self.assertEqual(str(error), '"Dodge Ram (disambiguation)" may refer to several pages; see the options of the error')
+    self.assertEqual(len(self.requests), 1)
+    error.options
+    self.assertTrue(str(error).startswith('"Dodge Ram (disambiguation)" may refer to: \n  Dodge Ramcharger'))
+
+  def test_api_url(self):
+    """Test that the options are loaded from the wiki the error was raised for."""
+    api_urls = list()
+
+    def french_request(params, api_url=None):
+      ''' record the API URL requested '''
+      api_urls.append(api_url)
+      return _wiki_request(params)
+
+    api_url = wikipedia.WIKIPEDIA_GLOBALS['API_URL']
+    try:
+      wikipedia.WIKIPEDIA_GLOBALS['API_URL'] = 'http://en.wikipedia.org/w/api.php'
+      error = wikipedia.pages(["Dodge Ram (disambiguation)"])[0]
+      wikipedia.WIKIPEDIA_GLOBALS['API_URL'] = 'http://fr.wikipedia.org/w/api.php'
+      wikipedia._wiki_request = french_request
+      self.assertEqual(error.options[0], u'Dodge Ramcharger')
+    finally:
+      wikipedia.WIKIPEDIA_GLOBALS['API_URL'] = api_url
+    self.assertEqual(api_urls, ['http://en.wikipedia.org/w/api.php'])
+
+
+class TestPages(unittest.TestCase):
+  """Test the functionality of wikipedia.pages batch loading."""
+
+  titles = ["Celtuce", "purpleberry", "Menlo Park, New Jersey", "communist Party", "Dodge Ram (disambiguation)"]
+
+  def test_titles(self):
+    """Test that a batch of titles returns pages and errors in input order."""
+    celtuce, purpleberry, menlo_park, party, ram = wikipedia.pages(self.titles)
+
+    self.assertEqual(celtuce, wikipedia.page("Celtuce"))
+    self.assertIsInstance(purpleberry, wikipedia.PageError)
+    self.assertEqual(menlo_park.title, "Edison, New Jersey")
+    self.assertEqual(menlo_park.url, "http://en.wikipedia.org/wiki/Edison,_New_Jersey")
+    self.assertEqual(party, wikipedia.page("Communist party", auto_suggest=False))
+    self.assertIsInstance(ram, wikipedia.DisambiguationError)
+    self.assertEqual(ram.options[0], u'Dodge Ramcharger')
+
+  def test_titles_redirect_false(self):
+    """Test that redirects are returned as RedirectErrors when redirect == False."""
+    results = wikipedia.pages(self.titles, redirect=False)
+    self.assertIsInstance(results[0], wikipedia.WikipediaPage)
+    self.assertIsInstance(results[2], wikipedia.RedirectError)
+    self.assertIsInstance(results[3], wikipedia.RedirectError)
+
+  def test_duplicates(self):
+    """Test that duplicate titles are only requested once but returned for each input."""
+    results = wikipedia.pages(self.titles + ["Celtuce"])
+    self.assertEqual(len(results), 6)
+    self.assertEqual(results[0], results[5])
+
+  def test_pageids(self):
+    """Test that a batch of pageids resolves redirects and missing pages."""
+    celtuce, party, missing = wikipedia.pages(pageids=[1868108, 2360225, 42])
+    self.assertEqual(celtuce, wikipedia.page(pageid=1868108))
+    self.assertEqual(party.title, "Communist party")
+    self.assertIsInstance(missing, wikipedia.PageError)
+
+  def test_nothing_specified(self):
+    """Test that either titles or pageids are required."""
+    self.assertRaises(ValueError, wikipedia.pages)
+
+
+class TestPageHandles(unittest.TestCase):
+  """Test the compact, hashable page handles."""
+
+  def test_page_handles(self):
+    """Test that handles are returned in input order with the errors."""
+    celtuce, purpleberry, menlo_park, party, ram = wikipedia.page_handles(TestPages.titles)
+    self.assertIsInstance(celtuce, wikipedia.WikipediaPageHandle)
+    self.assertEqual((celtuce.title, celtuce.pageid), ("Celtuce", "1868108"))
+    self.assertEqual(celtuce.url, "http://en.wikipedia.org/wiki/Celtuce")
+    self.assertIsInstance(purpleberry, wikipedia.PageError)
+    self.assertEqual(menlo_park.title, "Edison, New Jersey")
+    self.assertIsInstance(ram, wikipedia.DisambiguationError)
+    self.assertFalse(hasattr(celtuce, '__dict__'))
+
+  def test_hashable(self):
+    """Test that pages and handles can be used in sets."""
+    celtuce = wikipedia.page("Celtuce")
+    pages = set([celtuce, wikipedia.page("Celtuce"), wikipedia.page("Tropical Depression Ten (2005)")])
+    self.assertEqual(len(pages), 2)
+    handles = set([celtuce.handle(), wikipedia.page_handles(["Celtuce"])[0]])
+    self.assertEqual(len(handles), 1)
+    self.assertTrue(celtuce.handle() in pages)
+
+  def test_page(self):
+    """Test that the full page is loaded from the handle on demand."""
+    handle = wikipedia.page_handles(["Celtuce"])[0]
+    celtuce = handle.page()
+    self.assertEqual(celtuce, wikipedia.page("Celtuce"))
+    self.assertEqual(celtuce.content, mock_data['data']["celtuce.content"])
+    self.assertEqual(pickle.loads(pickle.dumps(handle)), handle)
+
+
+class TestFetchMany(RecordingTestCase):
+  """Test the functionality of wikipedia.fetch_many."""
+
+  def test_fetch_many(self):
+    """Test that pages and their properties are loaded across threads."""
+    titles = ["Celtuce", "Tropical Depression Ten (2005)", "purpleberry"]
+    results = dict(wikipedia.fetch_many(titles, props=('content', 'categories'), workers=4))
+
+    self.assertEqual(sorted(results), sorted(titles))
+    self.assertIsInstance(results["purpleberry"], wikipedia.PageError)
+    self.assertEqual(results["Celtuce"].content, mock_data['data']["celtuce.content"])
+    self.assertEqual(results["Celtuce"]._categories, mock_data['data']["celtuce.categories"])
+    self.assertEqual(results["Tropical Depression Ten (2005)"]._content, mock_data['data']["cyclone.content"])
+
+  def test_duplicates(self):
+    """Test that a page given more than once is loaded once and returned for each title."""
+    titles = ["Celtuce", "Tropical Depression Ten (2005)", "purpleberry", "Celtuce"]
+    results = list(wikipedia.fetch_many(titles, props=('content',), workers=4))
+
+    self.assertEqual(sorted(title for title, result in results), sorted(titles))
+    celtuce = [result for title, result in results if title == "Celtuce"]
+    self.assertTrue(celtuce[0] is celtuce[1])
+    self.assertEqual(celtuce[0].content, mock_data['data']["celtuce.content"])
+    extracts = [params for params in self.requests if params.get('prop') == 'extracts|revisions']
+    self.assertEqual(sorted(params['titles'] for params in extracts), ["Celtuce", "Tropical Depression Ten (2005)"])
+
+  def test_failed_props(self):
+    """Test that a property failing with an API error returns the exception for that title."""
+    def failing_request(params):
+      ''' fail the backlinks requests with a database error '''
+      if params.get('list') == 'backlinks':
+        return {'error': {'code': 'internal_api_error_DBQueryError', 'info': 'Database query error.'}}
+      return _wiki_request(params)
+
+    wikipedia._wiki_request = failing_request
+    titles = ["Celtuce", "Tropical Depression Ten (2005)", "purpleberry"]
+    results = dict(wikipedia.fetch_many(titles, props=('content', 'backlinks')))
+    self.assertIsInstance(results["purpleberry"], wikipedia.PageError)
+    self.assertEqual(type(results["Celtuce"]), wikipedia.WikipediaException)
+    self.assertEqual(results["Celtuce"].error, 'Database query error.')
+
+  def test_retry_policy(self):
+    """Test that a retry policy set with using_retry_policy applies to the concurrent requests."""
+    policies = list()
+
+    def policy_request(params):
+      ''' record the retry policy in use by the thread making the request '''
+      policies.append(wikipedia.get_retry_policy().max_retries)
+      return _wiki_request(params)
+
+    wikipedia._wiki_request = policy_request
+    with wikipedia.using_retry_policy(max_retries=42):
+      results = dict(wikipedia.fetch_many(["Celtuce", "Tropical Depression Ten (2005)", "purpleberry"]))
+    self.assertEqual(results["Celtuce"].content, mock_data['data']["celtuce.content"])
+    self.assertEqual(policies, [42] * 3)
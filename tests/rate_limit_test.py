@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+from datetime import timedelta
+
+from wikipedia import wikipedia
+from wikipedia.util import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+  """Test the functionality of the token bucket rate limiter."""
+
+  def test_sub_second_wait(self):
+    """Test that waits shorter than a second are honored."""
+    bucket = TokenBucket(20)  # one request every 50 milliseconds
+    start = time.time()
+    for _ in range(5):
+      bucket.acquire()
+    self.assertGreaterEqual(time.time() - start, 0.19)
+
+  def test_burst(self):
+    """Test that up to burst requests do not wait."""
+    bucket = TokenBucket(1, burst=3)
+    self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+
+  def test_threads(self):
+    """Test that concurrent threads share the sustained rate."""
+    bucket = TokenBucket(50)
+    calls = list()
+
+    def worker():
+      for _ in range(5):
+        bucket.acquire()
+        calls.append(time.time())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.time()
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(len(calls), 20)
+    self.assertGreaterEqual(max(calls) - start, 19 / 50.0 - 0.01)
+
+  def test_invalid(self):
+    """Test that the rate and burst must be positive."""
+    self.assertRaises(ValueError, TokenBucket, 0)
+    self.assertRaises(ValueError, TokenBucket, 1, 0)
+
+
+class TestSetRateLimiting(unittest.TestCase):
+  """Test the per API URL buckets created by set_rate_limiting."""
+
+  def tearDown(self):
+    ''' disable rate limiting for the other tests '''
+    wikipedia.set_rate_limiting(False)
+
+  def test_buckets(self):
+    """Test that each API URL has its own bucket at the configured rate."""
+    wikipedia.set_rate_limiting(True, min_wait=timedelta(milliseconds=100), burst=5)
+    en = wikipedia._get_rate_limiter('http://en.wikipedia.org/w/api.php')
+    fr = wikipedia._get_rate_limiter('http://fr.wikipedia.org/w/api.php')
+    self.assertIsNot(en, fr)
+    self.assertIs(en, wikipedia._get_rate_limiter('http://en.wikipedia.org/w/api.php'))
+    self.assertEqual(en.rate, 10.0)
+    self.assertEqual(en.burst, 5)
+
+  def test_disabled(self):
+    """Test that no bucket is used when rate limiting is disabled."""
+    wikipedia.set_rate_limiting(False)
+    self.assertEqual(wikipedia._get_rate_limiter('http://en.wikipedia.org/w/api.php'), None)
+    self.assertRaises(ValueError, wikipedia.set_rate_limiting, True, timedelta(0))
+
+  def test_invalid_burst(self):
+    """Test that a burst below 1 is rejected when rate limiting is set."""
+    self.assertRaises(ValueError, wikipedia.set_rate_limiting, True, burst=0)
+    self.assertEqual(wikipedia._get_rate_limiter('http://en.wikipedia.org/w/api.php'), None)
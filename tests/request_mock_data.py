@@ -132,6 +132,88 @@ mock_data = {
 
     (('gscoord', '40.67693|117.23193'), ('gslimit', 10), ('gsradius', 1000), ('list', 'geosearch'), ('titles', 'Test')):
     {'query': {'geosearch': []}},
+
+    (('inprop', 'url'), ('ppprop', 'disambiguation'), ('prop', 'info|pageprops'), ('redirects', ''), ('titles', 'Celtuce|purpleberry|Menlo Park, New Jersey|communist Party|Dodge Ram (disambiguation)')):
+    {'batchcomplete': '', 'query': {'normalized': [{'from': 'purpleberry', 'to': 'Purpleberry'}, {'from': 'communist Party', 'to': 'Communist Party'}], 'redirects': [{'from': 'Menlo Park, New Jersey', 'to': 'Edison, New Jersey'}, {'from': 'Communist Party', 'to': 'Communist party'}], 'pages': {'1868108': {'pageid': 1868108, 'ns': 0, 'title': 'Celtuce', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2013-08-17T03:30:23Z', 'lastrevid': 562756085, 'length': 1662, 'fullurl': 'http://en.wikipedia.org/wiki/Celtuce', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Celtuce&action=edit'}, '-1': {'ns': 0, 'title': 'Purpleberry', 'missing': '', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'fullurl': 'http://en.wikipedia.org/wiki/Purpleberry', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Purpleberry&action=edit'}, '125414': {'pageid': 125414, 'ns': 0, 'title': 'Edison, New Jersey', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2014-05-14T17:10:49Z', 'lastrevid': 607768264, 'length': 85175, 'fullurl': 'http://en.wikipedia.org/wiki/Edison,_New_Jersey', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Edison,_New_Jersey&action=edit'}, '37008': {'pageid': 37008, 'ns': 0, 'title': 'Communist party', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2014-05-26T01:19:01Z', 'lastrevid': 608086859, 'length': 7868, 'fullurl': 'http://en.wikipedia.org/wiki/Communist_party', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Communist_party&action=edit'}, '18803364': {'pageid': 18803364, 'ns': 0, 'title': 'Dodge Ram (disambiguation)', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2013-08-08T15:12:27Z', 'lastrevid': 567152802, 'length': 702, 'pageprops': {'disambiguation': ''}, 'fullurl': 'http://en.wikipedia.org/wiki/Dodge_Ram_(disambiguation)', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Dodge_Ram_(disambiguation)&action=edit'}}}},
+
+    (('inprop', 'url'), ('ppprop', 'disambiguation'), ('prop', 'info|pageprops'), ('redirects', ''), ('titles', 'Celtuce|Tropical Depression Ten (2005)|purpleberry')):
+    {'batchcomplete': '', 'query': {'normalized': [{'from': 'purpleberry', 'to': 'Purpleberry'}], 'pages': {'1868108': {'pageid': 1868108, 'ns': 0, 'title': 'Celtuce', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2013-08-17T03:30:23Z', 'lastrevid': 562756085, 'length': 1662, 'fullurl': 'http://en.wikipedia.org/wiki/Celtuce', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Celtuce&action=edit'}, '21196082': {'pageid': 21196082, 'ns': 0, 'title': 'Tropical Depression Ten (2005)', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2013-09-18T13:45:33Z', 'lastrevid': 572715399, 'length': 8543, 'fullurl': 'http://en.wikipedia.org/wiki/Tropical_Depression_Ten_(2005)', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Tropical_Depression_Ten_(2005)&action=edit'}, '-1': {'ns': 0, 'title': 'Purpleberry', 'missing': '', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'fullurl': 'http://en.wikipedia.org/wiki/Purpleberry', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Purpleberry&action=edit'}}}},
+
+    # category tree: Mechanics -> Classical mechanics (-> Mechanics), Fluid mechanics -> Aerodynamics
+    (('cmlimit', 500), ('cmprop', 'ids|title|type'), ('cmtitle', 'Category:Mechanics'), ('cmtype', 'page|subcat'), ('list', 'categorymembers')):
+    {'batchcomplete': '', 'query': {'categorymembers': [{'pageid': 1000, 'ns': 0, 'title': 'Force', 'type': 'page'}, {'pageid': 1001, 'ns': 0, 'title': 'Motion', 'type': 'page'}, {'pageid': 2000, 'ns': 14, 'title': 'Category:Classical mechanics', 'type': 'subcat'}, {'pageid': 2001, 'ns': 14, 'title': 'Category:Fluid mechanics', 'type': 'subcat'}]}},
+
+    (('cmlimit', 500), ('cmprop', 'ids|title|type'), ('cmtitle', 'Category:Classical mechanics'), ('cmtype', 'page|subcat'), ('list', 'categorymembers')):
+    {'batchcomplete': '', 'query': {'categorymembers': [{'pageid': 1000, 'ns': 0, 'title': "Newton's laws of motion", 'type': 'page'}, {'pageid': 2000, 'ns': 14, 'title': 'Category:Mechanics', 'type': 'subcat'}]}},
+
+    (('cmlimit', 500), ('cmprop', 'ids|title|type'), ('cmtitle', 'Category:Fluid mechanics'), ('cmtype', 'page|subcat'), ('list', 'categorymembers')):
+    {'batchcomplete': '', 'query': {'categorymembers': [{'pageid': 1000, 'ns': 0, 'title': 'Fluid', 'type': 'page'}, {'pageid': 2000, 'ns': 14, 'title': 'Category:Aerodynamics', 'type': 'subcat'}]}},
+
+    (('cmlimit', 500), ('cmprop', 'ids|title|type'), ('cmtitle', 'Category:Aerodynamics'), ('cmtype', 'page|subcat'), ('list', 'categorymembers')):
+    {'batchcomplete': '', 'query': {'categorymembers': [{'pageid': 1000, 'ns': 0, 'title': 'Lift (force)', 'type': 'page'}]}},
+
+    (('cllimit', 'max'), ('clshow', '!hidden'), ('prop', 'categories'), ('titles', 'Category:Mechanics')):
+    {'query': {'pages': {'3000': {'pageid': 3000, 'ns': 14, 'title': 'Category:Mechanics', 'categories': [{'ns': 14, 'title': 'Category:Physics'}]}}}, 'batchcomplete': ''},
+
+    (('cllimit', 'max'), ('clshow', '!hidden'), ('prop', 'categories'), ('titles', 'Category:Classical mechanics|Category:Fluid mechanics')):
+    {'query': {'pages': {'3001': {'pageid': 3001, 'ns': 14, 'title': 'Category:Classical mechanics', 'categories': [{'ns': 14, 'title': 'Category:Mechanics'}]}, '3002': {'pageid': 3002, 'ns': 14, 'title': 'Category:Fluid mechanics', 'categories': [{'ns': 14, 'title': 'Category:Mechanics'}]}}}, 'continue': {'clcontinue': '3002|Fluid_dynamics', 'continue': '||'}},
+
+    (('clcontinue', '3002|Fluid_dynamics'), ('cllimit', 'max'), ('clshow', '!hidden'), ('continue', '||'), ('prop', 'categories'), ('titles', 'Category:Classical mechanics|Category:Fluid mechanics')):
+    {'query': {'pages': {'3001': {'pageid': 3001, 'ns': 14, 'title': 'Category:Classical mechanics'}, '3002': {'pageid': 3002, 'ns': 14, 'title': 'Category:Fluid mechanics', 'categories': [{'ns': 14, 'title': 'Category:Fluid dynamics'}]}}}, 'batchcomplete': ''},
+
+    (('cllimit', 'max'), ('clshow', '!hidden'), ('prop', 'categories'), ('titles', 'Category:Aerodynamics')):
+    {'query': {'pages': {'3003': {'pageid': 3003, 'ns': 14, 'title': 'Category:Aerodynamics', 'categories': [{'ns': 14, 'title': 'Category:Fluid mechanics'}]}}}, 'batchcomplete': ''},
+
+    (('cllimit', 'max'), ('clshow', '!hidden'), ('prop', 'categories'), ('titles', 'Category:Mechanics|Category:Aerodynamics')):
+    {'query': {'pages': {'3000': {'pageid': 3000, 'ns': 14, 'title': 'Category:Mechanics', 'categories': [{'ns': 14, 'title': 'Category:Physics'}]}, '3003': {'pageid': 3003, 'ns': 14, 'title': 'Category:Aerodynamics', 'categories': [{'ns': 14, 'title': 'Category:Fluid mechanics'}]}}}, 'batchcomplete': ''},
+
+    (('cllimit', 'max'), ('clshow', '!hidden'), ('prop', 'categories'), ('titles', 'Category:Nonexistent category')):
+    {'query': {'pages': {'-1': {'ns': 14, 'title': 'Category:Nonexistent category', 'missing': ''}}}, 'batchcomplete': ''},
+
+    (('inprop', 'url'), ('pageids', '1868108|2360225|42'), ('ppprop', 'disambiguation'), ('prop', 'info|pageprops')):
+    {'batchcomplete': '', 'query': {'pages': {'1868108': {'pageid': 1868108, 'ns': 0, 'title': 'Celtuce', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2013-08-17T03:30:23Z', 'lastrevid': 562756085, 'length': 1662, 'fullurl': 'http://en.wikipedia.org/wiki/Celtuce', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Celtuce&action=edit'}, '2360225': {'pageid': 2360225, 'ns': 0, 'title': 'Communist Party', 'contentmodel': 'wikitext', 'pagelanguage': 'en', 'touched': '2014-05-26T01:19:01Z', 'lastrevid': 608086859, 'length': 7868, 'redirect': '', 'fullurl': 'http://en.wikipedia.org/wiki/Communist_Party', 'editurl': 'http://en.wikipedia.org/w/index.php?title=Communist_Party&action=edit'}, '42': {'pageid': 42, 'missing': ''}}}},
+
+    (('blfilterredir', 'nonredirects'), ('bllimit', 'max'), ('blnamespace', 0), ('bltitle', 'Tropical Depression Ten (2005)'), ('cllimit', 'max'), ('clshow', '!hidden'), ('colimit', 'max'), ('ellimit', 'max'), ('explaintext', ''), ('list', 'backlinks'), ('pllimit', 'max'), ('plnamespace', 0), ('prop', 'extracts|revisions|coordinates|categories|extlinks|links|redirects'), ('rdlimit', 'max'), ('rdprop', 'title'), ('rvprop', 'ids'), ('titles', 'Tropical Depression Ten (2005)')):
+    {'continue': {'plcontinue': '21196082|0|Hurricane_Philippe_(2005)', 'continue': '||extracts|revisions|coordinates|categories|extlinks|redirects'}, 'query': {'pages': {'21196082': {'pageid': 21196082, 'ns': 0, 'title': 'Tropical Depression Ten (2005)', 'extract': 'Tropical Depression Ten was the tenth tropical cyclone of the record-breaking 2005 Atlantic hurricane season. It formed on August 13 from a tropical wave that emerged from the west coast of Africa on August 8. As a result of strong wind shear, the depression remained weak and did not strengthen beyond tropical depression status. The cyclone degenerated on August 14, although its remnants partially contributed to the formation of Tropical Depression Twelve, which eventually intensified into Hurricane Katrina. The cyclone had no effect on land, and did not directly result in any fatalities or damage.\n\n\n== Meteorological history ==\n\nOn August 8, a tropical wave emerged from the west coast of Africa and entered the Atlantic Ocean. Tracking towards the west, the depression began to exhibit signs of convective organization on August 11. The system continued to develop, and it is estimated that Tropical Depression Ten formed at 1200 UTC on August 13. At the time, it was located about 1,600 miles (2,600 km) east of Barbados. Upon its designation, the depression consisted of a large area of thunderstorm activity, with curved banding features and expanding outflow. However, the environmental conditions were predicted to quickly become unfavorable. The depression moved erratically and slowly towards the west, and wind shear inhibited any significant intensification. Late on August 13, it was "beginning to look like Irene-junior as it undergoes southwesterly mid-level shear beneath the otherwise favorable upper-level outflow pattern". The wind shear was expected to relent within 48 hours, prompting some forecast models to suggest the depression would eventually attain hurricane status.\nBy early August 14, the shear had substantially disrupted the storm, leaving the low-level center of circulation exposed from the area of convection, which was also deteriorating. After meandering, the storm began to move westward. Forecasters expected it to resume a northwestward track as high pressure to the south of Bermuda was forecasted to weaken and another high was predicted to form southwest of the Azores. By 1800 UTC on August 14, the strong shear had further weakened the storm, and it no longer met the criteria for a tropical cyclone. It degenerated into a remnant low, and the National Hurricane Center issued their final advisory on the cyclone. Moving westward, it occasionally produced bursts of convective activity, before dissipating on August 18.\nTropical Depression Twelve formed over the southeastern Bahamas at 2100 UTC on August 23, partially from the remains of Tropical Depression Ten. While the normal standards for numbering tropical depressions in the Atlantic stipulate that the initial designation be retained when a depression regenerates, satellite imagery indicated that a second tropical wave had combined with Tropical Depression Ten north of Puerto Rico to form a new, more complex weather system, which was then designated as Tropical Depression Twelve. In a re-analysis, it was found that the low-level circulation of Tropical Depression Ten had completely detached and dissipated; only the remnant mid-level circulation moved on and merged with the second tropical wave. As a result, the criteria for keeping the same name and identity were not met. Tropical Depression Twelve later became Hurricane Katrina.\n\n\n== Impact ==\nBecause Tropical Depression Ten never approached land as a tropical cyclone, no tropical cyclone watches and warnings were issued for any land masses. No effects, damages, or fatalities were reported, and no ships reported tropical storm-force winds in association with the depression. The system did not attain tropical storm status; as such, it was not given a name by the National Hurricane Center. The storm partially contributed to the formation of Hurricane Katrina, which became a Category 5 hurricane on the Saffir-Simpson Hurricane Scale and made landfall in Louisiana, causing catastrophic damage. Katrina was the costliest hurricane, and one of the five deadliest, in the history of the United States.\n\n\n== See also ==\n\nMeteorological history of Hurricane Katrina\nList of storms in the 2005 Atlantic hurricane season\nTimeline of the 2005 Atlantic hurricane season\n\n\n== References ==\n\n\n== External links ==\n\nTropical Depression Ten Tropical Cyclone Report\nTropical Depression Ten advisory archive', 'revisions': [{'revid': 572715399, 'parentid': 539367750}], 'categories': [{'ns': 14, 'title': '2005 Atlantic hurricane season'}, {'ns': 14, 'title': 'Articles with hAudio microformats'}, {'ns': 14, 'title': 'Atlantic tropical depressions'}, {'ns': 14, 'title': 'CS1 errors: dates'}, {'ns': 14, 'title': 'Commons category with local link same as on Wikidata'}, {'ns': 14, 'title': 'Featured articles'}, {'ns': 14, 'title': 'Hurricane Katrina'}, {'ns': 14, 'title': 'Spoken articles'}], 'extlinks': [{'*': 'http://books.google.com/?id=-a8DRl1HuwoC&q=%22tropical+depression+ten%22+2005&dq=%22tropical+depression+ten%22+2005'}, {'*': 'http://facstaff.unca.edu/chennon/research/documents/erb_ncur2006_preprint.pdf'}, {'*': 'http://www.nhc.noaa.gov/archive/2005/TEN.shtml?'}, {'*': 'http://www.nhc.noaa.gov/archive/2005/dis/al102005.discus.001.shtml?'}, {'*': 'http://www.nhc.noaa.gov/archive/2005/dis/al102005.discus.002.shtml?'}, {'*': 'http://www.nhc.noaa.gov/archive/2005/dis/al102005.discus.003.shtml?'}, {'*': 'http://www.nhc.noaa.gov/archive/2005/dis/al122005.discus.001.shtml'}, {'*': 'http://www.nhc.noaa.gov/pdf/TCR-AL102005_Ten.pdf'}, {'*': 'http://www.nhc.noaa.gov/pdf/TCR-AL122005_Katrina.pdf'}, {'*': 'http://www.wptv.com/content/chopper5/story/Capt-Julie-Reports-On-Hurricane-Katrina/q__v8S2TZES2GiccRTQ2bw.cspx'}], 'links': [{'ns': 0, 'title': '2005 Atlantic hurricane season'}, {'ns': 0, 'title': '2005 Azores subtropical storm'}, {'ns': 0, 'title': 'Atlantic Ocean'}, {'ns': 0, 'title': 'Atmospheric circulation'}, {'ns': 0, 'title': 'Atmospheric convection'}, {'ns': 0, 'title': 'Azores'}, {'ns': 0, 'title': 'Bahamas'}, {'ns': 0, 'title': 'Bar (unit)'}, {'ns': 0, 'title': 'Barbados'}, {'ns': 0, 'title': 'Bermuda'}, {'ns': 0, 'title': 'High pressure area'}, {'ns': 0, 'title': 'Hurricane Beta'}, {'ns': 0, 'title': 'Hurricane Cindy (2005)'}, {'ns': 0, 'title': 'Hurricane Dennis'}, {'ns': 0, 'title': 'Hurricane Emily (2005)'}, {'ns': 0, 'title': 'Hurricane Epsilon'}, {'ns': 0, 'title': 'Hurricane Irene (2005)'}, {'ns': 0, 'title': 'Hurricane Katrina'}, {'ns': 0, 'title': 'Hurricane Maria (2005)'}, {'ns': 0, 'title': 'Hurricane Nate (2005)'}, {'ns': 0, 'title': 'Hurricane Ophelia (2005)'}, {'ns': 0, 'title': 'Hurricane Philippe (2005)'}, {'ns': 0, 'title': 'Hurricane Rita'}, {'ns': 0, 'title': 'Hurricane Stan'}, {'ns': 0, 'title': 'Hurricane Vince (2005)'}, {'ns': 0, 'title': 'Hurricane Wilma'}, {'ns': 0, 'title': 'Inch of mercury'}, {'ns': 0, 'title': 'International Standard Book Number'}, {'ns': 0, 'title': 'List of Category 5 Atlantic hurricanes'}, {'ns': 0, 'title': 'List of storms in the 2005 Atlantic hurricane season'}], 'redirects': [{'pageid': 21196083, 'ns': 0, 'title': 'Tropical Depression 10 (2005)'}]}}, 'backlinks': [{'pageid': 2052733, 'ns': 0, 'title': '2005 Atlantic hurricane season'}]}},
+
+    (('blfilterredir', 'nonredirects'), ('bllimit', 'max'), ('blnamespace', 0), ('bltitle', 'Tropical Depression Ten (2005)'), ('cllimit', 'max'), ('clshow', '!hidden'), ('colimit', 'max'), ('continue', '||extracts|revisions|coordinates|categories|extlinks|redirects'), ('ellimit', 'max'), ('explaintext', ''), ('list', 'backlinks'), ('plcontinue', '21196082|0|Hurricane_Philippe_(2005)'), ('pllimit', 'max'), ('plnamespace', 0), ('prop', 'extracts|revisions|coordinates|categories|extlinks|links|redirects'), ('rdlimit', 'max'), ('rdprop', 'title'), ('rvprop', 'ids'), ('titles', 'Tropical Depression Ten (2005)')):
+    {'batchcomplete': '', 'query': {'pages': {'21196082': {'pageid': 21196082, 'ns': 0, 'title': 'Tropical Depression Ten (2005)', 'links': [{'ns': 0, 'title': 'Louisiana'}, {'ns': 0, 'title': 'Meteorological history of Hurricane Katrina'}, {'ns': 0, 'title': 'National Hurricane Center'}, {'ns': 0, 'title': 'North Atlantic tropical cyclone'}, {'ns': 0, 'title': 'Outflow (meteorology)'}, {'ns': 0, 'title': 'Pascal (unit)'}, {'ns': 0, 'title': 'Puerto Rico'}, {'ns': 0, 'title': 'Saffir-Simpson Hurricane Scale'}, {'ns': 0, 'title': 'Saffir–Simpson hurricane wind scale'}, {'ns': 0, 'title': 'Timeline of the 2005 Atlantic hurricane season'}, {'ns': 0, 'title': 'Tropical Storm Alpha (2005)'}, {'ns': 0, 'title': 'Tropical Storm Arlene (2005)'}, {'ns': 0, 'title': 'Tropical Storm Bret (2005)'}, {'ns': 0, 'title': 'Tropical Storm Delta (2005)'}, {'ns': 0, 'title': 'Tropical Storm Franklin (2005)'}, {'ns': 0, 'title': 'Tropical Storm Gamma'}, {'ns': 0, 'title': 'Tropical Storm Gert (2005)'}, {'ns': 0, 'title': 'Tropical Storm Jose (2005)'}, {'ns': 0, 'title': 'Tropical Storm Tammy (2005)'}, {'ns': 0, 'title': 'Tropical Storm Zeta'}, {'ns': 0, 'title': 'Tropical cyclone'}, {'ns': 0, 'title': 'Tropical cyclone scales'}, {'ns': 0, 'title': 'Tropical cyclone watches and warnings'}, {'ns': 0, 'title': 'Tropical wave'}, {'ns': 0, 'title': 'Wind shear'}]}}}},
+
+    (('pllimit', 5), ('plnamespace', 0), ('prop', 'links'), ('titles', 'Celtuce')):
+    {'continue': {'continue': '||', 'plcontinue': '1868108|0|Dietary_Reference_Intake'}, 'query': {'pages': {'1868108': {'ns': 0, 'pageid': 1868108, 'title': 'Celtuce', 'links': [{'ns': 0, 'title': 'Calcium'}, {'ns': 0, 'title': 'Carbohydrate'}, {'ns': 0, 'title': 'Chinese language'}]}}}},
+
+    (('continue', '||'), ('plcontinue', '1868108|0|Dietary_Reference_Intake'), ('pllimit', 5), ('plnamespace', 0), ('prop', 'links'), ('titles', 'Celtuce')):
+    {'continue': {'continue': '||', 'plcontinue': '1868108|0|Fat'}, 'query': {'pages': {'1868108': {'ns': 0, 'pageid': 1868108, 'title': 'Celtuce', 'links': [{'ns': 0, 'title': 'Dietary Reference Intake'}, {'ns': 0, 'title': 'Dietary fiber'}, {'ns': 0, 'title': 'Fat'}]}}}},
+
+    (('blfilterredir', 'nonredirects'), ('bllimit', 'max'), ('blnamespace', 0), ('bltitle', 'Celtuce'), ('list', 'backlinks')):
+    {'continue': {'blcontinue': '0|10002', 'continue': '-||'}, 'query': {'backlinks': [{'pageid': 10000, 'ns': 0, 'title': 'Lettuce'}, {'pageid': 10001, 'ns': 0, 'title': 'Stem vegetable'}, {'pageid': 10002, 'ns': 0, 'title': 'List of vegetables'}]}},
+
+    (('blcontinue', '0|10002'), ('blfilterredir', 'nonredirects'), ('bllimit', 'max'), ('blnamespace', 0), ('bltitle', 'Celtuce'), ('continue', '-||'), ('list', 'backlinks')):
+    {'batchcomplete': '', 'query': {'backlinks': [{'pageid': 10003, 'ns': 0, 'title': 'Chinese cuisine'}, {'pageid': 10004, 'ns': 0, 'title': 'Asparagus lettuce'}]}},
+
+    (('blfilterredir', 'nonredirects'), ('bllimit', 3), ('blnamespace', 0), ('bltitle', 'Celtuce'), ('list', 'backlinks')):
+    {'continue': {'blcontinue': '0|10002', 'continue': '-||'}, 'query': {'backlinks': [{'pageid': 10000, 'ns': 0, 'title': 'Lettuce'}, {'pageid': 10001, 'ns': 0, 'title': 'Stem vegetable'}, {'pageid': 10002, 'ns': 0, 'title': 'List of vegetables'}]}},
+
+    (('blcontinue', '0|10002'), ('blfilterredir', 'nonredirects'), ('bllimit', 2), ('blnamespace', 0), ('bltitle', 'Celtuce'), ('continue', '-||'), ('list', 'backlinks')):
+    {'batchcomplete': '', 'query': {'backlinks': [{'pageid': 10003, 'ns': 0, 'title': 'Chinese cuisine'}, {'pageid': 10004, 'ns': 0, 'title': 'Asparagus lettuce'}]}},
+
+    (('list', 'search'), ('srlimit', 'max'), ('srprop', ''), ('srsearch', 'Porsche')):
+    {'query-continue': {'search': {'sroffset': 3}}, 'query': {'searchinfo': {'totalhits': 5}, 'search': [{'ns': 0, 'title': 'Porsche'}, {'ns': 0, 'title': 'Porsche in motorsport'}, {'ns': 0, 'title': 'Porsche 911 GT3'}]}},
+
+    (('list', 'search'), ('srlimit', 'max'), ('sroffset', 3), ('srprop', ''), ('srsearch', 'Porsche')):
+    {'batchcomplete': '', 'query': {'searchinfo': {'totalhits': 5}, 'search': [{'ns': 0, 'title': 'Porsche 911'}, {'ns': 0, 'title': 'Porsche Cayenne'}]}},
+
+    (('list', 'search'), ('srlimit', 'max'), ('sroffset', 3), ('srprop', 'size|wordcount|timestamp|snippet'), ('srsearch', 'Porsche')):
+    {'batchcomplete': '', 'query': {'searchinfo': {'totalhits': 5}, 'search': [{'ns': 0, 'title': 'Porsche 911', 'pageid': 24365, 'size': 98233, 'wordcount': 10112, 'snippet': 'The <span class="searchmatch">Porsche</span> 911 is a two-door 2+2 high performance rear-engined sports car', 'timestamp': '2014-08-23T12:40:11Z'}, {'ns': 0, 'title': 'Porsche Cayenne', 'pageid': 1124413, 'size': 31210, 'wordcount': 3384, 'snippet': 'The <span class="searchmatch">Porsche</span> Cayenne is a mid-size luxury crossover sport utility vehicle', 'timestamp': '2014-08-20T08:02:53Z'}]}},
+    (('action', 'parse'), ('disableeditsection', ''), ('page', 'Tropical Depression Ten (2005)'), ('prop', 'text'), ('section', 2)):
+    {'parse': {'title': 'Tropical Depression Ten (2005)', 'pageid': 21196082, 'text': {'*': '<h2><span class="mw-headline" id="Impact">Impact</span></h2>\n<p>Because Tropical Depression Ten never approached land as a tropical cyclone, no tropical cyclone watches and warnings were issued for any land masses. No effects, damages, or fatalities were reported, and no ships reported tropical storm-force winds in association with the depression. The system did not attain tropical storm status; as such, it was not given a name by the National Hurricane Center. The storm partially contributed to the formation of Hurricane Katrina, which became a Category 5 hurricane on the Saffir-Simpson Hurricane Scale and made landfall in Louisiana, causing catastrophic damage. Katrina was the costliest hurricane, and one of the five deadliest, in the history of the United States.<sup id="cite_ref-1" class="reference"><a href="#cite_note-1">[1]</a></sup></p>'}}},
+
+    (('action', 'parse'), ('disableeditsection', ''), ('page', 'Tropical Depression Ten (2005)'), ('prop', 'text'), ('section', 0)):
+    {'parse': {'title': 'Tropical Depression Ten (2005)', 'pageid': 21196082, 'text': {'*': '<div class="mw-parser-output"><style>.infobox{border:1px}</style><p>Tropical Depression Ten was the tenth tropical cyclone of the record-breaking 2005 Atlantic hurricane season. It formed on August 13 from a tropical wave that emerged from the west coast of Africa on August 8. As a result of strong wind shear, the depression remained weak and did not strengthen beyond tropical depression status. The cyclone degenerated on August 14, although its remnants partially contributed to the formation of Tropical Depression Twelve, which eventually intensified into Hurricane Katrina. The cyclone had no effect on land, and did not directly result in any fatalities or damage.</p></div>'}}},
+
+    (('action', 'parse'), ('disableeditsection', ''), ('page', 'Tropical Depression Ten (2005)'), ('prop', 'text'), ('section', 9)):
+    {'error': {'code': 'nosuchsection', 'info': 'There is no section 9.'}},
+
   },
 
   "data": {
@@ -149,6 +231,8 @@ mock_data = {
 
     "celtuce.links": ['Calcium', 'Carbohydrate', 'Chinese language', 'Dietary Reference Intake', 'Dietary fiber', 'Fat', 'Folate', 'Food energy', 'Iron', 'Lettuce', 'Lhasa', 'Magnesium in biology', 'Manganese', 'Niacin', 'Pantothenic acid', 'Phosphorus', 'Pinyin', 'Plant stem', 'Potassium', 'Protein (nutrient)', 'Riboflavin', 'Sodium', 'Stir frying', 'Thiamine', 'Vegetable', 'Vitamin A', 'Vitamin B6', 'Vitamin C', 'Zinc'],
 
+    "celtuce.backlinks": ['Lettuce', 'Stem vegetable', 'List of vegetables', 'Chinese cuisine', 'Asparagus lettuce'],
+
     "celtuce.categories": ['All articles lacking sources', 'All stub articles', 'Articles containing Chinese-language text', 'Articles lacking sources from December 2009', 'Stem vegetables', 'Vegetable stubs'],
 
     "celtuce.html": '<table class="metadata plainlinks ambox ambox-content ambox-Unreferenced" style="" role="presentation">\n<tr><td class="mbox-image"><div style="width: 52px;"><a href="/wiki/File:Question_book-new.svg" class="image"><img alt="Question book-new.svg" src="//upload.wikimedia.org/wikipedia/en/thumb/9/99/Question_book-new.svg/50px-Question_book-new.svg.png" width="50" height="39" srcset="//upload.wikimedia.org/wikipedia/en/thumb/9/99/Question_book-new.svg/75px-Question_book-new.svg.png 1.5x, //upload.wikimedia.org/wikipedia/en/thumb/9/99/Question_book-new.svg/100px-Question_book-new.svg.png 2x" /></a></div></td><td class="mbox-text" style=""><span class="mbox-text-span">This article <b>does not <a href="/wiki/Wikipedia:Citing_sources" title="Wikipedia:Citing sources">cite</a> any <a href="/wiki/Wikipedia:Verifiability" title="Wikipedia:Verifiability">references or sources</a></b>.<span class="hide-when-compact">  Please help <a class="external text" href="//en.wikipedia.org/w/index.php?title=Celtuce&amp;action=edit">improve this article</a> by <a href="/wiki/Help:Introduction_to_referencing/1" title="Help:Introduction to referencing/1">adding citations to reliable sources</a>. Unsourced material may be challenged and <a href="/wiki/Wikipedia:Verifiability#Burden_of_evidence" title="Wikipedia:Verifiability">removed</a>.</span>&#32;<small><i>(December 2009)</i></small><span class="hide-when-compact"> </span></span></td></tr></table><div class="thumb tright"><div class="thumbinner" style="width:302px;"><a href="/wiki/File:Celtuce.jpg" class="image"><img alt="" src="//upload.wikimedia.org/wikipedia/commons/thumb/8/87/Celtuce.jpg/300px-Celtuce.jpg" width="300" height="135" class="thumbimage" srcset="//upload.wikimedia.org/wikipedia/commons/thumb/8/87/Celtuce.jpg/450px-Celtuce.jpg 1.5x, //upload.wikimedia.org/wikipedia/commons/thumb/8/87/Celtuce.jpg/600px-Celtuce.jpg 2x" /></a>  <div class="thumbcaption"><div class="magnify"><a href="/wiki/File:Celtuce.jpg" class="internal" title="Enlarge"><img src="//bits.wikimedia.org/static-1.22wmf12/skins/common/images/magnify-clip.png" width="15" height="11" alt="" /></a></div>Celtuce stems &amp; heads</div></div></div>\n<p><b>Celtuce</b> (<i>Lactuca sativa</i> var. <i>asparagina</i>, <i>augustana</i>, or <i>angustata</i>), also called <b>stem lettuce</b>, <b>celery lettuce</b>, <b>asparagus lettuce</b>, or <b>Chinese lettuce</b>, IPA (UK,US) <span title="Representation in the International Phonetic Alphabet (IPA)" class="IPA">/\u02c8s\u025blt.\u0259s/</span>, is a cultivar of <a href="/wiki/Lettuce" title="Lettuce">lettuce</a> grown primarily for its thick <a href="/wiki/Plant_stem" title="Plant stem">stem</a>, used as a <a href="/wiki/Vegetable" title="Vegetable">vegetable</a>.  It is especially popular in China, and is called <i><b>wosun</b></i> (<a href="/wiki/Chinese_language" title="Chinese language">Chinese</a>&#58; <span lang="zh"><a href="//en.wiktionary.org/wiki/%E8%8E%B4" class="extiw" title="wiktionary:\u83b4">\u83b4</a><a href="//en.wiktionary.org/wiki/%E7%AC%8B" class="extiw" title="wiktionary:\u7b0b">\u7b0b</a></span>&#59;&#32;<a href="/wiki/Pinyin" title="Pinyin">pinyin</a>&#58; <em>w\u014ds\u016dn</em>) or <i><b>woju</b></i> (<a href="/wiki/Chinese_language" title="Chinese language">Chinese</a>&#58; <span lang="zh"><a href="//en.wiktionary.org/wiki/%E8%8E%B4" class="extiw" title="wiktionary:\u83b4">\u83b4</a><a href="//en.wiktionary.org/wiki/%E8%8B%A3" class="extiw" title="wiktionary:\u82e3">\u82e3</a></span>&#59;&#32;<a href="/wiki/Pinyin" title="Pinyin">pinyin</a>&#58; <em>w\u014dj\xf9</em>) (although the latter name may also be used to mean lettuce in general).\n</p>\n<div class="thumb tright"><div class="thumbinner" style="width:302px;"><a href="/wiki/File:The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg" class="image"><img alt="" src="//upload.wikimedia.org/wikipedia/commons/thumb/d/dc/The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg/300px-The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg" width="300" height="241" class="thumbimage" srcset="//upload.wikimedia.org/wikipedia/commons/thumb/d/dc/The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg/450px-The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg 1.5x, //upload.wikimedia.org/wikipedia/commons/d/dc/The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg 2x" /></a>  <div class="thumbcaption"><div class="magnify"><a href="/wiki/File:The_farmer%27s_market_near_the_Potala_in_Lhasa.jpg" class="internal" title="Enlarge"><img src="//bits.wikimedia.org/static-1.22wmf12/skins/common/images/magnify-clip.png" width="15" height="11" alt="" /></a></div>Celtuce (foreground) for sale in <a href="/wiki/Lhasa" title="Lhasa">Lhasa</a></div></div></div>\n<table class="infobox" style="font-size: 88%; text-align: left; width: 22em; line-height: 1.5em">\n<caption style="font-size: 125%; font-weight: bold"> Celtuce, raw\n\n</caption>\n<tr>\n<th colspan="2" style="text-align: center"> Nutritional value per 100&#160;g (3.5&#160;oz)\n</th></tr>\n<tr style="background-color: #e0e0e0">\n<th> <a href="/wiki/Food_energy" title="Food energy">Energy</a>\n</th>\n<td> 75&#160;kJ (18&#160;kcal)\n</td></tr>\n<tr>\n<th> <a href="/wiki/Carbohydrate" title="Carbohydrate">Carbohydrates</a>\n</th>\n<td> 3.65 g\n</td></tr>\n\n\n\n<tr>\n<th> - <a href="/wiki/Dietary_fiber" title="Dietary fiber">Dietary fiber</a>\n</th>\n<td> 1.7 g\n</td></tr>\n\n<tr>\n<th> <a href="/wiki/Fat" title="Fat">Fat</a>\n</th>\n<td> 0.3 g\n</td></tr>\n\n\n\n\n\n\n<tr>\n<th> <a href="/wiki/Protein_(nutrient)" title="Protein (nutrient)">Protein</a>\n</th>\n<td> 0.85 g\n</td></tr>\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n<tr>\n<td> <a href="/wiki/Vitamin_A" title="Vitamin A">Vitamin A</a> equiv.\n</td>\n<td> 175 \u03bcg (22%)\n</td></tr>\n\n\n\n\n<tr>\n<td> <a href="/wiki/Thiamine" title="Thiamine">Thiamine (vit. B<sub>1</sub>)</a>\n</td>\n<td> 0.055 mg (5%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Riboflavin" title="Riboflavin">Riboflavin (vit. B<sub>2</sub>)</a>\n</td>\n<td> 0.07 mg (6%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Niacin" title="Niacin">Niacin (vit. B<sub>3</sub>)</a>\n</td>\n<td> 0.55 mg (4%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Pantothenic_acid" title="Pantothenic acid">Pantothenic acid</a> (B<sub>5</sub>)\n</td>\n<td> 0.183 mg (4%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Vitamin_B6" title="Vitamin B6">Vitamin B<sub>6</sub></a>\n</td>\n<td> 0.05 mg (4%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Folate" title="Folate" class="mw-redirect">Folate</a> (vit. B<sub>9</sub>)\n</td>\n<td> 46 \u03bcg (12%)\n</td></tr>\n\n\n<tr>\n<td> <a href="/wiki/Vitamin_C" title="Vitamin C">Vitamin C</a>\n</td>\n<td> 19.5 mg (23%)\n</td></tr>\n\n\n\n\n\n<tr>\n<td> <a href="/wiki/Calcium#Nutrition" title="Calcium">Calcium</a>\n</td>\n<td> 39 mg (4%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Iron#Biological_role" title="Iron">Iron</a>\n</td>\n<td> 0.55 mg (4%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Magnesium_in_biology" title="Magnesium in biology">Magnesium</a>\n</td>\n<td> 28 mg (8%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Manganese#Biological_role" title="Manganese">Manganese</a>\n</td>\n<td> 0.688 mg (33%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Phosphorus#Biological_role" title="Phosphorus">Phosphorus</a>\n</td>\n<td> 39 mg (6%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Potassium#In_diet" title="Potassium">Potassium</a>\n</td>\n<td> 330 mg (7%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Sodium#Biological_role" title="Sodium">Sodium</a>\n</td>\n<td> 11 mg (1%)\n</td></tr>\n<tr>\n<td> <a href="/wiki/Zinc#Biological_role" title="Zinc">Zinc</a>\n</td>\n<td> 0.27 mg (3%)\n</td></tr>\n\n\n\n\n\n<tr style="background-color: #e0e0e0; font-size: 90%; text-align: center; padding: 4pt; line-height: 1.25em">\n<td colspan="2"> <a rel="nofollow" class="external text" href="http://ndb.nal.usda.gov/ndb/search/list?qlookup=11145&amp;format=Full">Link to USDA Database entry</a><br/>Percentages are roughly approximated<br>using <a href="/wiki/Dietary_Reference_Intake" title="Dietary Reference Intake">US recommendations</a> for adults.<br/><small>Source: <a rel="nofollow" class="external text" href="http://ndb.nal.usda.gov/ndb/search/list">USDA Nutrient Database</a></small>\n</td></tr></table>\n<p>The stem is usually harvested at a length of around 15\u201320&#160;cm and a diameter of around 3\u20134&#160;cm. It is crisp, moist, and mildly flavored, and typically prepared by slicing and then <a href="/wiki/Stir_frying" title="Stir frying">stir frying</a> with more strongly flavored ingredients.\n</p><p><br />\n</p>\n<table class="metadata plainlinks stub" style="background: transparent;" role="presentation"><tr>\n<td><a href="/wiki/File:VegCorn.jpg" class="image"><img alt="Stub icon" src="//upload.wikimedia.org/wikipedia/commons/thumb/7/79/VegCorn.jpg/40px-VegCorn.jpg" width="40" height="26" srcset="//upload.wikimedia.org/wikipedia/commons/thumb/7/79/VegCorn.jpg/60px-VegCorn.jpg 1.5x, //upload.wikimedia.org/wikipedia/commons/thumb/7/79/VegCorn.jpg/80px-VegCorn.jpg 2x" /></a></td>\n<td><i>This <a href="/wiki/Vegetable" title="Vegetable">vegetable</a>-related article  is a <a href="/wiki/Wikipedia:Stub" title="Wikipedia:Stub">stub</a>.  You can help Wikipedia by <a class="external text" href="//en.wikipedia.org/w/index.php?title=Celtuce&amp;action=edit">expanding it</a>.</i><div class="noprint plainlinks hlist navbar mini" style="position: absolute; right: 15px; display: none;"><ul><li class="nv-view"><a href="/wiki/Template:Vegetable-stub" title="Template:Vegetable-stub"><span title="View this template" style="">v</span></a></li><li class="nv-talk"><a href="/wiki/Template_talk:Vegetable-stub" title="Template talk:Vegetable-stub"><span title="Discuss this template" style="">t</span></a></li><li class="nv-edit"><a class="external text" href="//en.wikipedia.org/w/index.php?title=Template:Vegetable-stub&amp;action=edit"><span title="Edit this template" style="">e</span></a></li></ul></div></td>\n</tr></table>\n',
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from wikipedia.fake_server import FakeMediaWiki, synthetic_corpus
+from wikipedia.response_cache import ResponseCache
+from wikipedia.transport import CallbackTransport, Response
+
+API_URL = 'http://en.wikipedia.org/w/api.php'
+
+
+class TestResponseCache(unittest.TestCase):
+  """Test the functionality of the persistent response cache."""
+
+  def setUp(self):
+    ''' create the cache in a temporary directory '''
+    self.tmpdir = tempfile.mkdtemp()
+    self.path = os.path.join(self.tmpdir, 'responses.sqlite')
+    self.cache = ResponseCache(self.path)
+
+  def tearDown(self):
+    ''' remove the temporary cache '''
+    self.cache.close()
+    shutil.rmtree(self.tmpdir)
+
+  def test_round_trip(self):
+    """Test that a stored response is returned for the same request."""
+    params = {'action': 'query', 'list': 'search', 'srsearch': 'Celtuce', 'format': 'json'}
+    self.assertEqual(self.cache.get(API_URL, params), None)
+    self.cache.set(API_URL, params, b'{"query": {}}')
+    self.assertEqual(self.cache.get(API_URL, dict(params)), b'{"query": {}}')
+
+  def test_keys(self):
+    """Test that the key depends on the API URL and the parameters."""
+    params = {'action': 'query', 'list': 'search', 'srsearch': 'Celtuce'}
+    self.cache.set(API_URL, params, b'{}')
+    self.assertEqual(self.cache.get('http://fr.wikipedia.org/w/api.php', params), None)
+    self.assertEqual(self.cache.get(API_URL, dict(params, srlimit=1)), None)
+
+  def test_ttls(self):
+    """Test the time to live lookup by action, prop, list, and meta."""
+    cache = ResponseCache(self.path, ttl=100, ttls={'siteinfo': 1000, 'links': 10, 'search': 0})
+    self.assertEqual(cache.ttl_for({'action': 'parse'}), 100)
+    self.assertEqual(cache.ttl_for({'action': 'query', 'meta': 'siteinfo'}), 1000)
+    self.assertEqual(cache.ttl_for({'action': 'query', 'prop': 'info|links'}), 10)
+
+    cache.set(API_URL, {'action': 'query', 'list': 'search'}, b'{}')
+    self.assertEqual(cache.get(API_URL, {'action': 'query', 'list': 'search'}), None)
+
+  def test_random(self):
+    """Test that non-deterministic requests are never stored."""
+    self.assertEqual(self.cache.ttl_for({'action': 'query', 'list': 'random'}), 0)
+    self.assertEqual(self.cache.ttl_for({'action': 'query', 'generator': 'random', 'prop': 'info'}), 0)
+    self.cache.set(API_URL, {'action': 'query', 'list': 'random', 'rnlimit': 3}, b'{}')
+    self.assertEqual(self.cache.size()[0], 0)
+
+  def test_expired(self):
+    """Test that expired responses are not returned."""
+    cache = ResponseCache(self.path, ttl=-1)
+    cache.set(API_URL, {'action': 'parse'}, b'{}')
+    self.assertEqual(cache.get(API_URL, {'action': 'parse'}), None)
+
+  def test_eviction(self):
+    """Test that the least recently used responses are evicted at max_size."""
+    content = os.urandom(1000)  # incompressible
+    first = {'action': 'query', 'titles': 'first'}
+    second = {'action': 'query', 'titles': 'second'}
+    self.cache.max_size = 2500
+    self.cache.access_resolution = 0
+    self.cache.set(API_URL, first, content)
+    self.cache.set(API_URL, second, content)
+    self.cache.get(API_URL, first)
+    self.cache.set(API_URL, {'action': 'query', 'titles': 'third'}, content)
+
+    self.assertEqual(self.cache.size()[0], 2)
+    self.assertEqual(self.cache.get(API_URL, second), None)
+    self.assertEqual(self.cache.get(API_URL, first), content)
+
+  def test_size_estimate(self):
+    """Test that the size is tracked as responses are stored instead of summed on every store."""
+    evictions = list()
+    evict = self.cache.evict
+
+    def counting_evict():
+      ''' count the evictions '''
+      evictions.append(self.cache._size)
+      evict()
+
+    self.cache.evict = counting_evict
+    self.cache.max_size = 2500
+    for title in ('first', 'second'):
+      self.cache.set(API_URL, {'action': 'query', 'titles': title}, os.urandom(1000))
+    self.assertEqual(evictions, [])
+    self.assertEqual(self.cache._size, self.cache.size()[1])
+
+    self.cache.set(API_URL, {'action': 'query', 'titles': 'third'}, os.urandom(1000))
+    self.assertEqual(len(evictions), 1)
+    self.assertEqual(self.cache.size()[0], 2)
+    self.assertEqual(self.cache._size, self.cache.size()[1])
+    self.assertTrue(self.cache._size <= 2500 * ResponseCache.EVICTION_TARGET)
+
+  def test_access_resolution(self):
+    """Test that repeated reads do not write the access time within access_resolution."""
+    params = {'action': 'parse'}
+    self.cache.set(API_URL, params, b'{}')
+    accessed = 'SELECT accessed FROM responses'
+    stored = self.cache._connection().execute(accessed).fetchone()[0]
+    self.cache.get(API_URL, params)
+    self.assertEqual(self.cache._connection().execute(accessed).fetchone()[0], stored)
+
+    self.cache.access_resolution = 0
+    time.sleep(0.01)
+    self.cache.get(API_URL, params)
+    self.assertTrue(self.cache._connection().execute(accessed).fetchone()[0] > stored)
+
+  def test_error_status(self):
+    """Test that error responses are not stored."""
+    self.cache.set(API_URL, {'action': 'parse'}, b'<html>error</html>', status_code=503)
+    self.cache.set(API_URL, {'action': 'query'}, b'{}', status_code=404)
+    self.assertEqual(self.cache.size()[0], 0)
+
+  def test_shared_file(self):
+    """Test that a second cache on the same file sees stored responses."""
+    self.cache.set(API_URL, {'action': 'parse'}, b'{"parse": {}}')
+    other = ResponseCache(self.path)
+    self.assertEqual(other.get(API_URL, {'action': 'parse'}), b'{"parse": {}}')
+    other.close()
+
+
+def unmocked_wikipedia():
+  ''' a fresh import of the wikipedia module, without the _wiki_request mocks of the other tests '''
+  package = sys.modules['wikipedia']
+  mocked = sys.modules.pop('wikipedia.wikipedia')
+  try:
+    return importlib.import_module('wikipedia.wikipedia')
+  finally:
+    sys.modules['wikipedia.wikipedia'] = mocked
+    package.wikipedia = mocked
+
+
+class TestRandomResponses(unittest.TestCase):
+  """Test random pages through the request layer with the response cache enabled."""
+
+  def setUp(self):
+    ''' answer the requests with a fake MediaWiki API and cache the responses '''
+    self.tmpdir = tempfile.mkdtemp()
+    self.wikipedia = unmocked_wikipedia()
+    api = FakeMediaWiki(corpus=synthetic_corpus(pages=50, links=5, categories=4), seed=0)
+    self.wikipedia.set_transport(CallbackTransport(lambda url, params: Response(*api.handle(params))))
+    self.wikipedia.set_response_cache(os.path.join(self.tmpdir, 'responses.sqlite'))
+    self.wikipedia.WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = (1, 28)
+
+  def tearDown(self):
+    ''' close and remove the response cache '''
+    self.wikipedia.set_response_cache(None)
+    shutil.rmtree(self.tmpdir)
+
+  def test_random(self):
+    """Test that random pages differ between calls while the response cache is enabled."""
+    results = [tuple(self.wikipedia.random(3)) for _ in range(4)]
+    self.assertTrue(len(set(results)) > 1)
+    self.assertEqual(self.wikipedia.get_response_cache().size()[0], 0)
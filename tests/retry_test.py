@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+import requests
+
+from wikipedia import wikipedia
+from wikipedia.retry import RetryPolicy, parse_retry_after
+from wikipedia.transport import Transport
+
+API_URL = 'http://en.wikipedia.org/w/api.php'
+
+
+class FakeResponse(object):
+  ''' minimal requests.Response stand in '''
+
+  def __init__(self, status_code=200, body=None, headers=None):
+    self.status_code = status_code
+    self.content = json.dumps(body).encode('utf-8') if body is not None else b'<html>error</html>'
+    self.headers = headers or dict()
+
+  def json(self):
+    ''' parse the body '''
+    return json.loads(self.content.decode('utf-8'))
+
+
+class FakeTransport(Transport):
+  ''' transport returning (or raising) the queued responses in order '''
+
+  errors = (requests.ConnectionError, requests.Timeout)
+
+  def __init__(self, responses):
+    self.responses = list(responses)
+    self.calls = 0
+
+  def send(self, url, params, headers=None, timeout=None):
+    ''' return the next response '''
+    self.calls += 1
+    response = self.responses.pop(0)
+    if isinstance(response, Exception):
+      raise response
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+  """Test the backoff computation of the retry policy."""
+
+  def test_exponential_backoff(self):
+    """Test that delays double up to max_backoff without jitter."""
+    policy = RetryPolicy(max_retries=6, backoff_factor=1, max_backoff=8, jitter=False, budget=None)
+    self.assertEqual([policy.delay(attempt) for attempt in range(7)], [1, 2, 4, 8, 8, 8, None])
+
+  def test_jitter(self):
+    """Test that jittered delays stay between 0 and the backoff."""
+    policy = RetryPolicy(backoff_factor=1)
+    for _ in range(20):
+      self.assertTrue(0 <= policy.delay(2) <= 4)
+
+  def test_budget(self):
+    """Test that no retry is made once the budget would be exceeded."""
+    policy = RetryPolicy(backoff_factor=1, jitter=False, budget=5)
+    self.assertEqual(policy.delay(1, waited=2), 2)
+    self.assertEqual(policy.delay(2, waited=3), None)
+
+  def test_retry_after(self):
+    """Test that the Retry-After header is honored."""
+    policy = RetryPolicy(jitter=False)
+    self.assertEqual(policy.delay(0, retry_after='5'), 5.0)
+    self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+    self.assertEqual(parse_retry_after('soon'), None)
+
+  def test_is_retryable(self):
+    """Test which API responses are transient errors."""
+    self.assertTrue(RetryPolicy.is_retryable({'error': {'code': 'maxlag', 'info': 'Waiting for a database server'}}))
+    self.assertTrue(RetryPolicy.is_retryable({'error': {'code': 'unknown', 'info': 'Pool queue is full'}}))
+    self.assertFalse(RetryPolicy.is_retryable({'error': {'code': 'badvalue', 'info': 'Bad value'}}))
+    self.assertFalse(RetryPolicy.is_retryable({'query': {}}))
+    self.assertFalse(RetryPolicy.is_retryable(['', [], [], []]))
+
+
+class TestSendRequest(unittest.TestCase):
+  """Test that the request layer retries transient failures."""
+
+  def setUp(self):
+    ''' use a fast policy and remember the transport to restore '''
+    self.transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT']
+    wikipedia.set_retry_policy(max_retries=3, backoff_factor=0.001, jitter=False)
+
+  def tearDown(self):
+    ''' restore the default policy and transport '''
+    wikipedia.set_retry_policy()
+    wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = self.transport
+
+  def send(self, responses):
+    ''' send a request through a fake transport '''
+    transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = FakeTransport(responses)
+    r, response = wikipedia._send_request(API_URL, {'action': 'query'})
+    return transport.calls, response
+
+  def test_transient_failures(self):
+    """Test that connection errors, 5xx and maxlag responses are retried."""
+    calls, response = self.send([
+      requests.ConnectionError(),
+      FakeResponse(503),
+      FakeResponse(200, {'error': {'code': 'maxlag', 'info': 'lagged'}}, {'Retry-After': '0'}),
+      FakeResponse(200, {'query': {'pages': {}}}),
+    ])
+    self.assertEqual(calls, 4)
+    self.assertEqual(response, {'query': {'pages': {}}})
+
+  def test_exhausted(self):
+    """Test that the last error is returned or raised once retries are exhausted."""
+    calls, response = self.send([FakeResponse(200, {'error': {'info': 'Pool queue is full'}})] * 4)
+    self.assertEqual(calls, 4)
+    self.assertEqual(response['error']['info'], 'Pool queue is full')
+
+    wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = FakeTransport([requests.Timeout()] * 4)
+    self.assertRaises(requests.Timeout, wikipedia._send_request, API_URL, {'action': 'query'})
+
+  def test_not_retried(self):
+    """Test that other API errors are returned immediately."""
+    calls, response = self.send([FakeResponse(200, {'error': {'code': 'badvalue', 'info': 'Bad value'}})])
+    self.assertEqual(calls, 1)
+
+  def test_using_retry_policy(self):
+    """Test that the retry policy may be changed for a single call."""
+    with wikipedia.using_retry_policy(max_retries=0):
+      calls, response = self.send([FakeResponse(200, {'error': {'info': 'Pool queue is full'}})])
+      self.assertEqual(calls, 1)
+    self.assertEqual(wikipedia.get_retry_policy().max_retries, 3)
@@ -44,3 +44,42 @@ class TestSearch(unittest.TestCase):
     search, suggestion = wikipedia.search("qmxjsudek", suggestion=True)
     self.assertEqual(search, [])
     self.assertEqual(suggestion, None)
+
+
+class TestIterSearch(unittest.TestCase):
+  """Test the functionality of wikipedia.iter_search."""
+
+  def setUp(self):
+    ''' count the requests; other test modules install their own mock on import '''
+    wikipedia._wiki_request = _wiki_request()
+    _wiki_request.calls.clear()
+
+  def test_continuation(self):
+    """Test that the continuation is followed to the last result."""
+    results = list(wikipedia.iter_search("Porsche"))
+    self.assertEqual(results[:3], mock_data['data']["porsche.search"])
+    self.assertEqual(results[3:], ['Porsche 911', 'Porsche Cayenne'])
+    self.assertEqual(len(_wiki_request.calls), 2)
+
+  def test_max_results(self):
+    """Test that no further batches are requested after max_results."""
+    self.assertEqual(list(wikipedia.iter_search("Porsche", max_results=3)), mock_data['data']["porsche.search"])
+    self.assertEqual(len(_wiki_request.calls), 1)
+
+  def test_records(self):
+    """Test resuming from an offset with full search hits."""
+    records = list(wikipedia.iter_search("Porsche", offset=3, records=True))
+    self.assertEqual([record['title'] for record in records], ['Porsche 911', 'Porsche Cayenne'])
+    self.assertEqual([record['offset'] for record in records], [3, 4])
+    self.assertEqual(records[0]['wordcount'], 10112)
+
+  def test_query_required(self):
+    """Test that a query is required when iter_search is called."""
+    self.assertRaises(ValueError, wikipedia.iter_search, " ")
+
+  def test_lazy(self):
+    """Test that no request is made until the first result is read."""
+    results = wikipedia.iter_search("Porsche")
+    self.assertEqual(len(_wiki_request.calls), 0)
+    self.assertEqual(next(results), mock_data['data']["porsche.search"][0])
+    self.assertEqual(len(_wiki_request.calls), 1)
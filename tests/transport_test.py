@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+  from http.server import BaseHTTPRequestHandler, HTTPServer
+  from urllib.parse import urlparse, parse_qsl
+except ImportError:
+  from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+  from urlparse import urlparse, parse_qsl
+
+from wikipedia import wikipedia
+from wikipedia.transport import (
+  CallbackTransport, RecordingTransport, ReplayTransport, RequestsTransport, Response, Transport, Urllib3Transport)
+from wikipedia.util import JSON_DECODERS, json_decoder
+
+API_URL = 'http://en.wikipedia.org/w/api.php'
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+  ''' respond with the query parameters and request headers as JSON '''
+
+  def do_GET(self):
+    body = json.dumps({
+      'params': dict(parse_qsl(urlparse(self.path).query)),
+      'user_agent': self.headers.get('User-Agent'),
+      'accept_encoding': self.headers.get('Accept-Encoding')
+    }).encode('utf-8')
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    ''' keep the test output quiet '''
+    pass
+
+
+class TestTransports(unittest.TestCase):
+  """Test the HTTP transports against a local server."""
+
+  @classmethod
+  def setUpClass(cls):
+    ''' start the local server '''
+    cls.server = HTTPServer(('127.0.0.1', 0), EchoHandler)
+    cls.url = 'http://127.0.0.1:{0}/w/api.php'.format(cls.server.server_address[1])
+    cls.thread = threading.Thread(target=cls.server.serve_forever)
+    cls.thread.daemon = True
+    cls.thread.start()
+
+  @classmethod
+  def tearDownClass(cls):
+    ''' stop the local server '''
+    cls.server.shutdown()
+    cls.server.server_close()
+
+  def check(self, transport):
+    ''' send a request and check the echoed request '''
+    r = transport.send(self.url, {'action': 'query', 'titles': 'Celtuce'}, headers={'User-Agent': 'test-agent'}, timeout=5)
+    self.assertEqual(r.status_code, 200)
+    echo = r.json()
+    self.assertEqual(echo['params'], {'action': 'query', 'titles': 'Celtuce'})
+    self.assertEqual(echo['user_agent'], 'test-agent')
+    transport.close()
+    return echo
+
+  def test_requests(self):
+    """Test the default requests transport."""
+    echo = self.check(RequestsTransport(pool_maxsize=20))
+    self.assertEqual(echo['accept_encoding'], 'gzip, deflate')
+
+  def test_urllib3(self):
+    """Test the urllib3 transport."""
+    echo = self.check(Urllib3Transport(compression=False))
+    self.assertEqual(echo['accept_encoding'], 'identity')
+
+  def test_pool_options(self):
+    """Test that the pool options are applied to the session adapters."""
+    transport = RequestsTransport(pool_connections=2, pool_maxsize=20, keep_alive=False)
+    adapter = transport.session.get_adapter(API_URL)
+    self.assertEqual(adapter._pool_connections, 2)
+    self.assertEqual(adapter._pool_maxsize, 20)
+    self.assertEqual(transport.session.headers['Connection'], 'close')
+
+  def test_interface(self):
+    """Test that a transport without send cannot be built."""
+    class Incomplete(Transport):
+      ''' a transport missing send '''
+
+      def close(self):
+        pass
+
+    self.assertRaises(TypeError, Transport)
+    self.assertRaises(TypeError, Incomplete)
+
+
+class TestSetTransport(unittest.TestCase):
+  """Test the functionality of wikipedia.set_transport."""
+
+  def setUp(self):
+    ''' remember the transport to restore '''
+    self.transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT']
+
+  def tearDown(self):
+    ''' restore the transport '''
+    wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = self.transport
+
+  def test_callback(self):
+    """Test that a callback transport answers the requests in process."""
+    requests = list()
+
+    def answer(url, params):
+      ''' record the request and answer it '''
+      requests.append((url, dict(params)))
+      return {'query': {'pages': {}}}
+
+    wikipedia.set_transport(CallbackTransport(answer))
+    r, response = wikipedia._send_request(API_URL, {'action': 'query', 'format': 'json'})
+    self.assertEqual(response, {'query': {'pages': {}}})
+    self.assertEqual(r.content, b'{"query": {"pages": {}}}')
+    self.assertEqual(requests, [(API_URL, {'action': 'query', 'format': 'json'})])
+
+  def test_default(self):
+    """Test that the default transport is built from the keyword arguments."""
+    wikipedia.set_transport(pool_maxsize=32)
+    transport = wikipedia.get_transport()
+    self.assertIsInstance(transport, RequestsTransport)
+    self.assertEqual(transport.pool_maxsize, 32)
+
+    session = transport.session
+    wikipedia.reset_session()
+    self.assertIs(wikipedia.get_transport(), transport)
+    self.assertIsNot(transport.session, session)
+
+
+class TestRecordReplay(unittest.TestCase):
+  """Test recording requests and replaying them offline."""
+
+  def setUp(self):
+    ''' record a few requests answered by a counter '''
+    self.tmpdir = tempfile.mkdtemp()
+    self.path = os.path.join(self.tmpdir, 'recording.jsonl.gz')
+    self.count = 0
+
+    def answer(url, params):
+      ''' answer with the number of requests so far '''
+      self.count += 1
+      return {'count': self.count}
+
+    recorder = RecordingTransport(self.path, CallbackTransport(answer))
+    for titles in ('Celtuce', 'Celtuce', 'purpleberry'):
+      recorder.send(API_URL, {'action': 'query', 'titles': titles})
+    recorder.close()
+
+  def tearDown(self):
+    ''' remove the recording '''
+    shutil.rmtree(self.tmpdir)
+
+  def test_replay(self):
+    """Test that repeated requests are replayed in order, then repeat the last response."""
+    replay = ReplayTransport(self.path)
+    self.assertEqual(len(replay), 3)
+    celtuce = {'titles': 'Celtuce', 'action': 'query'}
+    self.assertEqual(replay.send(API_URL, celtuce).json(), {'count': 1})
+    self.assertEqual(replay.send(API_URL, celtuce).json(), {'count': 2})
+    self.assertEqual(replay.send(API_URL, celtuce).json(), {'count': 2})
+    self.assertEqual(replay.send(API_URL, {'action': 'query', 'titles': 'purpleberry'}).json(), {'count': 3})
+
+  def test_missing(self):
+    """Test that a request not in the recording raises a KeyError."""
+    replay = ReplayTransport(self.path)
+    self.assertRaises(KeyError, replay.send, API_URL, {'action': 'query', 'titles': 'Lettuce'})
+
+  def test_latency(self):
+    """Test that the simulated latency delays each response."""
+    replay = ReplayTransport(self.path, latency=0.02)
+    start = time.time()
+    replay.send(API_URL, {'action': 'query', 'titles': 'purpleberry'})
+    self.assertTrue(time.time() - start >= 0.02)
+
+  def test_headers_and_binary(self):
+    """Test that replayed headers are case-insensitive and bodies that are not UTF-8 round-trip."""
+    path = os.path.join(self.tmpdir, 'binary.jsonl.gz')
+    answer = lambda url, params: Response(503, {'Retry-After': '2'}, b'\xff\xfe')
+    recorder = RecordingTransport(path, CallbackTransport(answer))
+    recorder.send(API_URL, {'action': 'query', 'titles': 'Celtuce'})
+    recorder.close()
+
+    r = ReplayTransport(path).send(API_URL, {'action': 'query', 'titles': 'Celtuce'})
+    self.assertEqual(r.status_code, 503)
+    self.assertEqual(r.headers['retry-after'], '2')
+    self.assertEqual(r.headers['Retry-After'], '2')
+    self.assertEqual(r.content, b'\xff\xfe')
+
+
+class TestJsonDecoder(unittest.TestCase):
+  """Test the functionality of wikipedia.set_json_decoder."""
+
+  def setUp(self):
+    ''' remember the decoder and transport to restore '''
+    self.decoder = wikipedia.WIKIPEDIA_GLOBALS['JSON_DECODER']
+    self.transport = wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT']
+
+  def tearDown(self):
+    ''' restore the decoder and transport '''
+    wikipedia.WIKIPEDIA_GLOBALS['JSON_DECODER'] = self.decoder
+    wikipedia.WIKIPEDIA_GLOBALS['TRANSPORT'] = self.transport
+
+  def test_decoders(self):
+    """Test that every installed decoder parses bytes."""
+    body = '{"query": {"pages": {"1": {"title": "Café"}}}}'.encode('utf-8')
+    for name in JSON_DECODERS:
+      try:
+        decode = json_decoder(name)
+      except ImportError:
+        continue
+      self.assertEqual(decode(body), {'query': {'pages': {'1': {'title': 'Café'}}}})
+    self.assertRaises(ValueError, json_decoder, 'yaml')
+
+  def test_set_decoder(self):
+    """Test that responses are decoded with the decoder in use."""
+    decoded = list()
+
+    def decode(content):
+      ''' record the raw body '''
+      decoded.append(content)
+      return {'decoded': True}
+
+    wikipedia.set_json_decoder(decode)
+    wikipedia.set_transport(CallbackTransport(lambda url, params: b'{}'))
+    r, response = wikipedia._send_request(API_URL, {'action': 'query'})
+    self.assertEqual(response, {'decoded': True})
+    self.assertEqual(decoded, [b'{}'])
+
+    wikipedia.set_json_decoder('json')
+    self.assertEqual(wikipedia._send_request(API_URL, {'action': 'query'})[1], {})
@@ -0,0 +1,759 @@
+'''
+Asyncio client mirroring the module level wikipedia API
+
+Requires python 3.5+ and `aiohttp <https://docs.aiohttp.org/>`_:
+
+    $ pip install wikipedia[async]
+
+Requests go through the same retry policy (``set_retry_policy`` and
+``using_retry_policy``), rate limiter (``set_rate_limiting``, shared per API URL
+with the module level API), response cache (``set_response_cache``), and
+request metrics (``get_stats``) as the module level API. The in-memory result
+caches of the module level functions and the pluggable transports are not used.
+
+Unlike the module level API, a ``DisambiguationError`` raised by ``page``
+already holds the rendered HTML of the disambiguation page; only parsing its
+`options` and `details` is deferred, since loading them on first access would
+block the event loop with a synchronous request.
+
+Usage::
+
+    async with AsyncWikipedia(max_concurrency=50) as wiki:
+        titles = await wiki.search('Barack Obama')
+        pages = await asyncio.gather(*[wiki.page(title, auto_suggest=False) for title in titles])
+        contents = await asyncio.gather(*[page.content for page in pages])
+'''
+import asyncio
+from decimal import Decimal
+from functools import partial
+
+from .exceptions import (
+    PageError, DisambiguationError, RedirectError, HTTPTimeoutError, WikipediaException,
+    WikipediaAPIVersionError, WikipediaExtensionError)
+from .metrics import clock
+from .util import _cmp_major_minor
+from .wikipedia import WIKIPEDIA_GLOBALS, _parse_disambiguation, _get_rate_limiter, get_retry_policy
+
+
+def _client_errors():
+    ''' the connection errors and timeouts of aiohttp that may be retried '''
+    try:
+        import aiohttp
+    except ImportError:
+        return (asyncio.TimeoutError,)
+    return (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class AsyncWikipedia(object):
+    '''
+    Asyncio Wikipedia client. All requests share one connection pool and at
+    most `max_concurrency` requests are in flight at any time.
+
+    Keyword arguments:
+
+    * api_url - the MediaWiki API URL; defaults to the URL in use by the module level API
+    * user_agent - the User-Agent header; defaults to the module level User-Agent
+    * timeout - the HTTP timeout in seconds; defaults to the module level timeout
+    * max_concurrency - the maximum number of requests in flight at once
+    * session - an existing aiohttp.ClientSession to use instead of creating one
+
+    .. note:: Use as an async context manager or call ``close`` when done
+    '''
+
+    def __init__(self, api_url=None, user_agent=None, timeout=None, max_concurrency=10, session=None):
+        self.api_url = api_url or WIKIPEDIA_GLOBALS['API_URL']
+        self.user_agent = user_agent or WIKIPEDIA_GLOBALS['USER_AGENT']
+        self.timeout = timeout if timeout is not None else WIKIPEDIA_GLOBALS['TIMEOUT']
+        self.max_concurrency = max_concurrency
+        self.api_version = None
+        self.api_version_major_minor = None
+        self.installed_extensions = None
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        ''' Close the underlying connection pool if it was created by this client '''
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self):
+        ''' create the shared session on first use (it must be created inside the event loop) '''
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError('AsyncWikipedia requires aiohttp: pip install aiohttp')
+            self._session = aiohttp.ClientSession(
+                headers={'User-Agent': self.user_agent},
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._owns_session = True
+        return self._session
+
+    async def _request(self, params):
+        '''
+        Make a request to the Wikipedia API using the given search parameters.
+        Returns a parsed dict of the JSON response.
+        '''
+        params['format'] = 'json'
+        if 'action' not in params:
+            params['action'] = 'query'
+        # aiohttp only accepts str, int and float parameter values
+        params = dict((key, value if isinstance(value, (int, float)) else '{0}'.format(value))
+                      for key, value in params.items())
+
+        # the response cache is a blocking SQLite database (waiting up to its timeout on a lock held
+        # by another process); keep it off the event loop
+        response_cache = WIKIPEDIA_GLOBALS['RESPONSE_CACHE']
+        loop = asyncio.get_event_loop()
+        if response_cache is not None:
+            content = await loop.run_in_executor(None, response_cache.get, self.api_url, params)
+            if content is not None:
+                WIKIPEDIA_GLOBALS['METRICS'].record_cache_hit()
+                return self._decode(content)
+
+        status, content, response = await self._send(params)
+
+        # do not persist errors such as timeouts or a full pool queue
+        if response_cache is not None and 'error' not in response:
+            await loop.run_in_executor(None, response_cache.set, self.api_url, params, content, status)
+
+        return response
+
+    async def _send(self, params):
+        '''
+        Send the request, retrying transient failures according to the retry
+        policy in use. Returns the HTTP status, the body, and its parsed JSON.
+        '''
+        retry_policy = get_retry_policy()
+        metrics = WIKIPEDIA_GLOBALS['METRICS']
+        errors = _client_errors()
+        attempt = 0
+        waited = 0.0
+        while True:
+            limiter = _get_rate_limiter(self.api_url)
+            if limiter is not None:
+                wait = limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                metrics.record_rate_limit_wait(wait)
+
+            start = clock()
+            try:
+                status, headers, content = await self._fetch(params)
+            except errors:
+                metrics.record_request(params, clock() - start, 0, failed=True)
+                delay = retry_policy.delay(attempt, waited)
+                if delay is None:
+                    raise
+            else:
+                metrics.record_request(params, clock() - start, len(content), failed=status >= 400)
+
+                # 5xx responses are usually HTML error pages; only parse them if retries are exhausted
+                response = None if status in retry_policy.status_codes else self._decode(content)
+                if response is not None and not retry_policy.is_retryable(response):
+                    return status, content, response
+
+                delay = retry_policy.delay(attempt, waited, headers.get('Retry-After'))
+                if delay is None:
+                    return status, content, (self._decode(content) if response is None else response)
+
+            metrics.record_retry()
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    async def _fetch(self, params):
+        ''' Send one HTTP request; returns the HTTP status, the response headers, and the body '''
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            async with self._get_session().get(self.api_url, params=params) as response:
+                return response.status, response.headers, await response.read()
+
+    @staticmethod
+    def _decode(content):
+        ''' Parse the JSON body with the JSON decoder in use, timing the decoding '''
+        start = clock()
+        response = WIKIPEDIA_GLOBALS['JSON_DECODER'](content)
+        WIKIPEDIA_GLOBALS['METRICS'].record_json_decode(clock() - start)
+        return response
+
+    async def _check_site_info(self):
+        ''' Load the API version and installed extensions on first use '''
+        if self.api_version_major_minor is not None:
+            return
+
+        response = await self._request({
+            'meta': 'siteinfo',
+            'siprop': 'extensions|general'
+        })
+        self.api_version = response['query']['general']['generator'].split(" ")[1].split("-")[0]
+        self.api_version_major_minor = [int(item) for item in self.api_version.split('.')]
+        self.installed_extensions = set(ext['name'] for ext in response['query']['extensions'])
+
+    async def _require_version(self, version, function):
+        ''' raise WikipediaAPIVersionError if the site is older than `version` '''
+        await self._check_site_info()
+        if _cmp_major_minor(self.api_version_major_minor, version):
+            raise WikipediaAPIVersionError(self.api_url, self.api_version, '.'.join(str(v) for v in version), function)
+
+    async def _require_extension(self, extension, function):
+        ''' raise WikipediaExtensionError if the site does not have `extension` installed '''
+        await self._check_site_info()
+        if extension not in self.installed_extensions:
+            raise WikipediaExtensionError(self.api_url, extension, function)
+
+    async def search(self, query, results=10, suggestion=False):
+        '''
+        Do a Wikipedia search for `query`.
+
+        Keyword arguments:
+
+        * results - the maxmimum number of results returned
+        * suggestion - if True, return results and suggestion (if any) in a tuple
+
+        .. note:: MediaWiki version >= 1.16
+        '''
+        await self._require_version([1, 16], 'search')
+
+        if query is None or query.strip() == '':
+            raise ValueError("Query must be specified")
+        search_params = {
+            'list': 'search',
+            'srprop': '',
+            'srlimit': results,
+            'srsearch': query
+        }
+        if suggestion:
+            search_params['srinfo'] = 'suggestion'
+
+        raw_results = await self._request(search_params)
+        _raise_for_error(raw_results, query)
+
+        search_results = [d['title'] for d in raw_results['query']['search']]
+        if suggestion:
+            searchinfo = raw_results['query'].get('searchinfo')
+            return search_results, (searchinfo['suggestion'] if searchinfo else None)
+
+        return search_results
+
+    async def suggest(self, query):
+        '''
+        Get a Wikipedia search suggestion for `query`.
+        Returns a string or None if no suggestion was found.
+
+        .. note:: MediaWiki API Version >= 1.16
+        '''
+        await self._require_version([1, 16], 'suggest')
+
+        if query is None or query.strip() == '':
+            raise ValueError("Query must be specified")
+
+        raw_result = await self._request({
+            'list': 'search',
+            'srinfo': 'suggestion',
+            'srprop': '',
+            'srsearch': query
+        })
+        _raise_for_error(raw_result, query)
+
+        if raw_result['query'].get('searchinfo'):
+            return raw_result['query']['searchinfo']['suggestion']
+        return None
+
+    async def geosearch(self, latitude, longitude, title=None, results=10, radius=1000):
+        '''
+        Do a wikipedia geo search for `latitude` and `longitude`
+
+        Keyword arguments:
+
+        * title - The title of an article to search for
+        * results - the maximum number of results returned
+        * radius - Search radius in meters. The value must be between 10 and 10000
+
+        .. note:: Requires GeoData extension
+        '''
+        await self._require_extension('GeoData', 'geosearch')
+
+        if latitude is None or (type(latitude) != Decimal and latitude.strip() == ''):
+            raise ValueError("Latitude must be specified")
+        if longitude is None or (type(longitude) != Decimal and longitude.strip() == ''):
+            raise ValueError("Longitude must be specified")
+
+        search_params = {
+            'list': 'geosearch',
+            'gsradius': radius,
+            'gscoord': '{0}|{1}'.format(latitude, longitude),
+            'gslimit': results
+        }
+        if title:
+            search_params['titles'] = title
+
+        raw_results = await self._request(search_params)
+        _raise_for_error(raw_results, '{0}|{1}'.format(latitude, longitude))
+
+        search_pages = raw_results['query'].get('pages')
+        if search_pages:
+            return [v['title'] for k, v in search_pages.items() if k != '-1']
+        return [d['title'] for d in raw_results['query']['geosearch']]
+
+    async def categorymembers(self, category, results=10, subcategories=True):
+        '''
+        Do a Wikipedia search for pages, and optionally sub-categories, that belong to a `category`.
+
+        Keyword arguments:
+
+        * results - the maxmimum number of results returned
+        * subcategories - if True, return pages and sub-categories (if any) in a tuple
+
+        .. note:: MediaWiki version >= 1.17
+        '''
+        await self._require_version([1, 17], 'categorymembers')
+
+        if category is None or category.strip() == '':
+            raise ValueError("Category must be specified")
+
+        raw_results = await self._request({
+            'list': 'categorymembers',
+            'cmprop': 'ids|title|type',
+            'cmtype': ('page|subcat' if subcategories else 'page'),
+            'cmlimit': results,
+            'cmtitle': 'Category:' + category
+        })
+        _raise_for_error(raw_results, category)
+
+        pages = list()
+        subcats = list()
+        for d in raw_results['query']['categorymembers']:
+            if d['type'] == 'page':
+                pages.append(d['title'])
+            elif d['type'] == 'subcat':
+                subcats.append(d['title'][9:] if d['title'].startswith('Category:') else d['title'])
+        if subcategories:
+            return pages, subcats
+        return pages
+
+    async def summary(self, title, sentences=0, chars=0, auto_suggest=True, redirect=True):
+        '''
+        Plain text summary of the page.
+
+        Keyword arguments:
+
+        * sentences - if set, return the first `sentences` sentences (can be no greater than 10).
+        * chars - if set, return only the first `chars` characters (actual text returned may be slightly longer).
+        * auto_suggest - let Wikipedia find a valid page title for the query
+        * redirect - allow redirection without raising RedirectError
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server
+        '''
+        await self._require_extension('TextExtracts', 'summary()')
+
+        if title is None or title.strip() == '':
+            raise ValueError('Summary title must be specified.')
+
+        page_info = await self.page(title, auto_suggest=auto_suggest, redirect=redirect)
+        return await page_info.get_summary(sentences, chars)
+
+    async def page(self, title=None, pageid=None, auto_suggest=True, redirect=True):
+        '''
+        Get an AsyncWikipediaPage object for the page with title `title` or the pageid
+        `pageid` (mutually exclusive).
+
+        Keyword arguments:
+
+        * title - the title of the page to load
+        * pageid - the numeric pageid of the page to load
+        * auto_suggest - let Wikipedia find a valid page title for the query
+        * redirect - allow redirection without raising RedirectError
+
+        .. note:: The rendered HTML of a disambiguation page is downloaded before DisambiguationError is raised;
+                  only its parsing is deferred to the first access of `options` or `details`
+        '''
+        await self._check_site_info()
+
+        if title is not None and title.strip() != '':
+            if auto_suggest:
+                results, suggestion = await self.search(title, results=1, suggestion=True)
+                try:
+                    title = suggestion or results[0]
+                except IndexError:
+                    raise PageError(title)
+            page_info = AsyncWikipediaPage(self, title=title)
+        elif pageid is not None:
+            page_info = AsyncWikipediaPage(self, pageid=pageid)
+        else:
+            raise ValueError("Either a title or a pageid must be specified")
+
+        await page_info._load(redirect=redirect)
+        return page_info
+
+
+class AsyncWikipediaPage(object):
+    '''
+    Contains data from a Wikipedia page, loaded through an AsyncWikipedia client.
+    Properties are awaitable and cached after the first request::
+
+        content = await page.content
+
+    .. note:: Use ``AsyncWikipedia.page`` rather than creating these directly
+    '''
+
+    def __init__(self, client, title=None, pageid=None):
+        self._client = client
+        self.title = title
+        self.original_title = title
+        self.pageid = pageid
+        self.url = None
+        self._cache = dict()
+
+    def __repr__(self):
+        return '<AsyncWikipediaPage \'{0}\'>'.format(self.title)
+
+    def __eq__(self, other):
+        try:
+            return (
+                self.pageid == other.pageid
+                and self.title == other.title
+                and self.url == other.url
+            )
+        except AttributeError:
+            return False
+
+    @property
+    def _title_query_param(self):
+        ''' util function to determine which parameter method to use '''
+        if self.title is not None:
+            return {'titles': self.title}
+        return {'pageids': self.pageid}
+
+    async def _load(self, redirect=True):
+        '''
+        Load basic information from Wikipedia.
+        Confirm that page exists and is not a disambiguation/redirect.
+        '''
+        query_params = {
+            'prop': 'info|pageprops',
+            'inprop': 'url',
+            'ppprop': 'disambiguation',
+            'redirects': '',
+        }
+        query_params.update(self._title_query_param)
+        request = await self._client._request(query_params)
+
+        query = request['query']
+        pageid = list(query['pages'].keys())[0]
+        page = query['pages'][pageid]
+
+        if 'missing' in page:
+            if self.title is not None:
+                raise PageError(self.title)
+            raise PageError(pageid=self.pageid)
+        elif 'redirects' in query:
+            if not redirect:
+                raise RedirectError(self.title or page['title'])
+            self.title = query['redirects'][0]['to']
+            self.pageid = None
+            await self._load(redirect=redirect)
+        elif 'pageprops' in page:
+            query_params = {
+                'prop': 'revisions',
+                'rvprop': 'content',
+                'rvparse': '',
+                'rvlimit': 1
+            }
+            query_params.update(self._title_query_param)
+            # download the HTML now rather than on first access of the options, which may not await
+            request = await self._client._request(query_params)
+            html = request['query']['pages'][pageid]['revisions'][0]['*']
+            raise DisambiguationError(self.title or page['title'], loader=partial(_parse_disambiguation, html))
+        else:
+            self.pageid = pageid
+            self.title = page['title']
+            self.url = page['fullurl']
+
+    async def _continued_query(self, query_params):
+        '''
+        Based on https://www.mediawiki.org/wiki/API:Query#Continuing_queries
+        '''
+        query_params.update(self._title_query_param)
+
+        results = list()
+        last_continue = dict()
+        prop = query_params.get('prop')
+        while True:
+            params = query_params.copy()
+            params.update(last_continue)
+            request = await self._client._request(params)
+
+            if 'query' not in request:
+                break
+
+            pages = request['query']['pages']
+            if 'generator' in query_params:
+                results.extend(pages.values())
+            else:
+                results.extend(pages[self.pageid].get(prop, list()))
+
+            if 'continue' not in request:
+                break
+            last_continue = request['continue']
+        return results
+
+    async def _cached(self, name, loader):
+        '''
+        return the cached value of `name`, calling `loader` to fill it on first use;
+        concurrent callers share the same pending request
+        '''
+        task = self._cache.get(name)
+        if task is None:
+            task = self._cache[name] = asyncio.ensure_future(loader())
+        try:
+            return await task
+        except Exception:
+            # do not keep failures so that the next access tries again
+            if self._cache.get(name) is task:
+                del self._cache[name]
+            raise
+
+    async def html(self):
+        '''
+        Get full page HTML.
+
+        .. note:: MediaWiki version >= 1.17
+        '''
+        async def loader():
+            await self._client._require_version([1, 17], 'html')
+            request = await self._client._request({
+                'prop': 'revisions',
+                'rvprop': 'content',
+                'rvlimit': 1,
+                'rvparse': '',
+                'titles': self.title
+            })
+            return request['query']['pages'][self.pageid]['revisions'][0]['*']
+        return await self._cached('html', loader)
+
+    async def _load_content(self):
+        ''' load the content, revision_id and parent_id in one request '''
+        await self._client._require_version([1, 11], 'content')
+        await self._client._require_extension('TextExtracts', 'content')
+        query_params = {
+            'prop': 'extracts|revisions',
+            'explaintext': '',
+            'rvprop': 'ids'
+        }
+        query_params.update(self._title_query_param)
+        request = await self._client._request(query_params)
+        page = request['query']['pages'][self.pageid]
+        return page['extract'], page['revisions'][0]['revid'], page['revisions'][0]['parentid']
+
+    @property
+    def content(self):
+        '''
+        Plain text content of the page, excluding images, tables, and other data.
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server >= 1.11
+        '''
+        async def get():
+            return (await self._cached('content', self._load_content))[0]
+        return get()
+
+    @property
+    def revision_id(self):
+        '''
+        Revision ID of the page.
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server >= 1.11
+        '''
+        async def get():
+            return (await self._cached('content', self._load_content))[1]
+        return get()
+
+    @property
+    def parent_id(self):
+        '''
+        Revision ID of the parent version of the current revision of this page.
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server >= 1.11
+        '''
+        async def get():
+            return (await self._cached('content', self._load_content))[2]
+        return get()
+
+    @property
+    def summary(self):
+        '''
+        Plain text summary of the page.
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server
+        '''
+        return self._cached('summary', self.get_summary)
+
+    async def get_summary(self, sentences=0, chars=0):
+        '''
+        Plain text summary of the page.
+
+        Keyword arguments:
+
+        * sentences - if set, return the first `sentences` sentences (can be no greater than 10).
+        * chars - if set, return only the first `chars` characters (actual text returned may be slightly longer).
+
+        .. note:: Requires TextExtracts extension to be installed on MediaWiki server
+        '''
+        await self._client._require_extension('TextExtracts', 'get_summary()')
+
+        query_params = {
+            'prop': 'extracts',
+            'explaintext': '',
+            'titles': self.title
+        }
+        if sentences:
+            query_params['exsentences'] = (10 if sentences > 10 else sentences)
+        elif chars:
+            query_params['exchars'] = (1 if chars < 1 else chars)
+        else:
+            query_params['exintro'] = ''
+
+        request = await self._client._request(query_params)
+        return request['query']['pages'][self.pageid]['extract']
+
+    @property
+    def images(self):
+        '''
+        List of URLs of images on the page.
+        '''
+        async def loader():
+            pages = await self._continued_query({'generator': 'images', 'gimlimit': 'max', 'prop': 'imageinfo', 'iiprop': 'url'})
+            return [page['imageinfo'][0]['url'] for page in pages if 'imageinfo' in page]
+        return self._cached('images', loader)
+
+    @property
+    def coordinates(self):
+        '''
+        Tuple of Decimals in the form of (lat, lon) or None
+
+        .. note:: Requires GeoData extension
+        '''
+        async def loader():
+            await self._client._require_extension('GeoData', 'coordinates')
+            request = await self._client._request({'prop': 'coordinates', 'colimit': 'max', 'titles': self.title})
+            if 'query' in request and 'coordinates' in request['query']['pages'][self.pageid]:
+                coordinates = request['query']['pages'][self.pageid]['coordinates']
+                return (Decimal(coordinates[0]['lat']), Decimal(coordinates[0]['lon']))
+            return None
+        return self._cached('coordinates', loader)
+
+    @property
+    def references(self):
+        '''
+        List of URLs of external links on a page.
+
+        .. note:: MediaWiki version >= 1.13
+        '''
+        async def loader():
+            await self._client._require_version([1, 13], 'references')
+            links = await self._continued_query({'prop': 'extlinks', 'ellimit': 'max'})
+            return [link['*'] if link['*'].startswith('http') else 'http:' + link['*'] for link in links]
+        return self._cached('references', loader)
+
+    @property
+    def links(self):
+        '''
+        List of titles of Wikipedia page links on a page.
+
+        .. note:: MediaWiki version >= 1.13
+        '''
+        async def loader():
+            await self._client._require_version([1, 13], 'links')
+            links = await self._continued_query({'prop': 'links', 'plnamespace': 0, 'pllimit': 'max'})
+            return [link['title'] for link in links]
+        return self._cached('links', loader)
+
+    @property
+    def categories(self):
+        '''
+        List of non-hidden categories of a page.
+
+        .. note:: MediaWiki version >= 1.14
+        '''
+        async def loader():
+            await self._client._require_version([1, 14], 'categories')
+            links = await self._continued_query({'prop': 'categories', 'cllimit': 'max', 'clshow': '!hidden'})
+            return [link['title'][9:] if link['title'].startswith('Category:') else link['title'] for link in links]
+        return self._cached('categories', loader)
+
+    @property
+    def redirects(self):
+        '''
+        List of all redirects to the page.
+
+        .. note:: MediaWiki version >= 1.24
+        '''
+        async def loader():
+            await self._client._require_version([1, 24], 'redirects')
+            links = await self._continued_query({'prop': 'redirects', 'rdprop': 'title', 'rdlimit': '100'})
+            return [link['title'] for link in links]
+        return self._cached('redirects', loader)
+
+    @property
+    def backlinks(self):
+        '''
+        List all pages that link to this page
+
+        .. note:: MediaWiki version >= 1.9
+        '''
+        async def loader():
+            await self._client._require_version([1, 9], 'backlinks')
+            query_params = {
+                'list': 'backlinks',
+                'bltitle': self.title,
+                'bllimit': 500,
+                'blfilterredir': 'nonredirects',
+                'blnamespace': 0
+            }
+            backlinks = list()
+            while True:
+                results = await self._client._request(dict(query_params))
+                backlinks.extend(link['title'] for link in results['query']['backlinks'])
+                if 'continue' not in results:
+                    break
+                query_params['blcontinue'] = results['continue']['blcontinue']
+            return backlinks
+        return self._cached('backlinks', loader)
+
+    @property
+    def sections(self):
+        '''
+        List of section titles from the table of contents on the page.
+        '''
+        async def loader():
+            query_params = {
+                'action': 'parse',
+                'prop': 'sections',
+            }
+            if self.title is None:
+                query_params['pageid'] = self.pageid
+            else:
+                query_params['page'] = self.title
+            request = await self._client._request(query_params)
+            return [section['line'] for section in request['parse']['sections']]
+        return self._cached('sections', loader)
+
+
+def _raise_for_error(raw_results, query):
+    ''' raise the matching exception if the API returned an error '''
+    if 'error' in raw_results:
+        if raw_results['error']['info'] in ('HTTP request timed out.', 'Pool queue is full'):
+            raise HTTPTimeoutError(query)
+        raise WikipediaException(raw_results['error']['info'])
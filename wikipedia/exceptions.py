@@ -50,14 +50,52 @@ class DisambiguationError(WikipediaException):
   of Wikipedia pages that the query may refer to.
 
   .. note:: `options` does not include titles that do not link to a valid Wikipedia page.
+
+  .. note:: When built with a `loader`, `options` and `details` are only loaded on first access,
+            which requests the rendered disambiguation page. Formatting the error (e.g. in a
+            traceback) or pickling it never loads them: until they are loaded, the message only
+            names the title.
   """
 
-  def __init__(self, title, may_refer_to, details=None):
+  def __init__(self, title, may_refer_to=None, details=None, loader=None):
     self.title = title
-    self.options = may_refer_to
-    self.details = details
+    self._options = may_refer_to
+    self._details = details
+    self._loader = loader
+
+  def __load(self):
+    ''' load the options and details with the loader, once '''
+    if self._loader is not None:
+      self._options, self._details = self._loader()
+      self._loader = None
+
+  @property
+  def options(self):
+    ''' the titles the query may refer to '''
+    self.__load()
+    return self._options
+
+  @options.setter
+  def options(self, value):
+    self._options = value
+
+  @property
+  def details(self):
+    ''' a list of dicts of the title and description of each option '''
+    self.__load()
+    return self._details
+
+  @details.setter
+  def details(self, value):
+    self._details = value
+
+  def __reduce__(self):
+    # the loader is pickled instead of the options, so pickling does not load them
+    return (self.__class__, (self.title, self._options, self._details, self._loader))
 
   def __unicode__(self):
+    if self._loader is not None:
+      return u"\"{0}\" may refer to several pages; see the options of the error".format(self.title)
     return u"\"{0}\" may refer to: \n  {1}".format(self.title, '\n  '.join(self.options))
 
 
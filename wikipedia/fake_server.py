@@ -0,0 +1,709 @@
+'''
+Local fake MediaWiki API server for throughput and latency testing
+
+Implements, in memory and with the standard library only, the subsets of
+`api.php` used by this library: `action=query` (info, pageprops, extracts,
+revisions, links, extlinks, categories, redirects, coordinates, images,
+search, geosearch, categorymembers, backlinks, prefixsearch, random, and
+siteinfo), `action=opensearch`, and `action=parse`. Latency, HTTP errors,
+`maxlag`, and "Pool queue is full" responses can be injected at random.
+
+Usage::
+
+    with FakeMediaWikiServer(FakeMediaWiki(latency=0.05, maxlag_rate=0.01)) as server:
+        wikipedia.set_api_url(server.url, 'en')
+        wikipedia.page('Article 1')
+
+or from the command line::
+
+    $ python -m wikipedia.fake_server --port 8080 --pages 1000 --latency 0.05
+'''
+from __future__ import unicode_literals
+
+import argparse
+import difflib
+import gzip
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qsl
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qsl
+
+# the largest `*limit` the API accepts without bot rights
+MAX_LIMIT = 500
+
+SECTION_HEADING = re.compile(r'^(={2,6}) (.+?) \1$', re.MULTILINE)
+
+# prop name: (parameter prefix, function of the page to its list of items)
+PAGE_LISTS = {
+    'links': ('pl', lambda page: [{'ns': 0, 'title': title} for title in page.get('links', list())]),
+    'categories': ('cl', lambda page: [{'ns': 14, 'title': 'Category:' + title} for title in page.get('categories', list())]),
+    'extlinks': ('el', lambda page: [{'*': url} for url in page.get('references', list())]),
+    'redirects': ('rd', lambda page: [{'ns': 0, 'title': title} for title in page.get('redirects', list())]),
+}
+
+
+def load_corpus(path):
+    ''' Load a corpus from a JSON file: {"pages": [...], "languages": {...}} '''
+    with io.open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def synthetic_corpus(pages=100, links=20, categories=10, seed=0):
+    '''
+    Generate a corpus of `pages` linked articles ("Article 0", "Article 1", ...)
+    in a tree of `categories` categories ("Topic 0" is the root), with
+    sections, references, images, coordinates, some redirects ("Article #N"
+    for every tenth article) and a disambiguation page ("Article (disambiguation)").
+    '''
+    rng = random.Random(seed)
+    titles = ['Article {0}'.format(i) for i in range(pages)]
+    corpus = list()
+    for i, title in enumerate(titles):
+        intro = ('{0} is a synthetic article of the fake MediaWiki corpus. '
+                 'It belongs to topic {1}. It links to {2} other articles.').format(title, i % categories, links)
+        extract = '{0}\n\n\n== History ==\nThe history of {1}.\n\n\n== Description ==\n{1} is described here.' \
+                  '\n\n\n=== Details ===\nMore details.\n\n\n== See also ==\n'.format(intro, title)
+        corpus.append({
+            'title': title,
+            'pageid': 1000 + i,
+            'revid': 500000 + i,
+            'parentid': 400000 + i,
+            'extract': extract,
+            'links': sorted(rng.sample([t for t in titles if t != title], min(links, pages - 1))),
+            'categories': ['Topic {0}'.format(i % categories)],
+            'references': ['http://example.org/{0}/reference-{1}'.format(i, j) for j in range(3)],
+            'images': ['http://upload.example.org/{0}/image-{1}.jpg'.format(i, j) for j in range(2)],
+            'coordinates': [round(rng.uniform(-80, 80), 4), round(rng.uniform(-180, 180), 4)],
+            'redirects': ['Article #{0}'.format(i)] if i % 10 == 0 else list()
+        })
+
+    corpus.append({
+        'title': 'Article (disambiguation)',
+        'pageid': 999,
+        'revid': 499999,
+        'parentid': 399999,
+        'extract': 'Article may refer to:\n' + '\n'.join(titles[:5]),
+        'links': titles[:5],
+        'disambiguation': True
+    })
+    for i in range(categories):
+        corpus.append({
+            'title': 'Category:Topic {0}'.format(i),
+            'pageid': 100 + i,
+            'extract': 'Articles about topic {0}.'.format(i),
+            'categories': ['Topic {0}'.format((i - 1) // 2)] if i else list()
+        })
+    return {'pages': corpus}
+
+
+class FakeMediaWiki(object):
+    '''
+    The fake `api.php`: answers the parsed query parameters of a request.
+
+    Keyword arguments:
+
+    * corpus - the corpus dict or the path to a JSON corpus; defaults to a ``synthetic_corpus``
+    * version - the MediaWiki version reported by siteinfo
+    * extensions - the extensions reported by siteinfo
+    * latency - seconds to wait before each response, or a (min, max) tuple to wait a random time
+    * error_rate - the fraction of requests answered with an HTTP 503
+    * maxlag_rate - the fraction of requests answered with a `maxlag` error and a Retry-After header
+    * pool_full_rate - the fraction of requests answered with a "Pool queue is full" error
+    * retry_after - the value of the Retry-After header of `maxlag` responses
+    * seed - the seed of the random faults and `list=random`
+    '''
+
+    def __init__(self, corpus=None, version='1.28.0', extensions=('TextExtracts', 'GeoData', 'OpenSearch'),
+                 latency=0, error_rate=0, maxlag_rate=0, pool_full_rate=0, retry_after='1', seed=None):
+        if corpus is None:
+            corpus = synthetic_corpus()
+        elif not isinstance(corpus, dict):
+            corpus = load_corpus(corpus)
+        self.version = version
+        self.extensions = list(extensions)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.maxlag_rate = maxlag_rate
+        self.pool_full_rate = pool_full_rate
+        self.retry_after = retry_after
+        self.languages = corpus.get('languages', {'en': 'English'})
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._index(corpus['pages'])
+
+    def _index(self, pages):
+        ''' build the title, pageid, redirect, category member, and backlink lookups '''
+        self.pages = dict()
+        self.pageids = dict()
+        self.redirects = dict()
+        self.members = dict()
+        self.backlinks = dict()
+        next_id = max([page['pageid'] for page in pages] + [0]) + 1
+        for page in pages:
+            self.pages[page['title']] = page
+            self.pageids['{0}'.format(page['pageid'])] = page
+            for category in page.get('categories', list()):
+                self.members.setdefault(category, list()).append(page['title'])
+            for link in page.get('links', list()):
+                self.backlinks.setdefault(link, list()).append(page['title'])
+        for page in pages:
+            for title in page.get('redirects', list()):
+                redirect = {'title': title, 'pageid': next_id, 'redirect': page['title']}
+                self.redirects[title] = redirect
+                self.pageids['{0}'.format(next_id)] = redirect
+                self.backlinks.setdefault(page['title'], list()).append(title)
+                next_id += 1
+
+    def handle(self, params):
+        '''
+        Answer the query parameters of one request; returns the HTTP status,
+        the response headers, and the body (bytes)
+        '''
+        with self._lock:
+            self.requests += 1
+            fault = self._random.random()
+            latency = self.latency
+            if isinstance(latency, (list, tuple)):
+                latency = self._random.uniform(latency[0], latency[1])
+        if latency:
+            time.sleep(latency)
+
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        if fault < self.error_rate:
+            return 503, {'Content-Type': 'text/html'}, b'<html><body>503 Service Unavailable</body></html>'
+        fault -= self.error_rate
+        if fault < self.maxlag_rate:
+            headers.update({'Retry-After': self.retry_after, 'X-Database-Lag': '5'})
+            return 200, headers, self._dump({'error': {'code': 'maxlag', 'info': 'Waiting for a database server: 5 seconds lagged.'}})
+        fault -= self.maxlag_rate
+        if fault < self.pool_full_rate:
+            return 200, headers, self._dump({'error': {'code': 'internal_api_error_PoolCounterError', 'info': 'Pool queue is full'}})
+
+        action = params.get('action', 'query')
+        if action == 'query':
+            response = self._query(params)
+        elif action == 'opensearch':
+            response = self._opensearch(params)
+        elif action == 'parse':
+            response = self._parse(params)
+        else:
+            response = self._error('unknown_action', 'Unrecognized value for parameter "action": {0}.'.format(action))
+        return 200, headers, self._dump(response)
+
+    @staticmethod
+    def _dump(response):
+        return json.dumps(response).encode('utf-8')
+
+    @staticmethod
+    def _error(code, info):
+        return {'error': {'code': code, 'info': info}}
+
+    @staticmethod
+    def _limit(value, default=10):
+        ''' parse a `*limit` parameter '''
+        if value in (None, ''):
+            return default
+        if value == 'max':
+            return MAX_LIMIT
+        return min(int(value), MAX_LIMIT)
+
+    @staticmethod
+    def _normalize(title):
+        ''' MediaWiki title normalization: underscores to spaces and a capital first letter '''
+        title = title.replace('_', ' ').strip()
+        return title[:1].upper() + title[1:]
+
+    @staticmethod
+    def _url(title):
+        return 'http://localhost/wiki/{0}'.format(title.replace(' ', '_'))
+
+    def _intro(self, page):
+        ''' the text before the first section heading '''
+        match = SECTION_HEADING.search(page.get('extract', ''))
+        return page.get('extract', '')[:match.start()] if match else page.get('extract', '')
+
+    def _html(self, page):
+        ''' the rendered HTML of a page '''
+        if 'html' in page:
+            return page['html']
+        if page.get('disambiguation'):
+            items = ''.join('<li><a href="/wiki/{0}" title="{1}">{1}</a>, an article</li>'.format(title.replace(' ', '_'), title)
+                            for title in page.get('links', list()))
+            return '<p><b>{0}</b> may refer to:</p>\n<ul>{1}</ul>\n'.format(page['title'], items)
+        html = list()
+        for block in page.get('extract', '').split('\n\n\n'):
+            match = SECTION_HEADING.match(block)
+            if match:
+                level = len(match.group(1))
+                html.append('<h{0}>{1}</h{0}>'.format(level, match.group(2)))
+                block = block[match.end():]
+            html.extend('<p>{0}</p>'.format(line) for line in block.split('\n') if line.strip())
+        return '\n'.join(html)
+
+    def _section_text(self, page, index):
+        ''' the text of a section, with its heading and subsections; 0 for the lead; None if there is no such section '''
+        extract = page.get('extract', '')
+        headings = list(SECTION_HEADING.finditer(extract))
+        if index == 0:
+            return extract[:headings[0].start()] if headings else extract
+        if index > len(headings):
+            return None
+        heading = headings[index - 1]
+        end = len(extract)
+        for following in headings[index:]:
+            if len(following.group(1)) <= len(heading.group(1)):
+                end = following.start()
+                break
+        return extract[heading.start():end]
+
+    def _sections(self, page):
+        sections = list()
+        for number, match in enumerate(SECTION_HEADING.finditer(page.get('extract', '')), 1):
+            level = len(match.group(1))
+            sections.append({
+                'toclevel': level - 1,
+                'level': '{0}'.format(level),
+                'line': match.group(2),
+                'number': '{0}'.format(number),
+                'index': '{0}'.format(number),
+                'anchor': match.group(2).replace(' ', '_')
+            })
+        return sections
+
+    def _resolve(self, params, query):
+        '''
+        Resolve the `titles` or `pageids` parameter; returns a list of (pageid, page
+        data, corpus page or None); adds `normalized` and `redirects` to the query
+        '''
+        follow = 'redirects' in params
+        resolved = list()
+        missing = 0
+        if params.get('titles'):
+            for title in params['titles'].split('|'):
+                normalized = self._normalize(title)
+                if normalized != title:
+                    query.setdefault('normalized', list()).append({'from': title, 'to': normalized})
+                if normalized in self.redirects:
+                    if follow:
+                        query.setdefault('redirects', list()).append({'from': normalized, 'to': self.redirects[normalized]['redirect']})
+                        normalized = self.redirects[normalized]['redirect']
+                    else:
+                        redirect = self.redirects[normalized]
+                        pageid = '{0}'.format(redirect['pageid'])
+                        resolved.append((pageid, {'pageid': redirect['pageid'], 'ns': 0, 'title': normalized, 'redirect': ''}, None))
+                        continue
+                page = self.pages.get(normalized)
+                if page is None:
+                    missing -= 1
+                    resolved.append(('{0}'.format(missing), {'ns': 0, 'title': normalized, 'missing': ''}, None))
+                else:
+                    resolved.append(('{0}'.format(page['pageid']), self._page_data(page), page))
+        elif params.get('pageids'):
+            for pageid in params['pageids'].split('|'):
+                page = self.pageids.get(pageid)
+                if page is None:
+                    resolved.append((pageid, {'pageid': int(pageid), 'missing': ''}, None))
+                elif 'redirect' in page:
+                    if follow:
+                        query.setdefault('redirects', list()).append({'from': page['title'], 'to': page['redirect']})
+                        target = self.pages[page['redirect']]
+                        resolved.append(('{0}'.format(target['pageid']), self._page_data(target), target))
+                    else:
+                        resolved.append((pageid, {'pageid': int(pageid), 'ns': 0, 'title': page['title'], 'redirect': ''}, None))
+                else:
+                    resolved.append((pageid, self._page_data(page), page))
+        return resolved
+
+    @staticmethod
+    def _page_data(page):
+        return {'pageid': page['pageid'], 'ns': 14 if page['title'].startswith('Category:') else 0, 'title': page['title']}
+
+    def _query(self, params):
+        query = dict()
+        response = {'batchcomplete': ''}
+        last_continue = dict()
+        # modules already finished in an earlier batch of a continued query
+        done = set(params.get('continue', '').partition('||')[2].split('|')) - set([''])
+
+        meta = params.get('meta', '')
+        if meta == 'siteinfo':
+            siprop = params.get('siprop', 'general').split('|')
+            if 'general' in siprop:
+                query['general'] = {'generator': 'MediaWiki {0}'.format(self.version), 'sitename': 'Fake Wiki', 'lang': 'en'}
+            if 'extensions' in siprop:
+                query['extensions'] = [{'name': name, 'type': 'other'} for name in self.extensions]
+            if 'languages' in siprop:
+                query['languages'] = [{'code': code, '*': name} for code, name in sorted(self.languages.items())]
+
+        for module in params.get('list', '').split('|'):
+            if module and module not in done:
+                handler = getattr(self, '_list_{0}'.format(module), None)
+                if handler is None:
+                    return self._error('unknown_list', 'Unrecognized value for parameter "list": {0}.'.format(module))
+                query[module] = handler(params, query, last_continue)
+
+        if 'generator' in params:
+            if params['generator'] != 'images':
+                return self._error('unknown_generator', 'Unrecognized value for parameter "generator": {0}.'.format(params['generator']))
+            query['pages'] = self._generator_images(params, query, last_continue)
+        elif params.get('titles') or params.get('pageids'):
+            resolved = self._resolve(params, query)
+            props = [prop for prop in params.get('prop', '').split('|') if prop and prop not in done]
+            query['pages'] = self._pages(params, resolved, props, last_continue)
+
+        if last_continue:
+            continuing = set(key[:2] for key in last_continue)
+            modules = [prop for prop in params.get('prop', '').split('|') + params.get('list', '').split('|') if prop]
+            finished = [module for module in modules if self._prefix(module) not in continuing]
+            last_continue['continue'] = '||' + '|'.join(sorted(done.union(finished)))
+            response['continue'] = last_continue
+            del response['batchcomplete']
+
+        response['query'] = query
+        return response
+
+    @staticmethod
+    def _prefix(module):
+        ''' the two letter parameter prefix of a module '''
+        prefixes = {'links': 'pl', 'categories': 'cl', 'extlinks': 'el', 'redirects': 'rd', 'search': 'sr',
+                    'backlinks': 'bl', 'categorymembers': 'cm', 'prefixsearch': 'ps', 'images': 'gi'}
+        return prefixes.get(module, module[:2])
+
+    def _pages(self, params, resolved, props, last_continue):
+        pages = dict()
+        for pageid, data, page in resolved:
+            pages[pageid] = dict(data)
+            if page is None:
+                continue
+            if 'info' in props:
+                pages[pageid].update({'lastrevid': page.get('revid', 0), 'length': len(page.get('extract', '')),
+                                      'contentmodel': 'wikitext', 'pagelanguage': 'en'})
+                if 'url' in params.get('inprop', ''):
+                    pages[pageid]['fullurl'] = self._url(page['title'])
+                    pages[pageid]['editurl'] = self._url(page['title']) + '?action=edit'
+            if 'pageprops' in props and page.get('disambiguation') and 'disambiguation' in params.get('ppprop', 'disambiguation'):
+                pages[pageid]['pageprops'] = {'disambiguation': ''}
+            if 'extracts' in props:
+                pages[pageid]['extract'] = self._extract(params, page)
+            if 'revisions' in props:
+                revision = {'revid': page.get('revid', 0), 'parentid': page.get('parentid', 0)}
+                if 'content' in params.get('rvprop', ''):
+                    revision = {'*': self._html(page) if 'rvparse' in params else page.get('extract', '')}
+                pages[pageid]['revisions'] = [revision]
+            if 'coordinates' in props and page.get('coordinates'):
+                lat, lon = page['coordinates']
+                pages[pageid]['coordinates'] = [{'lat': lat, 'lon': lon, 'primary': '', 'globe': 'earth'}]
+
+        for prop in props:
+            if prop in PAGE_LISTS:
+                prefix, items = PAGE_LISTS[prop]
+                self._page_list(params, resolved, pages, prop, prefix, items, last_continue)
+        return pages
+
+    def _page_list(self, params, resolved, pages, prop, prefix, items, last_continue):
+        ''' add a continued list prop to the pages; the limit applies across all of the pages '''
+        limit = self._limit(params.get(prefix + 'limit'))
+        start = params.get(prefix + 'continue')
+        started = start is None
+        start_pageid, _, start_index = (start or '').partition('|')
+        count = 0
+        for pageid, _, page in resolved:
+            if page is None:
+                continue
+            begin = 0
+            if not started:
+                if pageid != start_pageid:
+                    continue
+                started = True
+                begin = int(start_index)
+            values = items(page)
+            for i in range(begin, len(values)):
+                if count == limit:
+                    last_continue[prefix + 'continue'] = '{0}|{1}'.format(pageid, i)
+                    return
+                pages[pageid].setdefault(prop, list()).append(values[i])
+                count += 1
+
+    def _extract(self, params, page):
+        text = self._intro(page).strip() if 'exintro' in params else page.get('extract', '')
+        if params.get('exsentences'):
+            sentences = re.split(r'(?<=[.!?])\s+', self._intro(page).strip())
+            text = ' '.join(sentences[:int(params['exsentences'])])
+        elif params.get('exchars'):
+            text = text[:int(params['exchars'])] + '...'
+        return text
+
+    def _generator_images(self, params, query, last_continue):
+        resolved = [item for item in self._resolve(params, query) if item[2] is not None]
+        urls = [url for _, _, page in resolved for url in page.get('images', list())]
+        offset = int(params.get('gimcontinue', 0))
+        limit = self._limit(params.get('gimlimit'))
+        if offset + limit < len(urls):
+            last_continue['gimcontinue'] = '{0}'.format(offset + limit)
+        pages = dict()
+        for i, url in enumerate(urls[offset:offset + limit], offset + 1):
+            pages['-{0}'.format(i)] = {'ns': 6, 'title': 'File:' + url.rsplit('/', 1)[-1], 'missing': '',
+                                       'imagerepository': 'shared', 'imageinfo': [{'url': url}]}
+        return pages
+
+    def _paged(self, values, params, prefix, last_continue, default=10):
+        ''' page through a list with the `<prefix>limit` and `<prefix>continue` (or offset) parameters '''
+        limit = self._limit(params.get(prefix + 'limit'), default)
+        offset = int(params.get(prefix + 'continue') or params.get(prefix + 'offset') or 0)
+        if offset + limit < len(values):
+            key = prefix + ('offset' if prefix in ('sr', 'ps') else 'continue')
+            last_continue[key] = offset + limit if key.endswith('offset') else '{0}'.format(offset + limit)
+        return values[offset:offset + limit]
+
+    def _list_search(self, params, query, last_continue):
+        term = params.get('srsearch', '').lower()
+        titles = [title for title in sorted(self.pages) if not title.startswith('Category:')]
+        hits = [title for title in titles if term in title.lower()]
+        hits += [title for title in titles if title not in hits and term in self.pages[title].get('extract', '').lower()]
+
+        if 'suggestion' in params.get('srinfo', ''):
+            suggestions = difflib.get_close_matches(params.get('srsearch', ''), titles, n=1) if not hits else list()
+            if suggestions:
+                query['searchinfo'] = {'suggestion': suggestions[0].lower()}
+        else:
+            query['searchinfo'] = {'totalhits': len(hits)}
+
+        results = list()
+        srprop = params.get('srprop', '').split('|')
+        for title in self._paged(hits, params, 'sr', last_continue):
+            page = self.pages[title]
+            hit = {'ns': 0, 'title': title}
+            if 'size' in srprop:
+                hit['size'] = len(page.get('extract', ''))
+            if 'wordcount' in srprop:
+                hit['wordcount'] = len(page.get('extract', '').split())
+            if 'snippet' in srprop:
+                hit['snippet'] = self._intro(page)[:100]
+            if 'timestamp' in srprop:
+                hit['timestamp'] = '2017-01-01T00:00:00Z'
+            hit['pageid'] = page['pageid']
+            results.append(hit)
+        return results
+
+    def _list_geosearch(self, params, query, last_continue):
+        lat, lon = [float(value) for value in params['gscoord'].split('|')]
+        radius = float(params.get('gsradius', 500))
+        found = list()
+        for title, page in self.pages.items():
+            if not page.get('coordinates'):
+                continue
+            distance = _distance(lat, lon, page['coordinates'][0], page['coordinates'][1])
+            if distance <= radius:
+                found.append((distance, page))
+        found.sort(key=lambda item: (item[0], item[1]['title']))
+        return [{'pageid': page['pageid'], 'ns': 0, 'title': page['title'], 'lat': page['coordinates'][0],
+                 'lon': page['coordinates'][1], 'dist': round(distance, 1), 'primary': ''}
+                for distance, page in found[:self._limit(params.get('gslimit'))]]
+
+    def _list_categorymembers(self, params, query, last_continue):
+        category = self._normalize(params['cmtitle'])
+        if category.startswith('Category:'):
+            category = category[9:]
+        types = params.get('cmtype', 'page|subcat').split('|')
+        members = list()
+        for title in self.members.get(category, list()):
+            kind = 'subcat' if title.startswith('Category:') else 'page'
+            if kind in types:
+                members.append({'pageid': self.pages[title]['pageid'], 'ns': 14 if kind == 'subcat' else 0,
+                                'title': title, 'type': kind})
+        return self._paged(members, params, 'cm', last_continue)
+
+    def _list_backlinks(self, params, query, last_continue):
+        title = self._normalize(params['bltitle'])
+        redirect_filter = params.get('blfilterredir', 'all')
+        links = list()
+        for source in self.backlinks.get(title, list()):
+            is_redirect = source in self.redirects
+            if (redirect_filter == 'redirects' and not is_redirect) or (redirect_filter == 'nonredirects' and is_redirect):
+                continue
+            pageid = self.redirects[source]['pageid'] if is_redirect else self.pages[source]['pageid']
+            links.append({'pageid': pageid, 'ns': 0, 'title': source})
+        return self._paged(links, params, 'bl', last_continue)
+
+    def _list_prefixsearch(self, params, query, last_continue):
+        prefix = self._normalize(params.get('pssearch', ''))
+        titles = [{'ns': 0, 'title': title, 'pageid': self.pages[title]['pageid']}
+                  for title in sorted(self.pages) if title.startswith(prefix)]
+        return self._paged(titles, params, 'ps', last_continue)
+
+    def _list_random(self, params, query, last_continue):
+        titles = sorted(title for title in self.pages if not title.startswith('Category:'))
+        with self._lock:
+            chosen = self._random.sample(titles, min(self._limit(params.get('rnlimit'), 1), len(titles)))
+        return [{'id': self.pages[title]['pageid'], 'ns': 0, 'title': title} for title in chosen]
+
+    def _opensearch(self, params):
+        search = params.get('search', '')
+        limit = min(self._limit(params.get('limit')), 100)
+        titles = [title for title in sorted(self.pages) if title.lower().startswith(search.lower())][:limit]
+        return [search, titles, [self._intro(self.pages[title]).strip() for title in titles],
+                [self._url(title) for title in titles]]
+
+    def _parse(self, params):
+        if params.get('pageid'):
+            page = self.pageids.get(params['pageid'])
+        else:
+            title = self._normalize(params.get('page', ''))
+            if title in self.redirects and 'redirects' in params:
+                title = self.redirects[title]['redirect']
+            page = self.pages.get(title)
+        if page is None or 'redirect' in page:
+            return self._error('missingtitle', "The page you specified doesn't exist.")
+
+        parsed = {'title': page['title'], 'pageid': page['pageid']}
+        if params.get('section') not in (None, ''):
+            text = self._section_text(page, int(params['section']))
+            if text is None:
+                return self._error('nosuchsection', 'There is no section {0}.'.format(params['section']))
+            page = dict(page, extract=text)
+            page.pop('html', None)
+            page.pop('disambiguation', None)
+        props = params.get('prop', 'text').split('|')
+        if 'sections' in props:
+            parsed['sections'] = self._sections(page)
+        if 'text' in props:
+            parsed['text'] = {'*': self._html(page)}
+        return {'parse': parsed}
+
+
+def _distance(lat1, lon1, lat2, lon2):
+    ''' great circle distance in meters '''
+    lat1, lon1, lat2, lon2 = [math.radians(value) for value in (lat1, lon1, lat2, lon2)]
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371000 * 2 * math.asin(min(1, math.sqrt(a)))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    ''' serve `/w/api.php` from the FakeMediaWiki of the server '''
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != '/w/api.php':
+            self._send(404, {'Content-Type': 'text/plain'}, b'Not Found')
+            return
+        params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        status, headers, body = self.server.api.handle(params)
+        if self.server.compression and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = _gzip(body)
+            headers['Content-Encoding'] = 'gzip'
+        self._send(status, headers, body)
+
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '{0}'.format(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+
+def _gzip(body):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+        f.write(body)
+    return buf.getvalue()
+
+
+class FakeMediaWikiServer(ThreadingMixIn, HTTPServer):
+    '''
+    Threaded HTTP server for a ``FakeMediaWiki``; each request is served in its own thread.
+
+    Keyword arguments:
+
+    * api - the FakeMediaWiki to serve; defaults to one with a synthetic corpus
+    * host - the interface to listen on
+    * port - the port to listen on; 0 to pick a free port
+    * compression - gzip the responses to clients that accept it
+    * verbose - log each request to stderr
+
+    .. note:: Use as a context manager or call ``start`` and ``stop``
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, api=None, host='127.0.0.1', port=0, compression=True, verbose=False):
+        HTTPServer.__init__(self, (host, port), _Handler)
+        self.api = api or FakeMediaWiki()
+        self.compression = compression
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def url(self):
+        ''' the URL of the fake `api.php`, to pass to ``set_api_url`` '''
+        return 'http://{0}:{1}/w/api.php'.format(self.server_address[0], self.server_address[1])
+
+    def start(self):
+        ''' serve in a background thread '''
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        ''' stop serving and close the socket '''
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    ''' command line entry point '''
+    parser = argparse.ArgumentParser(description='Serve a fake MediaWiki api.php')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--corpus', help='JSON corpus file; defaults to a synthetic corpus')
+    parser.add_argument('--pages', type=int, default=100, help='the number of pages of the synthetic corpus')
+    parser.add_argument('--latency', type=float, default=0, help='seconds to wait before each response')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of HTTP 503 responses')
+    parser.add_argument('--maxlag-rate', type=float, default=0, help='fraction of maxlag responses')
+    parser.add_argument('--pool-full-rate', type=float, default=0, help='fraction of "Pool queue is full" responses')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    api = FakeMediaWiki(corpus=args.corpus or synthetic_corpus(pages=args.pages), latency=args.latency,
+                        error_rate=args.error_rate, maxlag_rate=args.maxlag_rate,
+                        pool_full_rate=args.pool_full_rate, seed=args.seed)
+    server = FakeMediaWikiServer(api, host=args.host, port=args.port, verbose=args.verbose)
+    print('Serving {0}'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
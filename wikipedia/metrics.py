@@ -0,0 +1,133 @@
+'''
+Metrics of the requests sent to the MediaWiki API
+'''
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import OrderedDict
+
+# high resolution clock where available (python 3.3+) to time short operations
+clock = getattr(time, 'perf_counter', time.time)
+
+# upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics(object):
+    '''
+    Thread safe counters of the requests sent to the API: the number of
+    requests by `action`, `prop`, and `list`, a latency histogram, the bytes
+    received, retries, time waited on the rate limiter, and the time spent
+    decoding JSON and parsing HTML.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        ''' Set all of the counters back to zero '''
+        with self._lock:
+            self._requests = 0
+            self._errors = 0
+            self._by_action = dict()
+            self._by_prop = dict()
+            self._by_list = dict()
+            self._latency_total = 0.0
+            self._latency_max = 0.0
+            self._histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+            self._bytes = 0
+            self._retries = 0
+            self._rate_limit_wait = 0.0
+            self._cache_hits = 0
+            self._json_decode_time = 0.0
+            self._html_parse_time = 0.0
+
+    def record_request(self, params, elapsed, size, failed=False):
+        '''
+        Count one HTTP request
+
+        Arguments:
+
+        * params - the query parameters of the request
+        * elapsed - the seconds taken by the request
+        * size - the number of bytes in the response body
+
+        Keyword arguments:
+
+        * failed - True if the request raised a connection error or returned an HTTP error
+        '''
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and elapsed > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+        with self._lock:
+            self._requests += 1
+            if failed:
+                self._errors += 1
+            self.__count(self._by_action, params.get('action', 'query'))
+            for prop in params.get('prop', '').split('|'):
+                self.__count(self._by_prop, prop)
+            for module in params.get('list', '').split('|'):
+                self.__count(self._by_list, module)
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+            self._histogram[bucket] += 1
+            self._bytes += size
+
+    @staticmethod
+    def __count(counts, key):
+        if key:
+            counts[key] = counts.get(key, 0) + 1
+
+    def record_retry(self):
+        ''' Count a retried request '''
+        with self._lock:
+            self._retries += 1
+
+    def record_rate_limit_wait(self, seconds):
+        ''' Add the seconds a request waited on the rate limiter '''
+        with self._lock:
+            self._rate_limit_wait += seconds
+
+    def record_cache_hit(self):
+        ''' Count a response served by the persistent response cache instead of a request '''
+        with self._lock:
+            self._cache_hits += 1
+
+    def record_json_decode(self, seconds):
+        ''' Add the seconds spent decoding a JSON response '''
+        with self._lock:
+            self._json_decode_time += seconds
+
+    def record_html_parse(self, seconds):
+        ''' Add the seconds spent parsing HTML '''
+        with self._lock:
+            self._html_parse_time += seconds
+
+    def snapshot(self):
+        ''' Return a copy of the counters as a dict '''
+        with self._lock:
+            histogram = OrderedDict()
+            for bound, count in zip(LATENCY_BUCKETS, self._histogram):
+                histogram['<={0}'.format(bound)] = count
+            histogram['>{0}'.format(LATENCY_BUCKETS[-1])] = self._histogram[-1]
+            return {
+                'requests': self._requests,
+                'errors': self._errors,
+                'by_action': dict(self._by_action),
+                'by_prop': dict(self._by_prop),
+                'by_list': dict(self._by_list),
+                'latency': {
+                    'total': self._latency_total,
+                    'mean': self._latency_total / self._requests if self._requests else 0.0,
+                    'max': self._latency_max,
+                    'histogram': histogram
+                },
+                'bytes': self._bytes,
+                'retries': self._retries,
+                'rate_limit_wait': self._rate_limit_wait,
+                'response_cache_hits': self._cache_hits,
+                'json_decode_time': self._json_decode_time,
+                'html_parse_time': self._html_parse_time
+            }
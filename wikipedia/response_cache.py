@@ -0,0 +1,208 @@
+'''
+Persistent, SQLite backed cache of raw MediaWiki API responses
+'''
+from __future__ import unicode_literals
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ResponseCache(object):
+    '''
+    Store raw API responses on disk so that repeated requests, even across
+    process restarts, do not leave the machine.
+
+    Responses are keyed by the API URL and the canonicalized request
+    parameters and are stored zlib compressed. The database is opened in
+    WAL mode so that several processes on one host may share the same file.
+
+    Arguments:
+
+    * path - the path to the SQLite database file
+
+    Keyword arguments:
+
+    * ttl - the default number of seconds a response remains valid; None for no expiration
+    * ttls - dict of `action`, `prop`, `list`, or `meta` values to the number of seconds a matching response remains valid
+    * max_size - the maximum number of compressed bytes to keep; None for no limit
+    * compression - the zlib compression level (0 - 9)
+    * timeout - the number of seconds to wait on a database locked by another process
+    * access_resolution - the number of seconds within which repeated reads of a response do not
+                          update its last access time; the least recently used order is only this precise
+
+    .. note:: Non-deterministic requests (`list=random` and `generator=random`) are never stored
+
+    .. note:: The size of the cache is summed once, then tracked as responses are stored; once over
+              `max_size`, responses are evicted down to `EVICTION_TARGET` of `max_size`. Responses
+              stored by other processes are counted at the next eviction.
+    '''
+
+    # the fraction of max_size to evict down to, so that evictions are not repeated on every store
+    EVICTION_TARGET = 0.9
+
+    # `list` and `generator` values whose responses differ on every request
+    NONDETERMINISTIC = frozenset(['random'])
+
+    def __init__(self, path, ttl=86400, ttls=None, max_size=None, compression=6, timeout=30, access_resolution=60):
+        self.path = path
+        self.ttl = ttl
+        self.ttls = dict(ttls) if ttls else dict()
+        self.max_size = max_size
+        self.compression = compression
+        self.timeout = timeout
+        self.access_resolution = access_resolution
+        self._local = threading.local()
+        self._size_lock = threading.Lock()
+        # the estimated total compressed bytes; None until first summed
+        self._size = None
+
+        conn = self._connection()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    expires REAL,
+                    accessed REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def _connection(self):
+        ''' sqlite connections may not be shared between threads; keep one per thread '''
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(url, params):
+        ''' Build the cache key from the API URL and the canonicalized parameters '''
+        canonical = '&'.join(
+            '{0}={1}'.format(key, params[key]) for key in sorted(params)
+        )
+        return hashlib.sha1('{0}?{1}'.format(url, canonical).encode('utf-8')).hexdigest()
+
+    def ttl_for(self, params):
+        '''
+        Determine the time to live of a request; the shortest of any matching
+        `action`, `prop`, `list`, or `meta` values, otherwise the default ttl;
+        0 for a non-deterministic request
+        '''
+        for param in ('list', 'generator'):
+            if self.NONDETERMINISTIC.intersection('{0}'.format(params.get(param, '')).split('|')):
+                return 0
+
+        matched = list()
+        for param in ('action', 'prop', 'list', 'meta'):
+            for value in '{0}'.format(params.get(param, '')).split('|'):
+                if value in self.ttls:
+                    matched.append(self.ttls[value])
+        if not matched:
+            return self.ttl
+        finite = [ttl for ttl in matched if ttl is not None]
+        return min(finite) if finite else None
+
+    def get(self, url, params):
+        ''' Return the raw response bytes for the request or None if not cached '''
+        ttl = self.ttl_for(params)
+        if ttl is not None and ttl <= 0:
+            return None
+
+        key = self.make_key(url, params)
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute('SELECT expires, accessed, payload FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        expires, accessed, payload = row
+        if expires is not None and expires <= now:
+            with conn:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            return None
+
+        # reads are far more frequent than writes; only record an access once per access_resolution
+        if now - accessed >= self.access_resolution:
+            with conn:
+                conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+        return zlib.decompress(payload)
+
+    def set(self, url, params, content, status_code=200):
+        '''
+        Store the raw response bytes for the request; error responses (HTTP
+        status 400 and above) and requests with a time to live of 0 or less
+        are not stored
+        '''
+        if status_code >= 400:
+            return
+        ttl = self.ttl_for(params)
+        if ttl is not None and ttl <= 0:
+            return
+
+        now = time.time()
+        payload = zlib.compress(content, self.compression)
+        expires = None if ttl is None else now + ttl
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, expires, accessed, size, payload) VALUES (?, ?, ?, ?, ?)',
+                (self.make_key(url, params), expires, now, len(payload), sqlite3.Binary(payload))
+            )
+        if self.max_size is not None:
+            with self._size_lock:
+                if self._size is None:
+                    self._size = self.size()[1]
+                else:
+                    # a replaced response is counted twice; the estimate is corrected at the next eviction
+                    self._size += len(payload)
+                full = self._size > self.max_size
+            if full:
+                self.evict()
+
+    def evict(self):
+        '''
+        Remove expired responses and then, if over max_size, the least recently
+        used until within `EVICTION_TARGET` of max_size
+        '''
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if self.max_size is not None and total > self.max_size:
+                target = self.max_size * self.EVICTION_TARGET
+                remove = list()
+                for key, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed'):
+                    remove.append((key,))
+                    total -= size
+                    if total <= target:
+                        break
+                conn.executemany('DELETE FROM responses WHERE key = ?', remove)
+        with self._size_lock:
+            self._size = total
+
+    def size(self):
+        ''' Return the number of cached responses and the total compressed bytes '''
+        row = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return row[0], row[1]
+
+    def clear(self):
+        ''' Remove all cached responses '''
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM responses')
+        with self._size_lock:
+            self._size = 0
+
+    def close(self):
+        ''' Close the database connection of the calling thread '''
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,94 @@
+'''
+Retry policy for transient MediaWiki API failures
+'''
+from __future__ import unicode_literals
+
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+# API error responses that indicate an overloaded or lagged server
+RETRYABLE_API_ERRORS = ('HTTP request timed out.', 'Pool queue is full')
+RETRYABLE_API_CODES = ('maxlag', 'ratelimited', 'readonly')
+
+
+class RetryPolicy(object):
+    '''
+    Retry requests that fail for transient reasons with exponential backoff
+    and jitter: connection errors and timeouts, HTTP 5xx and 429 responses,
+    and `maxlag` or "Pool queue is full" API errors.
+
+    Keyword arguments:
+
+    * max_retries - the maximum number of retries of a single request; 0 to disable retries
+    * backoff_factor - the delay in seconds before the first retry; doubled on each subsequent retry
+    * max_backoff - the maximum delay in seconds between two attempts
+    * jitter - if True, each delay is chosen at random between 0 and the backoff ("full jitter")
+    * budget - the maximum total seconds spent waiting between attempts of a single request; None for no limit
+    * status_codes - the HTTP status codes to retry
+    * respect_retry_after - if True, wait for the time given in a `Retry-After` header when present
+    '''
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30, jitter=True, budget=60,
+                 status_codes=(429, 500, 502, 503, 504), respect_retry_after=True):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.status_codes = frozenset(status_codes)
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self):
+        return ('RetryPolicy(max_retries={0}, backoff_factor={1}, max_backoff={2}, jitter={3}, budget={4})'
+                .format(self.max_retries, self.backoff_factor, self.max_backoff, self.jitter, self.budget))
+
+    @staticmethod
+    def is_retryable(response):
+        ''' Return True if the parsed API response is a transient error '''
+        if not isinstance(response, dict) or 'error' not in response:
+            return False
+        error = response['error']
+        return error.get('code') in RETRYABLE_API_CODES or error.get('info') in RETRYABLE_API_ERRORS
+
+    def delay(self, attempt, waited=0.0, retry_after=None):
+        '''
+        Return the number of seconds to wait before retrying, or None if the
+        request should not be retried.
+
+        Arguments:
+
+        * attempt - the number of retries already made (0 for the first retry)
+
+        Keyword arguments:
+
+        * waited - the number of seconds already spent waiting on this request
+        * retry_after - the value of the `Retry-After` header, if any
+        '''
+        if attempt >= self.max_retries:
+            return None
+
+        delay = None
+        if self.respect_retry_after and retry_after is not None:
+            delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+            if self.jitter:
+                delay = random.uniform(0, delay)
+
+        if self.budget is not None and waited + delay > self.budget:
+            return None
+        return delay
+
+
+def parse_retry_after(value):
+    ''' Return the seconds to wait from a `Retry-After` header (seconds or HTTP date); None if invalid '''
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - time.time())
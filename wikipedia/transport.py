@@ -0,0 +1,303 @@
+'''
+Pluggable HTTP transports used to send the MediaWiki API requests
+'''
+from __future__ import unicode_literals
+
+import base64
+import gzip
+import json
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict, deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .response_cache import ResponseCache
+
+# a base class with ABCMeta as its metaclass on both python 2 and 3
+_ABC = ABCMeta(str('_ABC'), (object,), {'__slots__': ()})
+
+
+class Response(object):
+    '''
+    The HTTP response returned by a transport; `requests.Response` provides
+    the same attributes.
+
+    Arguments:
+
+    * status_code - the HTTP status code
+    * headers - dict-like of the response headers
+    * content - the raw (decompressed) body as bytes
+    '''
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        ''' Return the parsed JSON body '''
+        return json.loads(self.content.decode('utf-8'))
+
+
+class Transport(_ABC):
+    '''
+    Interface of the HTTP transports. A transport sends a GET request and
+    returns an object with `status_code`, `headers`, `content`, and `json()`,
+    such as a `requests.Response` or a `Response`.
+
+    Exceptions listed in `errors` are treated as transient connection
+    failures and retried according to the retry policy.
+
+    .. note:: Subclasses must implement `send`; one that does not cannot be instantiated
+    '''
+
+    errors = ()
+
+    @abstractmethod
+    def send(self, url, params, headers=None, timeout=None):
+        ''' Send a GET request for `url` with the query `params` '''
+
+    def reset(self):
+        ''' Drop any pooled connections '''
+        pass
+
+    def close(self):
+        ''' Release the resources held by the transport '''
+        pass
+
+
+class RequestsTransport(Transport):
+    '''
+    The default transport, built on a `requests.Session`.
+
+    Keyword arguments:
+
+    * pool_connections - the number of hosts to keep a connection pool for
+    * pool_maxsize - the maximum number of connections kept open to a single host
+    * pool_block - if True, wait for a free connection instead of opening one beyond pool_maxsize
+    * max_retries - the number of times urllib3 retries failed connections (before any response);
+                    see ``set_retry_policy`` for the retries of failed requests
+    * compression - if True, accept gzip or deflate compressed responses
+    * keep_alive - if False, close the connection after each request
+    '''
+
+    errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, max_retries=0,
+                 compression=True, keep_alive=True):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.compression = compression
+        self.keep_alive = keep_alive
+        self.session = None
+        self.reset()
+
+    def __repr__(self):
+        return ('RequestsTransport(pool_connections={0}, pool_maxsize={1}, max_retries={2}, compression={3})'
+                .format(self.pool_connections, self.pool_maxsize, self.max_retries, self.compression))
+
+    def reset(self):
+        ''' Replace the session, and with it the connection pools '''
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                              max_retries=self.max_retries, pool_block=self.pool_block)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = 'gzip, deflate' if self.compression else 'identity'
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        previous, self.session = self.session, session
+        if previous is not None:
+            previous.close()
+
+    def send(self, url, params, headers=None, timeout=None):
+        return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    '''
+    Transport using a `urllib3.PoolManager` directly, without the overhead of
+    a `requests.Session`. Takes the same keyword arguments as ``RequestsTransport``.
+    '''
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, max_retries=0,
+                 compression=True, keep_alive=True):
+        import urllib3
+
+        self._urllib3 = urllib3
+        self.errors = (urllib3.exceptions.MaxRetryError, urllib3.exceptions.TimeoutError,
+                       urllib3.exceptions.ProtocolError)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.compression = compression
+        self.keep_alive = keep_alive
+        self.pool = None
+        self.reset()
+
+    def reset(self):
+        ''' Replace the pool manager, and with it the connection pools '''
+        headers = {'Accept-Encoding': 'gzip, deflate' if self.compression else 'identity'}
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        pool = self._urllib3.PoolManager(num_pools=self.pool_connections, maxsize=self.pool_maxsize,
+                                         block=self.pool_block, retries=self.max_retries, headers=headers)
+
+        previous, self.pool = self.pool, pool
+        if previous is not None:
+            previous.clear()
+
+    def send(self, url, params, headers=None, timeout=None):
+        request_headers = dict(self.pool.headers)
+        request_headers.update(headers or dict())
+        if timeout is not None:
+            timeout = self._urllib3.Timeout(total=timeout)
+        r = self.pool.request('GET', url, fields=params, headers=request_headers, timeout=timeout)
+        return Response(r.status, r.headers, r.data)
+
+    def close(self):
+        self.pool.clear()
+
+
+class CallbackTransport(Transport):
+    '''
+    In-process transport that answers each request with a function instead
+    of the network; useful for tests and benchmarks.
+
+    Arguments:
+
+    * callback - function of (url, params) returning the parsed response (a dict),
+                 raw bytes, or a `Response`
+    '''
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def send(self, url, params, headers=None, timeout=None):
+        response = self.callback(url, params)
+        if isinstance(response, Response):
+            return response
+        if not isinstance(response, bytes):
+            response = json.dumps(response).encode('utf-8')
+        return Response(200, dict(), response)
+
+
+class RecordingTransport(Transport):
+    '''
+    Transport that sends the requests through another transport and records
+    each request and its response to a gzip compressed file of JSON lines,
+    for later use with ``ReplayTransport``.
+
+    Arguments:
+
+    * path - the file to write the recording to; an existing recording is appended to
+
+    Keyword arguments:
+
+    * transport - the transport actually sending the requests; defaults to a ``RequestsTransport``
+
+    .. note:: Responses served by the response cache never reach the transport and are not recorded
+
+    .. note:: Bodies that are not valid UTF-8 are stored base64 encoded under `content_base64`
+
+    .. note:: Call ``close`` (or replace the transport with ``set_transport``) to finish the file
+    '''
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or RequestsTransport()
+        self.errors = self.transport.errors
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'ab')
+
+    def send(self, url, params, headers=None, timeout=None):
+        start = time.time()
+        r = self.transport.send(url, params, headers=headers, timeout=timeout)
+        record = {
+            'url': url,
+            'params': params,
+            'status': r.status_code,
+            'headers': dict(r.headers),
+            'elapsed': time.time() - start
+        }
+        try:
+            record['content'] = r.content.decode('utf-8')
+        except UnicodeDecodeError:
+            record['content_base64'] = base64.b64encode(r.content).decode('ascii')
+        line = (json.dumps(record, sort_keys=True) + '\n').encode('utf-8')
+        with self._lock:
+            self._file.write(line)
+        return r
+
+    def reset(self):
+        self.transport.reset()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    '''
+    Transport that serves the responses of a ``RecordingTransport`` file
+    without the network. A request recorded several times is answered with
+    its responses in the recorded order, repeating the last one.
+
+    Arguments:
+
+    * path - the recording to replay
+
+    Keyword arguments:
+
+    * latency - seconds to wait before each response; `recorded` to wait as long as the recorded request took;
+                None for no wait
+
+    .. note:: Raises a KeyError for a request that is not in the recording
+    '''
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._responses = defaultdict(deque)
+        with gzip.open(path, 'rb') as recording:
+            for line in recording:
+                record = json.loads(line.decode('utf-8'))
+                key = ResponseCache.make_key(record['url'], record['params'])
+                self._responses[key].append(record)
+
+    def __len__(self):
+        return sum(len(records) for records in self._responses.values())
+
+    def send(self, url, params, headers=None, timeout=None):
+        key = ResponseCache.make_key(url, params)
+        with self._lock:
+            records = self._responses.get(key)
+            if not records:
+                raise KeyError('request not in the recording {0}: {1}'.format(self.path, sorted(params.items())))
+            record = records.popleft() if len(records) > 1 else records[0]
+
+        if self.latency == 'recorded':
+            time.sleep(record['elapsed'])
+        elif self.latency:
+            time.sleep(self.latency)
+        return Response(record['status'], CaseInsensitiveDict(record['headers']), recorded_content(record))
+
+
+def recorded_content(record):
+    ''' the raw body of a response recorded by ``RecordingTransport`` as bytes '''
+    if 'content_base64' in record:
+        return base64.b64decode(record['content_base64'])
+    return record['content'].encode('utf-8')
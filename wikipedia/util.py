@@ -1,7 +1,13 @@
 from __future__ import print_function, unicode_literals
 
 import sys
+import json
+import time
+import zlib
+import inspect
 import functools
+import threading
+from collections import OrderedDict
 
 def debug(fn):
   """ debug decorator """
@@ -13,26 +19,306 @@ def debug(fn):
     return res
   return wrapper
 
+# default of the arguments of `cache.set_limits` that are left unchanged
+_UNCHANGED = object()
+
 
 class cache(object):
-  """ query cache decorator """
-  def __init__(self, fn):
+  """
+  query cache decorator
+
+  Results are kept in a bounded, least recently used store. Keys are built by
+  binding the call arguments to the signature of the decorated function so
+  that `search("x", 1)` and `search("x", results=1)` share the same entry.
+
+  Keyword arguments:
+
+  * maxsize - the maximum number of results to keep; None for no limit
+  * ttl - the number of seconds a result remains valid; None for no expiration
+
+  Can be used either as `@cache` or as `@cache(maxsize=100, ttl=3600)`
+
+  The cache is thread safe; concurrent calls with the same arguments wait
+  for the first call to finish instead of repeating the work.
+
+  Hits, misses, and evictions are counted; see `cache_info`.
+  """
+  def __init__(self, fn=None, maxsize=1024, ttl=None):
+    self.fn = None
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self._cache = OrderedDict()
+    self._lock = threading.RLock()
+    self._pending = dict()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._expirations = 0
+    if fn is not None:
+      self.__wrap(fn)
+
+  def __wrap(self, fn):
+    ''' set the function to be cached '''
     self.fn = fn
-    self._cache = {}
+    try:
+      self._signature = inspect.signature(fn)
+    except AttributeError:  # python 2
+      self._signature = None
     functools.update_wrapper(self, fn)
+    return self
 
   def __call__(self, *args, **kwargs):
-    key = str(args) + str(kwargs)
-    if key in self._cache:
-      ret = self._cache[key]
+    if self.fn is None:  # used as @cache(...)
+      return self.__wrap(args[0])
+
+    key = self._make_key(args, kwargs)
+    while True:
+      with self._lock:
+        now = time.time()
+        if key in self._cache:
+          stored, ret = self._cache.pop(key)
+          if self.ttl is None or now - stored < self.ttl:
+            self._cache[key] = (stored, ret)  # re-insert as the most recently used
+            self._hits += 1
+            return ret
+          self._expirations += 1
+
+        in_flight = self._pending.get(key)
+        if in_flight is None:
+          in_flight = self._pending[key] = threading.Event()
+          self._misses += 1
+          break
+
+      # another thread is already calling fn with these arguments; wait for
+      # it and then check the cache again (it may have raised instead)
+      in_flight.wait()
+
+    try:
+      ret = self.fn(*args, **kwargs)
+      with self._lock:
+        self._cache[key] = (time.time(), ret)
+        self.__trim()
+      return ret
+    finally:
+      with self._lock:
+        del self._pending[key]
+      in_flight.set()
+
+  def _make_key(self, args, kwargs):
+    ''' build a canonical key by binding the arguments to the function signature '''
+    if self._signature is not None:
+      bound = self._signature.bind(*args, **kwargs)
+      if hasattr(bound, 'apply_defaults'):
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+      else:  # python 3.3 and 3.4; keep the parameter order so every call binds alike
+        key = tuple((name, bound.arguments[name] if name in bound.arguments else param.default)
+                    for name, param in self._signature.parameters.items()
+                    if name in bound.arguments or param.default is not param.empty)
     else:
-      ret = self._cache[key] = self.fn(*args, **kwargs)
+      key = tuple(sorted(inspect.getcallargs(self.fn, *args, **kwargs).items()))
+    try:
+      hash(key)
+    except TypeError:
+      key = str(key)
+    return key
 
-    return ret
+  def __trim(self):
+    ''' evict the least recently used results until the cache fits maxsize '''
+    if self.maxsize is None:
+      return
+    while len(self._cache) > self.maxsize:
+      self._cache.popitem(last=False)
+      self._evictions += 1
+
+  def set_limits(self, maxsize=_UNCHANGED, ttl=_UNCHANGED):
+    '''
+    Change the maximum size and time to live of the cache; the limits not
+    passed are left unchanged
+
+    Keyword arguments:
+
+    * maxsize - the maximum number of results to keep; None for no limit
+    * ttl - the number of seconds a result remains valid; None for no expiration
+    '''
+    with self._lock:
+      if maxsize is not _UNCHANGED:
+        self.maxsize = maxsize
+      if ttl is not _UNCHANGED:
+        self.ttl = ttl
+      self.__trim()
 
   def clear_cache(self):
-    ''' clear the cached data '''
-    self._cache = {}
+    ''' clear the cached data; the statistics are kept '''
+    with self._lock:
+      self._cache = OrderedDict()
+
+  def cache_info(self):
+    '''
+    return the statistics of the cache as a dict:
+
+    * hits - the number of calls answered from the cache
+    * misses - the number of calls to the cached function
+    * hit_rate - hits / (hits + misses); None before the first call
+    * evictions - the number of results dropped to fit maxsize
+    * expirations - the number of results dropped after their ttl
+    * size - the number of results in the cache
+    * maxsize - the maximum number of results kept
+    * memory - the approximate number of bytes used by the keys and results
+    '''
+    with self._lock:
+      calls = self._hits + self._misses
+      return {
+        'hits': self._hits,
+        'misses': self._misses,
+        'hit_rate': float(self._hits) / calls if calls else None,
+        'evictions': self._evictions,
+        'expirations': self._expirations,
+        'size': len(self._cache),
+        'maxsize': self.maxsize,
+        'memory': approximate_size(self._cache)
+      }
+
+  def reset_stats(self):
+    ''' set the hit, miss, and eviction counts back to zero '''
+    with self._lock:
+      self._hits = 0
+      self._misses = 0
+      self._evictions = 0
+      self._expirations = 0
+
+
+def approximate_size(obj, seen=None):
+  ''' approximate number of bytes used by an object and the objects it contains '''
+  if seen is None:
+    seen = set()
+  if id(obj) in seen:
+    return 0
+  seen.add(id(obj))
+
+  size = sys.getsizeof(obj)
+  if isinstance(obj, dict):
+    size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in obj.items())
+  elif isinstance(obj, (list, tuple, set, frozenset)):
+    size += sum(approximate_size(item, seen) for item in obj)
+  else:
+    if hasattr(obj, '__dict__'):
+      size += approximate_size(obj.__dict__, seen)
+    slots = getattr(type(obj), '__slots__', ())
+    for slot in ((slots,) if isinstance(slots, (str, type(''))) else slots):
+      size += approximate_size(getattr(obj, slot, None), seen)
+  return size
+
+
+class CompressedText(object):
+  """
+  text stored zlib compressed, decompressed on each access
+
+  Arguments:
+
+  * text - the text to compress
+
+  Keyword arguments:
+
+  * level - the zlib compression level, from 1 (fastest) to 9 (smallest)
+  """
+  __slots__ = ('data', 'length')
+
+  def __init__(self, text, level=6):
+    self.data = zlib.compress(text.encode('utf-8'), level)
+    self.length = len(text)
+
+  def __len__(self):
+    ''' the length of the decompressed text '''
+    return self.length
+
+  def decode(self):
+    ''' return the decompressed text '''
+    return zlib.decompress(self.data).decode('utf-8')
+
+
+# JSON libraries supported by `json_decoder`, fastest first
+JSON_DECODERS = ('orjson', 'ujson', 'json')
+
+
+def json_decoder(name=None):
+  """
+  return a function decoding JSON directly from the bytes of a response
+
+  Keyword arguments:
+
+  * name - one of `JSON_DECODERS`; None for the fastest one installed
+
+  Raises an ImportError if the named library is not installed
+  """
+  if name is None:
+    for candidate in JSON_DECODERS[:-1]:
+      try:
+        return json_decoder(candidate)
+      except ImportError:
+        pass
+    return json_decoder('json')
+
+  if name == 'orjson':
+    import orjson
+    return orjson.loads
+  if name == 'ujson':
+    import ujson
+    return ujson.loads
+  if name == 'json':
+    return _json_loads
+  raise ValueError('unknown JSON decoder {0}; expected one of {1}'.format(name, ', '.join(JSON_DECODERS)))
+
+
+def _json_loads(content):
+  ''' decode JSON bytes with the standard library '''
+  return json.loads(content.decode('utf-8'))
+
+
+# monotonic clock where available (python 3) so that changes to the system time do not affect waits
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+class TokenBucket(object):
+  """
+  thread safe token bucket rate limiter
+
+  Tokens are added at `rate` per second up to `burst`; each request takes one.
+  A request that finds the bucket empty reserves the next token and sleeps
+  until it is due, so concurrent callers are spaced out at exactly `rate`.
+
+  Arguments:
+
+  * rate - the sustained number of requests per second
+  * burst - the number of requests that may be made at once after being idle
+  """
+  def __init__(self, rate, burst=1):
+    if rate <= 0:
+      raise ValueError('rate must be greater than 0')
+    if burst < 1:
+      raise ValueError('burst must be at least 1')
+    self.rate = float(rate)
+    self.burst = burst
+    self._tokens = float(burst)
+    self._last = _monotonic()
+    self._lock = threading.Lock()
+
+  def acquire(self):
+    ''' take a token, sleeping until one is available; returns the seconds waited '''
+    wait = self.reserve()
+    if wait > 0:
+      time.sleep(wait)
+    return wait
+
+  def reserve(self):
+    ''' take a token without sleeping; returns the seconds to wait before it is due (for callers that sleep themselves) '''
+    with self._lock:
+      now = _monotonic()
+      self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+      self._last = now
+      self._tokens -= 1
+      # a negative balance is a reservation of a future token
+      return -self._tokens / self.rate if self._tokens < 0 else 0.0
 
 
 # from http://stackoverflow.com/questions/3627793/best-output-type-and-encoding-practices-for-repr-functions
@@ -1,16 +1,27 @@
 from __future__ import unicode_literals
 
-import requests
+import re
+import threading
 import time
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from datetime import timedelta
 from decimal import Decimal
+from itertools import islice
 
 from .exceptions import (
     PageError, DisambiguationError, RedirectError, HTTPTimeoutError,
     WikipediaException, WikipediaAPIURLError, WikipediaAPILanguageError,
     WikipediaAPIVersionError, WikipediaExtensionError, ODD_ERROR_MESSAGE)
-from .util import cache, stdout_encode, debug, _cmp_major_minor
+from .util import (
+    cache, stdout_encode, debug, _cmp_major_minor, TokenBucket, json_decoder, CompressedText, approximate_size)
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .metrics import RequestMetrics, clock
+from .transport import RequestsTransport
 
 def get_version():
     ''' Return Version Number'''
@@ -24,12 +35,36 @@ WIKIPEDIA_GLOBALS = {
     'LANGUAGE_PREFIX': 'en',
     'RATE_LIMIT': False,
     'RATE_LIMIT_MIN_WAIT': None,
-    'RATE_LIMIT_LAST_CALL': None,
+    'RATE_LIMIT_BURST': 1,
+    'RATE_LIMIT_BUCKETS': dict(),
     'USER_AGENT': 'python-mediawiki/{0} (https://github.com/barrust/Wikipedia/) BOT'.format(get_version()),
-    'SESSION': None,
-    'TIMEOUT': None
+    'TRANSPORT': None,
+    'TIMEOUT': None,
+    'RESPONSE_CACHE': None,
+    'COMPACT_PAGES': None,
+    'RETRY_POLICY': RetryPolicy(),
+    'METRICS': RequestMetrics(),
+    'JSON_DECODER': json_decoder(),
+    'PRE_REQUEST_HOOK': None,
+    'POST_REQUEST_HOOK': None
 }
 
+# the maximum number of titles or pageids the API accepts in a single request
+PAGES_BATCH_SIZE = 50
+
+# the largest `*limit` value a query accepts without bot rights
+MAX_QUERY_LIMIT = 500
+
+_TRANSPORT_LOCK = threading.RLock()
+_RATE_LIMIT_LOCK = threading.Lock()
+
+# section headings of the plain text content, e.g. "== History ==" or "=== Early life ==="
+SECTION_HEADING = re.compile(r'^(={2,6})\s*(.+?)\s*\1\s*$', re.MULTILINE)
+
+# retry policies set with `using_retry_policy` apply only to the calling thread; use `_submit` to
+# pass them on to the threads of a pool
+_RETRY_POLICY_OVERRIDE = threading.local()
+
 def set_api_url(api_url, prefix):
     '''
     Change the mediawiki site from which pages should be retrieved.
@@ -85,9 +120,29 @@ def set_lang(prefix):
 
 def clear_cache():
     ''' Clear the cached results as necessary '''
-    for cached_func in (search, suggest, summary, categorymembers, geosearch, opensearch):
+    for cached_func in _cached_functions():
         cached_func.clear_cache()
 
+def cache_stats():
+    '''
+    Return the statistics of the cache of each cached function as a dict of the
+    function name to its hits, misses, hit rate, evictions, expirations, size,
+    maxsize, and approximate memory in bytes. Use the statistics to size each
+    cache, e.g. ``wikipedia.summary.set_limits(maxsize=5000)``.
+
+    .. note:: Statistics are kept when the caches are cleared; use ``reset_cache_stats`` to reset them
+    '''
+    return OrderedDict((cached_func.__name__, cached_func.cache_info()) for cached_func in _cached_functions())
+
+def reset_cache_stats():
+    ''' Reset the statistics returned by ``cache_stats`` '''
+    for cached_func in _cached_functions():
+        cached_func.reset_stats()
+
+def _cached_functions():
+    ''' the functions whose results are cached '''
+    return (search, suggest, summary, categorymembers, geosearch, opensearch, prefexsearch, languages)
+
 def set_user_agent(user_agent_string):
     '''
     Set the User-Agent string to be used for all requests.
@@ -99,7 +154,6 @@ def set_user_agent(user_agent_string):
     global WIKIPEDIA_GLOBALS
 
     WIKIPEDIA_GLOBALS['USER_AGENT'] = user_agent_string
-    reset_session()
 
 def get_user_agent():
     ''' See User Agent string '''
@@ -115,15 +169,53 @@ def set_timeout(timeout):
     WIKIPEDIA_GLOBALS['TIMEOUT'] = timeout
 
 def reset_session():
-    ''' Reset HTTP session '''
+    ''' Reset HTTP session; drops the pooled connections of the transport in use '''
     global WIKIPEDIA_GLOBALS
-    headers = {
-        'User-Agent': WIKIPEDIA_GLOBALS['USER_AGENT']
-    }
-    WIKIPEDIA_GLOBALS['SESSION'] = requests.Session()
-    WIKIPEDIA_GLOBALS['SESSION'].headers.update(headers)
+    with _TRANSPORT_LOCK:
+        if WIKIPEDIA_GLOBALS['TRANSPORT'] is None:
+            WIKIPEDIA_GLOBALS['TRANSPORT'] = RequestsTransport()
+        else:
+            WIKIPEDIA_GLOBALS['TRANSPORT'].reset()
 
-def set_rate_limiting(rate_limit, min_wait=timedelta(milliseconds=50)):
+def set_transport(transport=None, **kwargs):
+    '''
+    Set the HTTP transport used to send all requests to the Mediawiki servers.
+
+    Arguments:
+
+    * transport - a ``wikipedia.transport.Transport``, such as a ``Urllib3Transport`` or a
+                  ``CallbackTransport``; if not provided, a ``RequestsTransport`` is built from the keyword arguments
+
+    Keyword arguments:
+
+    * pool_connections - the number of hosts to keep a connection pool for. Defaults to 10
+    * pool_maxsize - the maximum number of connections kept open to a single host. Defaults to 10
+    * pool_block - wait for a free connection instead of opening one beyond pool_maxsize. Defaults to False
+    * max_retries - the number of times a failed connection is retried. Defaults to 0
+    * compression - accept gzip or deflate compressed responses. Defaults to True
+    * keep_alive - keep connections open between requests. Defaults to True
+
+    .. note:: The transport previously in use is closed
+    '''
+    global WIKIPEDIA_GLOBALS
+    with _TRANSPORT_LOCK:
+        previous = WIKIPEDIA_GLOBALS['TRANSPORT']
+        WIKIPEDIA_GLOBALS['TRANSPORT'] = transport or RequestsTransport(**kwargs)
+    if previous is not None and previous is not WIKIPEDIA_GLOBALS['TRANSPORT']:
+        previous.close()
+
+def get_transport():
+    ''' Return the HTTP transport in use, creating the default transport if needed '''
+    global WIKIPEDIA_GLOBALS
+    transport = WIKIPEDIA_GLOBALS['TRANSPORT']
+    if transport is None:
+        with _TRANSPORT_LOCK:
+            if WIKIPEDIA_GLOBALS['TRANSPORT'] is None:
+                WIKIPEDIA_GLOBALS['TRANSPORT'] = RequestsTransport()
+            transport = WIKIPEDIA_GLOBALS['TRANSPORT']
+    return transport
+
+def set_rate_limiting(rate_limit, min_wait=timedelta(milliseconds=50), burst=1):
     '''
     Enable or disable rate limiting on requests to the Mediawiki servers.
     If rate limiting is not enabled, under some circumstances (depending on
@@ -133,6 +225,10 @@ def set_rate_limiting(rate_limit, min_wait=timedelta(milliseconds=50)):
     Enabling rate limiting generally prevents that issue, but please note that
     HTTPTimeoutError still might be raised.
 
+    Requests are limited using a token bucket per API URL: at most one request
+    every `min_wait` is sustained, while up to `burst` requests may be made at
+    once after being idle. Rate limiting is shared by all threads.
+
     Arguments:
 
     * rate_limit - (Boolean) whether to enable rate limiting or not
@@ -141,16 +237,207 @@ def set_rate_limiting(rate_limit, min_wait=timedelta(milliseconds=50)):
 
     * min_wait - if rate limiting is enabled, `min_wait` is a timedelta describing the minimum time to wait before requests.
                  Defaults to timedelta(milliseconds=50)
+    * burst - if rate limiting is enabled, the number of requests allowed at once before requests are spaced by `min_wait`.
+              Defaults to 1
+    '''
+    global WIKIPEDIA_GLOBALS
+
+    if rate_limit and min_wait.total_seconds() <= 0:
+        raise ValueError('min_wait must be greater than zero')
+    if rate_limit and burst < 1:
+        raise ValueError('burst must be at least 1')
+
+    with _RATE_LIMIT_LOCK:
+        WIKIPEDIA_GLOBALS['RATE_LIMIT'] = rate_limit
+        if not rate_limit:
+            WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT'] = None
+        else:
+            WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT'] = min_wait
+        WIKIPEDIA_GLOBALS['RATE_LIMIT_BURST'] = burst
+        WIKIPEDIA_GLOBALS['RATE_LIMIT_BUCKETS'] = dict()
+
+def _get_rate_limiter(api_url):
+    ''' Return the token bucket of the API URL, creating it on first use; None if rate limiting is disabled '''
+    global WIKIPEDIA_GLOBALS
+    with _RATE_LIMIT_LOCK:
+        buckets = WIKIPEDIA_GLOBALS['RATE_LIMIT_BUCKETS']
+        if not WIKIPEDIA_GLOBALS['RATE_LIMIT']:
+            return None
+        if api_url not in buckets:
+            rate = 1.0 / WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT'].total_seconds()
+            buckets[api_url] = TokenBucket(rate, WIKIPEDIA_GLOBALS['RATE_LIMIT_BURST'])
+        return buckets[api_url]
+
+def set_retry_policy(retry_policy=None, **kwargs):
+    '''
+    Set how requests that fail for transient reasons (connection errors, HTTP 5xx,
+    `maxlag` and "Pool queue is full" responses) are retried.
+
+    Arguments:
+
+    * retry_policy - a RetryPolicy; if not provided, one is built from the keyword arguments
+
+    Keyword arguments:
+
+    * max_retries - the maximum number of retries of a single request; 0 to disable retries. Defaults to 3
+    * backoff_factor - the delay in seconds before the first retry; doubled on each subsequent retry. Defaults to 0.5
+    * max_backoff - the maximum delay in seconds between two attempts. Defaults to 30
+    * jitter - if True, randomize each delay between 0 and the backoff. Defaults to True
+    * budget - the maximum total seconds spent waiting on a single request. Defaults to 60
+    * respect_retry_after - wait for the time given in a `Retry-After` header. Defaults to True
+
+    .. note:: Use ``using_retry_policy`` to change the policy for a single call
+    '''
+    global WIKIPEDIA_GLOBALS
+    WIKIPEDIA_GLOBALS['RETRY_POLICY'] = retry_policy or RetryPolicy(**kwargs)
+
+def get_retry_policy():
+    ''' Return the retry policy in use by the calling thread '''
+    global WIKIPEDIA_GLOBALS
+    return getattr(_RETRY_POLICY_OVERRIDE, 'policy', None) or WIKIPEDIA_GLOBALS['RETRY_POLICY']
+
+@contextmanager
+def using_retry_policy(retry_policy=None, **kwargs):
+    '''
+    Context manager to use a different retry policy for the calls made within it
+    by the current thread, including the requests those calls make from their
+    thread pools; accepts the same arguments as ``set_retry_policy``::
+
+        with wikipedia.using_retry_policy(max_retries=10, budget=300):
+            tree = wikipedia.categorytree('Physics', depth=3)
+    '''
+    previous = getattr(_RETRY_POLICY_OVERRIDE, 'policy', None)
+    _RETRY_POLICY_OVERRIDE.policy = retry_policy or RetryPolicy(**kwargs)
+    try:
+        yield _RETRY_POLICY_OVERRIDE.policy
+    finally:
+        _RETRY_POLICY_OVERRIDE.policy = previous
+
+def _submit(executor, fn, *args):
+    ''' submit `fn(*args)` to the executor, run with the retry policy of the calling thread '''
+    return executor.submit(_call_with_retry_policy, get_retry_policy(), fn, *args)
+
+def _call_with_retry_policy(retry_policy, fn, *args):
+    ''' call `fn(*args)` with `retry_policy` in use by the current (worker) thread '''
+    with using_retry_policy(retry_policy):
+        return fn(*args)
+
+def set_response_cache(path, ttl=86400, ttls=None, max_size=None):
+    '''
+    Enable or disable the persistent, on-disk cache of raw API responses.
+    Cached responses are served without contacting the Mediawiki servers,
+    even after the process restarts.
+
+    Arguments:
+
+    * path - the path to the SQLite database file; None to disable the cache
+
+    Keyword arguments:
+
+    * ttl - the default number of seconds a response remains valid; None for no expiration
+    * ttls - dict of `action`, `prop`, `list`, or `meta` values to the number of seconds a matching response remains valid
+             (e.g. {'siteinfo': 604800, 'search': 600})
+    * max_size - the maximum number of compressed bytes to keep on disk; None for no limit
+
+    .. note:: The cache file may safely be shared by several processes on the same host
     '''
     global WIKIPEDIA_GLOBALS
 
-    WIKIPEDIA_GLOBALS['RATE_LIMIT'] = rate_limit
-    if not rate_limit:
-        WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT'] = None
+    if WIKIPEDIA_GLOBALS['RESPONSE_CACHE'] is not None:
+        WIKIPEDIA_GLOBALS['RESPONSE_CACHE'].close()
+
+    if path is None:
+        WIKIPEDIA_GLOBALS['RESPONSE_CACHE'] = None
     else:
-        WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT'] = min_wait
+        WIKIPEDIA_GLOBALS['RESPONSE_CACHE'] = ResponseCache(path, ttl=ttl, ttls=ttls, max_size=max_size)
+
+def get_response_cache():
+    ''' Return the persistent response cache or None if it is not enabled '''
+    global WIKIPEDIA_GLOBALS
+    return WIKIPEDIA_GLOBALS['RESPONSE_CACHE']
+
+def set_json_decoder(decoder=None):
+    '''
+    Set the function used to decode the JSON API responses. By default the
+    fastest installed library is used: `orjson`, then `ujson`, then the
+    standard library `json`.
+
+    Arguments:
+
+    * decoder - a function of the response body (bytes) returning the parsed JSON, or
+                the name of a library ('orjson', 'ujson', or 'json'); None for the fastest installed
+
+    .. note:: Raises an ImportError if the named library is not installed
+    '''
+    global WIKIPEDIA_GLOBALS
+    if decoder is None or not callable(decoder):
+        decoder = json_decoder(decoder)
+    WIKIPEDIA_GLOBALS['JSON_DECODER'] = decoder
+
+def set_compact_pages(compact, level=6):
+    '''
+    Enable or disable compact storage of the HTML and plain text content of
+    pages. When enabled, ``WikipediaPage.html()`` and ``WikipediaPage.content``
+    are kept zlib compressed and decompressed on each access; the decompressed
+    text is not kept by the page. This fits several times more loaded pages
+    in memory at the cost of the decompression on each access.
+
+    Arguments:
+
+    * compact - (Boolean) whether to compress the text of the pages loaded from now on
+
+    Keyword arguments:
+
+    * level - the zlib compression level, from 1 (fastest) to 9 (smallest). Defaults to 6
+
+    .. note:: Use ``WikipediaPage.compact`` to compress the text of pages already loaded
+    '''
+    global WIKIPEDIA_GLOBALS
+    WIKIPEDIA_GLOBALS['COMPACT_PAGES'] = level if compact else None
+
+def get_stats():
+    '''
+    Return the metrics of the requests sent since the module was loaded or
+    since ``reset_stats`` was called, as a dict:
+
+    * requests - the number of HTTP requests, including retries
+    * errors - the number of requests that failed to connect or returned an HTTP error
+    * by_action, by_prop, by_list - the number of requests per `action`, `prop`, and `list` value
+    * latency - the total, mean, and max seconds per request, and a histogram of the number of
+                requests per latency bucket
+    * bytes - the number of bytes received
+    * retries - the number of retried requests
+    * rate_limit_wait - the seconds spent waiting on the rate limiter
+    * response_cache_hits - the number of responses served by the persistent response cache
+    * json_decode_time - the seconds spent decoding JSON responses
+    * html_parse_time - the seconds spent parsing HTML
+
+    .. note:: The metrics are shared by all threads
+    '''
+    global WIKIPEDIA_GLOBALS
+    return WIKIPEDIA_GLOBALS['METRICS'].snapshot()
+
+def reset_stats():
+    ''' Reset the request metrics returned by ``get_stats`` '''
+    global WIKIPEDIA_GLOBALS
+    WIKIPEDIA_GLOBALS['METRICS'].reset()
+
+def set_request_hooks(pre=None, post=None):
+    '''
+    Set the functions called around each HTTP request sent to the API, e.g. to
+    attribute requests to the calling code in an APM. Hooks are called in the
+    thread sending the request, once per attempt. Call with no arguments to
+    remove the hooks.
+
+    Keyword arguments:
 
-    WIKIPEDIA_GLOBALS['RATE_LIMIT_LAST_CALL'] = None
+    * pre - function of (url, params) called before the request is sent
+    * post - function of (url, params, response, elapsed) called after the request completes;
+             `response` is the HTTP response, or None if the connection failed, and `elapsed` is in seconds
+    '''
+    global WIKIPEDIA_GLOBALS
+    WIKIPEDIA_GLOBALS['PRE_REQUEST_HOOK'] = pre
+    WIKIPEDIA_GLOBALS['POST_REQUEST_HOOK'] = post
 
 
 @cache
@@ -203,6 +490,73 @@ def search(query, results=10, suggestion=False):
 
     return list(search_results)
 
+
+def iter_search(query, max_results=None, offset=0, records=False):
+    '''
+    Do a Wikipedia search for `query`, following the continuation to yield
+    the results as each batch arrives, at the full server page size.
+
+    Keyword arguments:
+
+    * max_results - the maximum number of results returned; None for all of them
+    * offset - the number of results to skip; to resume a search pass the `offset` of its last record + 1
+    * records - if True, yield the search hits (title, pageid, size, wordcount, timestamp, snippet, and offset) instead of titles
+
+    .. note:: MediaWiki version >= 1.16
+
+    .. note:: Wikipedia does not return results beyond an offset of 10,000
+    '''
+    global WIKIPEDIA_GLOBALS
+    # checked when called, not when the first result is requested
+    if WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] is None:
+        _get_site_info()
+
+    if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 16]):
+        raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.16", 'search')
+
+    if query is None or query.strip() == '':
+        raise ValueError("Query must be specified")
+    search_params = {
+        'list': 'search',
+        'srprop': 'size|wordcount|timestamp|snippet' if records else '',
+        'srsearch': query
+    }
+    return _iter_search_results(query, search_params, max_results, offset, records)
+
+def _iter_search_results(query, search_params, max_results, offset, records):
+    ''' yield the results of the search of `iter_search`, requesting each batch as it is needed '''
+    remaining = max_results
+    while remaining is None or remaining > 0:
+        params = search_params.copy()
+        params['srlimit'] = 'max' if remaining is None or remaining >= MAX_QUERY_LIMIT else remaining
+        if offset:
+            params['sroffset'] = offset
+
+        raw_results = _wiki_request(params)
+
+        if 'error' in raw_results:
+            if raw_results['error']['info'] in ('HTTP request timed out.', 'Pool queue is full'):
+                raise HTTPTimeoutError(query)
+            else:
+                raise WikipediaException(raw_results['error']['info'])
+
+        hits = raw_results['query']['search']
+        for hit in hits[:remaining]:
+            if records:
+                yield dict(hit, offset=offset)
+            else:
+                yield hit['title']
+            offset += 1
+
+        if remaining is not None:
+            remaining -= len(hits)
+
+        # older MediaWiki versions return `query-continue` instead of `continue`
+        last_continue = raw_results.get('continue') or raw_results.get('query-continue', dict()).get('search')
+        if not last_continue or not hits:
+            break
+        offset = last_continue['sroffset']
+
 @cache
 def categorymembers(category, results=10, subcategories=True):
     '''
@@ -239,7 +593,7 @@ def categorymembers(category, results=10, subcategories=True):
 
     if 'error' in raw_results:
         if raw_results['error']['info'] in ('HTTP request timed out.', 'Pool queue is full'):
-            raise HTTPTimeoutError(query)
+            raise HTTPTimeoutError(category)
         else:
             raise WikipediaException(raw_results['error']['info'])
 
@@ -258,70 +612,182 @@ def categorymembers(category, results=10, subcategories=True):
     else:
         return pages
 
-def categorytree(category, depth=5):
+def categorytree(category, depth=5, workers=8):
     '''
     Build a category tree for either a single category or a list of categories
 
     Keyword arguments:
 
     * depth - the maxmimum number of levels returned. < 0 for all levels
+    * workers - the number of categories to request concurrently
 
     .. note:: Set depth to 0 to get the full tree
 
     .. note:: Recommended to set rate limit to True
 
+    .. note:: The tree is loaded breadth first, one level at a time. Categories found in more
+              than one branch are only requested once, and a sub-category that is also one of
+              its own ancestors is set to None instead of being expanded again.
+
     .. warning:: Very long running! Requires many calls to categorymembers; recommend setting rate limit before running.
     '''
 
-    def __cat_tree_rec(cat, depth, tree, level, categories, links):
-        ''' recursive function to build out the tree '''
-        tree[cat] = dict()
-        tree[cat]['depth'] = level
-        tree[cat]['sub-categories'] = dict()
-        tree[cat]['links'] = list()
-        tree[cat]['parent-categories'] = list()
+    # make it simple to use both a list or a single category term
+    if type(category) is not list:
+        cats = [category]
+    else:
+        cats = category
 
-        if cat not in categories:
-            while True:
-                try:
-                    categories[cat] = page('Category:{0}'.format(cat))
-                    categories[cat].categories
-                    links[cat] = categorymembers(cat, 500, True)
-                    break
-                except PageError as e:
-                    raise PageError(cat)
-                except Exception as e:
-                    time.sleep(1)
+    nodes = dict()
+    for cat, level, parents, links, subcats in iter_categorytree(cats, depth, workers):
+        nodes[cat] = (parents, links, subcats)
 
-        for p in categories[cat].categories:
-             tree[cat]['parent-categories'].append(p)
+    results = dict()
+    for cat in cats:
+        # (category, level, dict to add the category to, ancestors of the category)
+        stack = [(cat, 0, results, frozenset())]
+        while stack:
+            cat, level, tree, ancestors = stack.pop()
+            parents, links, subcats = nodes[cat]
+            tree[cat] = dict()
+            tree[cat]['depth'] = level
+            tree[cat]['sub-categories'] = dict()
+            tree[cat]['links'] = list(links)
+            tree[cat]['parent-categories'] = list(parents)
+
+            ancestors = ancestors | frozenset([cat])
+            for c in subcats:
+                if level >= depth > 0 or c in ancestors:
+                    tree[cat]['sub-categories'][c] = None
+                else:
+                    stack.append((c, level + 1, tree[cat]['sub-categories'], ancestors))
+    return results
 
-        for link in links[cat][0]:
-            tree[cat]['links'].append(link)
+def iter_categorytree(category, depth=5, workers=8):
+    '''
+    Walk the category tree for either a single category or a list of categories,
+    yielding each category as soon as it is loaded instead of building the whole
+    tree in memory. The walk is breadth first; stop iterating to stop requesting.
 
-        if level >= depth > 0:
-            for c in links[cat][1]:
-                tree[cat]['sub-categories'][c] = None
-        else:
-            for c in links[cat][1]:
-                __cat_tree_rec(c, depth, tree[cat]['sub-categories'], level + 1, categories, links)
-        return
-    # end __cat_tree_rec
+    Keyword arguments:
 
-    # make it simple to use both a list or a single category term
+    * depth - the maxmimum number of levels returned. < 0 for all levels
+    * workers - the number of categories to request concurrently
+
+    Returns:
+
+    * Generator of (category, depth, parent categories, pages, sub-categories) tuples
+
+    .. note:: Set depth to 0 to walk the full tree
+
+    .. note:: Each category is yielded once, at the first depth it is found. Sub-categories
+              of a category at the maximum depth are listed but not yielded.
+    '''
     if type(category) is not list:
         cats = [category]
     else:
         cats = category
 
+    frontier = list(OrderedDict.fromkeys(cats))
+    # only the names of categories already found are kept, to avoid requesting them again
+    seen = set(frontier)
+    level = 0
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = list()
+    pending = list()
+    try:
+        while frontier:
+            next_frontier = list()
+            chunks = [frontier[i:i + PAGES_BATCH_SIZE] for i in range(0, len(frontier), PAGES_BATCH_SIZE)]
+            # keep the next chunk in flight while the current one is consumed
+            pending = [_submit_category_chunk(executor, chunks[0])]
+            for n in range(len(chunks)):
+                if n + 1 < len(chunks):
+                    pending.append(_submit_category_chunk(executor, chunks[n + 1]))
+                parent_future, member_futures = pending.pop(0)
+                futures = [parent_future] + list(member_futures)
+                parents = parent_future.result()
+
+                for future in as_completed(member_futures):
+                    cat = member_futures[future]
+                    if isinstance(parents[cat], Exception):
+                        raise parents[cat]
+                    links, subcats = future.result()
+                    yield cat, level, parents[cat], links, subcats
+
+                    if not level >= depth > 0:
+                        for c in subcats:
+                            if c not in seen:
+                                seen.add(c)
+                                next_frontier.append(c)
+
+            frontier = next_frontier
+            level += 1
+    finally:
+        # the consumer may stop early or a category may be missing; skip outstanding requests
+        for parent_future, member_futures in pending:
+            futures.append(parent_future)
+            futures.extend(member_futures)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def _submit_category_chunk(executor, chunk):
+    ''' request the parents and members of a chunk of categories; returns the futures '''
+    parent_future = _submit(executor, _category_parents, chunk)
+    member_futures = dict((_submit(executor, categorymembers, cat, 500, True), cat) for cat in chunk)
+    return parent_future, member_futures
+
+def _category_parents(categories):
+    '''
+    Load the non-hidden parent categories of a batch of categories in one request (plus continuations).
+    Returns a dict of category to the list of parent categories or a PageError if it does not exist.
+    '''
+    titles = ['Category:{0}'.format(cat) for cat in categories]
+    query_params = {
+        'prop': 'categories',
+        'cllimit': 'max',
+        'clshow': '!hidden',
+        'titles': '|'.join(titles)
+    }
+
+    normalized = dict()
+    parents = dict()
+    last_continue = dict()
+    while True:
+        params = query_params.copy()
+        params.update(last_continue)
+        request = _wiki_request(params)
+
+        if 'error' in request:
+            if request['error']['info'] in ('HTTP request timed out.', 'Pool queue is full'):
+                raise HTTPTimeoutError(query_params['titles'])
+            else:
+                raise WikipediaException(request['error']['info'])
+
+        query = request['query']
+        for item in query.get('normalized', list()):
+            normalized[item['from']] = item['to']
+        for datum in query['pages'].values():
+            if 'missing' in datum or 'invalid' in datum:
+                continue
+            found = parents.setdefault(datum['title'], list())
+            for link in datum.get('categories', list()):
+                if link['title'].startswith('Category:'):
+                    found.append(link['title'][9:])
+                else:
+                    found.append(link['title'])
+
+        if 'continue' not in request:
+            break
+        last_continue = request['continue']
+
     results = dict()
-    categories = dict()
-    links = dict()
-    for cat in cats:
-        __cat_tree_rec(cat, depth, results, 0, categories, links)
+    for cat, title in zip(categories, titles):
+        title = normalized.get(title, title)
+        results[cat] = parents[title] if title in parents else PageError(cat)
     return results
 
-
 @cache
 def geosearch(latitude, longitude, title=None, results=10, radius=1000):
     '''
@@ -603,6 +1069,269 @@ def page(title=None, pageid=None, auto_suggest=True, redirect=True, preload=Fals
         raise ValueError("Either a title or a pageid must be specified")
 
 
+def pages(titles=None, pageids=None, redirect=True):
+    '''
+    Get WikipediaPage objects for many pages at once by the titles `titles` or
+    the pageids `pageids` (mutually exclusive). Pages are requested in batches
+    of 50, so only one request is made per batch instead of one per page.
+
+    Keyword arguments:
+
+    * titles - list of the titles of the pages to load
+    * pageids - list of the numeric pageids of the pages to load
+    * redirect - allow redirection without returning a RedirectError
+
+    Returns:
+
+    * List in the same order as `titles` or `pageids` containing either the
+      WikipediaPage or the exception (PageError, RedirectError or DisambiguationError)
+      for that title or pageid
+
+    .. note:: Titles are used as is; there is no auto_suggest
+    '''
+    global WIKIPEDIA_GLOBALS
+    if WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] is None:
+        _get_site_info()
+
+    if titles is not None:
+        values, load = list(titles), _load_titles
+    elif pageids is not None:
+        values, load = list(pageids), _load_pageids
+    else:
+        raise ValueError("Either titles or pageids must be specified")
+
+    unique = list(OrderedDict.fromkeys(values))
+    results = dict()
+    for i in range(0, len(unique), PAGES_BATCH_SIZE):
+        results.update(load(unique[i:i + PAGES_BATCH_SIZE], redirect))
+
+    return [results[value] for value in values]
+
+def page_handles(titles=None, pageids=None, redirect=True):
+    '''
+    Get compact ``WikipediaPageHandle`` objects for many pages at once; takes
+    the same arguments as ``pages``, and makes the same batched requests.
+
+    Returns:
+
+    * List in the same order as `titles` or `pageids` containing either the
+      WikipediaPageHandle or the exception (PageError, RedirectError or DisambiguationError)
+      for that title or pageid
+    '''
+    return [result.handle() if isinstance(result, WikipediaPage) else result
+            for result in pages(titles=titles, pageids=pageids, redirect=redirect)]
+
+def _load_titles(titles, redirect):
+    ''' load one batch of titles; returns a dict of title to WikipediaPage or exception '''
+    request = _wiki_request({
+        'prop': 'info|pageprops',
+        'inprop': 'url',
+        'ppprop': 'disambiguation',
+        'redirects': '',
+        'titles': '|'.join(titles)
+    })
+
+    query = request['query']
+    normalized = dict((item['from'], item['to']) for item in query.get('normalized', list()))
+    redirects = dict((item['from'], item['to']) for item in query.get('redirects', list()))
+    by_title = dict((page['title'], (pageid, page)) for pageid, page in query['pages'].items())
+
+    results = dict()
+    for title in titles:
+        resolved = normalized.get(title, title)
+        if resolved in redirects:
+            if not redirect:
+                results[title] = RedirectError(title)
+                continue
+            resolved = redirects[resolved]
+
+        if resolved not in by_title:
+            results[title] = PageError(title)
+            continue
+        pageid, page = by_title[resolved]
+        results[title] = _page_or_error(title, pageid, page)
+
+    return results
+
+def _load_pageids(pageids, redirect):
+    ''' load one batch of pageids; returns a dict of pageid to WikipediaPage or exception '''
+    # redirects are not resolved by the API here; doing so drops the requested pageid from the results
+    request = _wiki_request({
+        'prop': 'info|pageprops',
+        'inprop': 'url',
+        'ppprop': 'disambiguation',
+        'pageids': '|'.join('{0}'.format(pageid) for pageid in pageids)
+    })
+
+    query_pages = request['query']['pages']
+    results = dict()
+    redirected = dict()
+    for pageid in pageids:
+        page = query_pages.get('{0}'.format(pageid))
+        if page is None or 'missing' in page:
+            results[pageid] = PageError(pageid=pageid)
+        elif 'redirect' in page:
+            if redirect:
+                redirected[pageid] = page['title']
+            else:
+                results[pageid] = RedirectError(page['title'])
+        else:
+            results[pageid] = _page_or_error(page['title'], '{0}'.format(pageid), page)
+
+    if redirected:
+        targets = _load_titles(list(OrderedDict.fromkeys(redirected.values())), redirect)
+        for pageid, title in redirected.items():
+            results[pageid] = targets[title]
+
+    return results
+
+def fetch_many(titles, props=('content',), workers=8, redirect=True):
+    '''
+    Load many pages, and the requested properties of each, using a pool of
+    `workers` threads. Pages are first resolved in batches (see ``pages``),
+    then the properties of each page are loaded concurrently.
+
+    Arguments:
+
+    * titles - the titles of the pages to load
+
+    Keyword arguments:
+
+    * props - names of the WikipediaPage properties to load for each page, e.g. ('content', 'links', 'categories')
+    * workers - the number of threads to use
+    * redirect - allow redirection without returning a RedirectError
+
+    Returns:
+
+    * Generator of (title, WikipediaPage or exception) tuples yielded as each page completes, not in input order
+
+    .. note:: Any property that the MediaWiki site does not support will be set to None and no exception will be returned
+
+    .. note:: Titles resolving to the same page share one WikipediaPage, loaded once; a title given more than once
+              is yielded once for each time it is given
+    '''
+    global WIKIPEDIA_GLOBALS
+    if WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] is None:
+        _get_site_info()
+
+    titles = list(titles)
+    counts = Counter(titles)
+    unique = list(OrderedDict.fromkeys(titles))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    batches = dict()
+    for i in range(0, len(unique), PAGES_BATCH_SIZE):
+        chunk = unique[i:i + PAGES_BATCH_SIZE]
+        batches[_submit(executor, pages, chunk, None, redirect)] = chunk
+
+    loading = dict()
+    pending = set(batches)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in loading:
+                    result = future.result()
+                    for title in loading.pop(future):
+                        for _ in range(counts[title]):
+                            yield title, result
+                    continue
+
+                chunk = batches.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [e] * len(chunk)
+                # titles resolved to the same page (e.g. redirects) share one WikipediaPage; load it once
+                shared = OrderedDict()
+                for title, result in zip(chunk, results):
+                    if isinstance(result, Exception):
+                        for _ in range(counts[title]):
+                            yield title, result
+                    else:
+                        shared.setdefault(id(result), (result, list()))[1].append(title)
+                for page, page_titles in shared.values():
+                    loaded = _submit(executor, _load_props, page, props)
+                    loading[loaded] = page_titles
+                    pending.add(loaded)
+    finally:
+        # the consumer may stop early; do not run work no one will read
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def _load_props(page, props):
+    ''' load the properties `props` of `page`; returns the page or the exception raised '''
+    try:
+        for prop in props:
+            try:
+                value = getattr(page, prop)
+                if callable(value):  # html()
+                    value()
+            except (WikipediaAPIVersionError, WikipediaExtensionError):
+                pass
+    except Exception as e:
+        return e
+    return page
+
+def _page_or_error(title, pageid, page):
+    ''' build the WikipediaPage or exception for a page returned by an info|pageprops query '''
+    if 'missing' in page or 'invalid' in page:
+        return PageError(title)
+    elif 'pageprops' in page:
+        return _disambiguation_error(title, pageid, {'titles': page['title']})
+
+    loaded = WikipediaPage.__new__(WikipediaPage)
+    loaded.original_title = title
+    loaded.pageid = pageid
+    loaded.title = page['title']
+    loaded.url = page['fullurl']
+    loaded._last_revision_id = page.get('lastrevid')
+    return loaded
+
+def _disambiguation_error(title, pageid, title_query_param):
+    '''
+    Build the DisambiguationError for a disambiguation page; the rendered page
+    is only requested, and its options parsed, when they are first accessed
+    '''
+    query_params = {
+        'prop': 'revisions',
+        'rvprop': 'content',
+        'rvparse': '',
+        'rvlimit': 1
+    }
+    query_params.update(title_query_param)
+    loader = partial(_load_disambiguation, WIKIPEDIA_GLOBALS['API_URL'], pageid, query_params)
+    return DisambiguationError(title, loader=loader)
+
+def _load_disambiguation(api_url, pageid, query_params):
+    '''
+    Request the rendered HTML of a disambiguation page from the wiki it was
+    found on (the language may have changed since) and parse its options and details
+    '''
+    if api_url == WIKIPEDIA_GLOBALS['API_URL']:
+        request = _wiki_request(dict(query_params))
+    else:
+        request = _wiki_request(dict(query_params), api_url=api_url)
+    html = request['query']['pages'][pageid]['revisions'][0]['*']
+    return _parse_disambiguation(html)
+
+def _parse_disambiguation(html):
+    '''
+    Parse the options and details from the rendered HTML of a disambiguation page;
+    only the list items are parsed
+    '''
+    start = clock()
+    lis = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('li')).find_all('li')
+    filtered_lis = [li for li in lis if not 'tocsection' in ''.join(li.get('class', list()))]
+    may_refer_to = [li.a.get_text() for li in filtered_lis if li.a]
+    disambiguation = list()
+    for lis_item in filtered_lis:
+        item = lis_item.a
+        if item and item.get('title'):
+            disambiguation.append({'title': item['title'], 'description': lis_item.text})
+    WIKIPEDIA_GLOBALS['METRICS'].record_html_parse(clock() - start)
+    return may_refer_to, disambiguation
+
 
 class WikipediaPage(object):
     '''
@@ -626,13 +1355,7 @@ class WikipediaPage(object):
         self.__load(redirect=redirect, preload=preload)
 
         if preload:
-            for prop in ('content', 'summary', 'images', 'references', 'links', 'sections', 'redirects', 'coordinates', 'backlinks', 'categories'):
-                try:
-                    getattr(self, prop)
-                except WikipediaAPIVersionError:
-                    pass
-                except WikipediaExtensionError:
-                    pass
+            self.__preload()
 
     def __repr__(self):
         return stdout_encode(u'<WikipediaPage \'{0}\'>'.format(self.title))
@@ -647,6 +1370,20 @@ class WikipediaPage(object):
         except AttributeError as ex:
             return False
 
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((getattr(self, 'pageid', None), getattr(self, 'title', None)))
+
+    def handle(self):
+        '''
+        Get a compact ``WikipediaPageHandle`` of the page: its title, pageid,
+        url, and current revision id, without any of the loaded content.
+        '''
+        revision_id = getattr(self, '_revision_id', None) or getattr(self, '_last_revision_id', None)
+        return WikipediaPageHandle(self.title, self.pageid, self.url, revision_id)
+
     def __load(self, redirect=True, preload=False):
         '''
         Load basic information from Wikipedia.
@@ -695,8 +1432,9 @@ class WikipediaPage(object):
 
                 assert redirects['from'] == from_title, ODD_ERROR_MESSAGE
 
-                # change the title and reload the whole object
-                self.__init__(redirects['to'], redirect=redirect, preload=preload)
+                # change the title and reload the whole object; the preload
+                # happens once, in the outer __init__, for the target page
+                self.__init__(redirects['to'], redirect=redirect, preload=False)
 
             else:
                 raise RedirectError(getattr(self, 'title', page['title']))
@@ -705,33 +1443,13 @@ class WikipediaPage(object):
         # if a pageprop is returned,
         # then the page must be a disambiguation page
         elif 'pageprops' in page:
-            query_params = {
-                'prop': 'revisions',
-                'rvprop': 'content',
-                'rvparse': '',
-                'rvlimit': 1
-            }
-            query_params.update(self.__title_query_param)
-            request = _wiki_request(query_params)
-            html = request['query']['pages'][pageid]['revisions'][0]['*']
-
-            lis = BeautifulSoup(html, 'html.parser').find_all('li')
-            filtered_lis = [li for li in lis if not 'tocsection' in ''.join(li.get('class', list()))]
-            may_refer_to = [li.a.get_text() for li in filtered_lis if li.a]
-            disambiguation = list()
-            for lis_item in filtered_lis:
-                one_disambiguation = dict()
-                item = lis_item.find_all("a")[0]
-                if item:
-                    one_disambiguation["title"] = item["title"]
-                    one_disambiguation["description"] = lis_item.text
-                    disambiguation.append(one_disambiguation)
-            raise DisambiguationError(getattr(self, 'title', page['title']), may_refer_to, disambiguation)
+            raise _disambiguation_error(getattr(self, 'title', page['title']), pageid, self.__title_query_param)
 
         else:
             self.pageid = pageid
             self.title = page['title']
             self.url = page['fullurl']
+            self._last_revision_id = page.get('lastrevid')
 
     def __continued_query(self, query_params):
         '''
@@ -764,6 +1482,125 @@ class WikipediaPage(object):
 
             last_continue = request['continue']
 
+    def __iter_continued(self, query_params, limit_param, limit, item):
+        '''
+        Yield item(datum) for each result of a continued query as the batches
+        arrive, skipping None, and stop requesting once `limit` items are yielded
+        '''
+        if limit is not None:
+            if limit <= 0:
+                return
+            if limit < MAX_QUERY_LIMIT:
+                query_params[limit_param] = limit
+
+        count = 0
+        for datum in self.__continued_query(query_params):
+            value = item(datum)
+            if value is None:
+                continue
+            yield value
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def __preload(self):
+        '''
+        Load all of the properties in as few requests as possible: one continued
+        query for the content, revision ids, coordinates, categories, references,
+        links, redirects and backlinks; then one each for the summary, images and sections.
+
+        Properties that the MediaWiki site does not support are skipped.
+        '''
+        global WIKIPEDIA_GLOBALS
+        version = WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR']
+        extensions = WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS']
+
+        props = list()
+        query_params = dict()
+        if not _cmp_major_minor(version, [1, 11]) and 'TextExtracts' in extensions:
+            props.append('extracts|revisions')
+            query_params.update({'explaintext': '', 'rvprop': 'ids'})
+        if 'GeoData' in extensions:
+            props.append('coordinates')
+            query_params['colimit'] = 'max'
+        if not _cmp_major_minor(version, [1, 14]):
+            props.append('categories')
+            query_params.update({'cllimit': 'max', 'clshow': '!hidden'})
+        if not _cmp_major_minor(version, [1, 13]):
+            props.append('extlinks|links')
+            query_params.update({'ellimit': 'max', 'pllimit': 'max', 'plnamespace': 0})
+        if not _cmp_major_minor(version, [1, 24]):
+            props.append('redirects')
+            query_params.update({'rdprop': 'title', 'rdlimit': 'max'})
+        if not _cmp_major_minor(version, [1, 9]):
+            query_params.update({
+                'list': 'backlinks',
+                'bltitle': self.title,
+                'bllimit': 'max',
+                'blfilterredir': 'nonredirects',
+                'blnamespace': 0
+            })
+        query_params['prop'] = '|'.join(props)
+        query_params.update(self.__title_query_param)
+
+        merged = dict((prop, list()) for prop in ('coordinates', 'categories', 'extlinks', 'links', 'redirects'))
+        backlinks = list()
+        extract = revisions = None
+        last_continue = dict()
+        while True:
+            params = query_params.copy()
+            params.update(last_continue)
+            request = _wiki_request(params)
+
+            if 'query' not in request:
+                break
+
+            page = request['query'].get('pages', dict()).get(self.pageid, dict())
+            extract = page.get('extract', extract)
+            revisions = page.get('revisions', revisions)
+            for prop, items in merged.items():
+                items.extend(page.get(prop, list()))
+            backlinks.extend(link['title'] for link in request['query'].get('backlinks', list()))
+
+            if 'continue' not in request:
+                break
+            last_continue = request['continue']
+
+        if 'extracts|revisions' in props:
+            self.__store_text('_content', extract)
+            self._revision_id = revisions[0]['revid']
+            self._parent_id = revisions[0]['parentid']
+        if 'coordinates' in props:
+            coordinates = merged['coordinates']
+            self._coordinates = (Decimal(coordinates[0]['lat']), Decimal(coordinates[0]['lon'])) if coordinates else None
+        if 'categories' in props:
+            self._categories = [self.__category_title(link) for link in merged['categories']]
+        if 'extlinks|links' in props:
+            self._references = [self.__reference_url(link) for link in merged['extlinks']]
+            self._links = [link['title'] for link in merged['links']]
+        if 'redirects' in props:
+            self._redirects = [link['title'] for link in merged['redirects']]
+        if 'list' in query_params:
+            self._backlinks = backlinks
+
+        for prop in ('summary', 'images', 'sections'):
+            try:
+                getattr(self, prop)
+            except (WikipediaAPIVersionError, WikipediaExtensionError):
+                pass
+
+    @staticmethod
+    def __reference_url(link):
+        ''' util function to return the full url of an extlinks entry '''
+        return link['*'] if link['*'].startswith('http') else 'http:' + link['*']
+
+    @staticmethod
+    def __category_title(link):
+        ''' util function to return the title of a category without the namespace '''
+        if link['title'].startswith('Category:'):
+            return link['title'][9:]
+        return link['title']
+
     @property
     def __title_query_param(self):
         ''' util function to determine which parameter method to use '''
@@ -797,9 +1634,9 @@ class WikipediaPage(object):
             }
 
             request = _wiki_request(query_params)
-            self._html = request['query']['pages'][self.pageid]['revisions'][0]['*']
+            self.__store_text('_html', request['query']['pages'][self.pageid]['revisions'][0]['*'])
 
-        return self._html
+        return self.__text('_html')
 
     @property
     def content(self):
@@ -827,11 +1664,49 @@ class WikipediaPage(object):
             }
             query_params.update(self.__title_query_param)
             request = _wiki_request(query_params)
-            self._content     = request['query']['pages'][self.pageid]['extract']
+            self.__store_text('_content', request['query']['pages'][self.pageid]['extract'])
             self._revision_id = request['query']['pages'][self.pageid]['revisions'][0]['revid']
             self._parent_id   = request['query']['pages'][self.pageid]['revisions'][0]['parentid']
 
-        return self._content
+        return self.__text('_content')
+
+    def __store_text(self, name, text):
+        ''' keep the text, compressed if compact pages are enabled '''
+        level = WIKIPEDIA_GLOBALS['COMPACT_PAGES']
+        setattr(self, name, CompressedText(text, level) if level is not None and text is not None else text)
+
+    def __text(self, name):
+        ''' the stored text, decompressed if needed '''
+        text = getattr(self, name)
+        return text.decode() if isinstance(text, CompressedText) else text
+
+    def compact(self, level=6):
+        '''
+        Compress the HTML and plain text content already loaded, dropping the
+        decompressed text and the section tree holding it; both are
+        decompressed on each later access.
+
+        Keyword arguments:
+
+        * level - the zlib compression level, from 1 (fastest) to 9 (smallest)
+        '''
+        for name in ('_html', '_content'):
+            text = getattr(self, name, None)
+            if text and not isinstance(text, CompressedText):
+                setattr(self, name, CompressedText(text, level))
+        self._section_tree = None
+
+    def memory_usage(self):
+        '''
+        Approximate number of bytes used by the page, as a dict of the bytes used
+        by the stored `html` and `content` (compressed or not) and the `total`
+        of all of the loaded data of the page
+        '''
+        return {
+            'html': approximate_size(self._html) if getattr(self, '_html', None) else 0,
+            'content': approximate_size(self._content) if getattr(self, '_content', None) else 0,
+            'total': approximate_size(self)
+        }
 
     @property
     def revision_id(self):
@@ -919,13 +1794,28 @@ class WikipediaPage(object):
         List of URLs of images on the page.
         '''
         if not getattr(self, '_images', False):
-            self._images = list()
-            for page in self.__continued_query({'generator': 'images', 'gimlimit': 'max', 'prop': 'imageinfo', 'iiprop': 'url'}):
-                if 'imageinfo' in page:
-                    self._images.append(page['imageinfo'][0]['url'])
+            self._images = list(self.iter_images())
 
         return self._images
 
+    def iter_images(self, limit=None):
+        '''
+        Iterate over the URLs of images on the page as they are loaded.
+
+        Keyword arguments:
+
+        * limit - the maximum number of URLs to return; None for all of them
+        '''
+        if getattr(self, '_images', None):
+            return islice(self._images, limit)
+
+        def image_url(page):
+            ''' pages without image info (e.g., missing files) are skipped '''
+            return page['imageinfo'][0]['url'] if 'imageinfo' in page else None
+
+        query_params = {'generator': 'images', 'gimlimit': 'max', 'prop': 'imageinfo', 'iiprop': 'url'}
+        return self.__iter_continued(query_params, 'gimlimit', limit, image_url)
+
     @property
     def coordinates(self):
         '''
@@ -935,12 +1825,12 @@ class WikipediaPage(object):
         '''
         global WIKIPEDIA_GLOBALS
 
-        if not getattr(self, '_coordinates', False):
-            self._coordinates = None
-
+        # None is a loaded value for pages without coordinates
+        if not hasattr(self, '_coordinates'):
             if 'GeoData' not in WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS']:
                 raise WikipediaExtensionError(WIKIPEDIA_GLOBALS['API_URL'], 'GeoData', 'coordinates')
 
+            self._coordinates = None
             # add geodata check here
             request = _wiki_request({'prop': 'coordinates', 'colimit': 'max', 'titles': self.title})
 
@@ -963,16 +1853,28 @@ class WikipediaPage(object):
         if not getattr(self, '_references', False):
             self._references = None
 
-            if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 13]):
-                raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.13", 'references')
-
-            self._references = list()
-            for link in self.__continued_query({'prop': 'extlinks', 'ellimit': 'max'}):
-                url = link['*'] if link['*'].startswith('http') else 'http:' + link['*']
-                self._references.append(url)
+            self._references = list(self.iter_references())
 
         return self._references
 
+    def iter_references(self, limit=None):
+        '''
+        Iterate over the URLs of external links on a page as they are loaded.
+
+        Keyword arguments:
+
+        * limit - the maximum number of URLs to return; None for all of them
+
+        .. note:: MediaWiki version >= 1.13
+        '''
+        global WIKIPEDIA_GLOBALS
+        if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 13]):
+            raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.13", 'references')
+
+        if getattr(self, '_references', None):
+            return islice(self._references, limit)
+        return self.__iter_continued({'prop': 'extlinks', 'ellimit': 'max'}, 'ellimit', limit, self.__reference_url)
+
     @property
     def links(self):
         '''
@@ -986,15 +1888,31 @@ class WikipediaPage(object):
         if not getattr(self, '_links', False):
             self._links = None
 
-            if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 13]):
-                raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.13", 'links')
-
-            self._links = list()
-            for link in self.__continued_query({'prop': 'links', 'plnamespace': 0, 'pllimit': 'max'}):
-                self._links.append(link['title'])
+            self._links = list(self.iter_links())
 
         return self._links
 
+    def iter_links(self, limit=None):
+        '''
+        Iterate over the titles of Wikipedia page links on a page as they are loaded.
+
+        Keyword arguments:
+
+        * limit - the maximum number of titles to return; None for all of them
+
+        .. note:: Only includes articles from namespace 0, meaning no Category, User talk, or other meta-Wikipedia pages.
+
+        .. note:: MediaWiki version >= 1.13
+        '''
+        global WIKIPEDIA_GLOBALS
+        if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 13]):
+            raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.13", 'links')
+
+        if getattr(self, '_links', None):
+            return islice(self._links, limit)
+        query_params = {'prop': 'links', 'plnamespace': 0, 'pllimit': 'max'}
+        return self.__iter_continued(query_params, 'pllimit', limit, lambda link: link['title'])
+
     @property
     def categories(self):
         '''
@@ -1006,18 +1924,29 @@ class WikipediaPage(object):
         if not getattr(self, '_categories', False):
             self._categories = None
 
-            if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 14]):
-                raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.14", 'categories')
-
-            self._categories = list()
-            for link in self.__continued_query({'prop': 'categories', 'cllimit': 'max', 'clshow': '!hidden'}):
-                if link['title'].startswith('Category:'):
-                    self._categories.append(link['title'][9:])
-                else:
-                    self._categories.append(link['title'])
+            self._categories = list(self.iter_categories())
 
         return self._categories
 
+    def iter_categories(self, limit=None):
+        '''
+        Iterate over the non-hidden categories of a page as they are loaded.
+
+        Keyword arguments:
+
+        * limit - the maximum number of categories to return; None for all of them
+
+        .. note:: MediaWiki version >= 1.14
+        '''
+        global WIKIPEDIA_GLOBALS
+        if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 14]):
+            raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.14", 'categories')
+
+        if getattr(self, '_categories', None):
+            return islice(self._categories, limit)
+        query_params = {'prop': 'categories', 'cllimit': 'max', 'clshow': '!hidden'}
+        return self.__iter_continued(query_params, 'cllimit', limit, self.__category_title)
+
     @property
     def redirects(self):
         '''
@@ -1029,15 +1958,29 @@ class WikipediaPage(object):
         if not getattr(self, '_redirects', False):
             self._redirects = None
 
-            if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 24]):
-                raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.24", 'redirects')
-
-            self._redirects = list()
-            for link in self.__continued_query({'prop': 'redirects','rdprop': 'title','rdlimit': '100'}):
-                self._redirects.append(link['title'])
+            self._redirects = list(self.iter_redirects())
 
         return self._redirects
 
+    def iter_redirects(self, limit=None):
+        '''
+        Iterate over the titles of all redirects to the page as they are loaded.
+
+        Keyword arguments:
+
+        * limit - the maximum number of titles to return; None for all of them
+
+        .. note:: MediaWiki version >= 1.24
+        '''
+        global WIKIPEDIA_GLOBALS
+        if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 24]):
+            raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.24", 'redirects')
+
+        if getattr(self, '_redirects', None):
+            return islice(self._redirects, limit)
+        query_params = {'prop': 'redirects', 'rdprop': 'title', 'rdlimit': '100'}
+        return self.__iter_continued(query_params, 'rdlimit', limit, lambda link: link['title'])
+
     @property
     def backlinks(self):
         '''
@@ -1045,34 +1988,116 @@ class WikipediaPage(object):
 
         .. note:: Only includes articles from namespace 0, meaning no Category, User talk, or other meta-Wikipedia pages.
 
+        .. note:: Loads every backlink; for heavily linked pages use `iter_backlinks`, `get_backlinks`, or `count_backlinks`
+
         .. note:: MediaWiki version >= 1.9
         '''
-        global WIKIPEDIA_GLOBALS
         if not getattr(self, '_backlinks', False):
             self._backlinks = None
+            self._backlinks = list(self.iter_backlinks())
+        return self._backlinks
 
-            if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 9]):
-                raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.9", 'backlinks')
+    def iter_backlinks(self, limit=None, namespace=0, filter_redirects='nonredirects', continuation=None):
+        '''
+        Iterate over the titles of the pages that link to this page as they are loaded.
 
-            query_params = {
-                'action': 'query',
-                'list': 'backlinks',
-                'bltitle': self.title,
-                'bllimit': 500, # as many as possible
-                'blfilterredir': 'nonredirects',
-                'blcontinue': dict(),
-                'blnamespace': 0
-            }
-            self._backlinks = list()
-            while True: # mimic the __continued_query function
-                results = _wiki_request(query_params)
-                for link in results['query']['backlinks']:
-                    self._backlinks.append(link['title'])
-                if results.get('continue', False) is False:
+        Keyword arguments:
+
+        * limit - the maximum number of titles to return; None for all of them
+        * namespace - the namespace (or list of namespaces) of the linking pages; None for all namespaces
+        * filter_redirects - one of `nonredirects`, `redirects`, or `all`
+        * continuation - the continuation returned by `get_backlinks` to resume from
+
+        .. note:: MediaWiki version >= 1.9
+        '''
+        # checks the arguments before the first title is requested
+        batches = self.__backlink_batches(limit, namespace, filter_redirects, continuation)
+        if getattr(self, '_backlinks', None) and (namespace, filter_redirects, continuation) == (0, 'nonredirects', None):
+            return islice(self._backlinks, limit)
+        return (link['title'] for links, _ in batches for link in links)
+
+    def get_backlinks(self, limit=MAX_QUERY_LIMIT, namespace=0, filter_redirects='nonredirects', continuation=None):
+        '''
+        Get one page of the titles of the pages that link to this page.
+
+        Keyword arguments:
+
+        * limit - the maximum number of titles to return; at least 1
+        * namespace - the namespace (or list of namespaces) of the linking pages; None for all namespaces
+        * filter_redirects - one of `nonredirects`, `redirects`, or `all`
+        * continuation - the continuation returned by a previous call to resume from
+
+        Returns a tuple of the list of titles and the continuation to pass to
+        the next call; the continuation is None once all backlinks are returned.
+
+        .. note:: MediaWiki version >= 1.9
+        '''
+        # no titles and no continuation would read as "all backlinks returned"
+        if limit is not None and limit < 1:
+            raise ValueError('limit must be at least 1')
+
+        titles = list()
+        last_continue = None
+        for links, last_continue in self.__backlink_batches(limit, namespace, filter_redirects, continuation):
+            titles.extend(link['title'] for link in links)
+        return titles, last_continue
+
+    def count_backlinks(self, threshold=None, namespace=0, filter_redirects='nonredirects'):
+        '''
+        Count the pages that link to this page without keeping their titles.
+
+        Keyword arguments:
+
+        * threshold - stop counting once this many backlinks are found; None to count all of them
+        * namespace - the namespace (or list of namespaces) of the linking pages; None for all namespaces
+        * filter_redirects - one of `nonredirects`, `redirects`, or `all`
+
+        .. note:: MediaWiki version >= 1.9
+        '''
+        return sum(len(links) for links, _ in self.__backlink_batches(threshold, namespace, filter_redirects, None))
+
+    def __backlink_batches(self, limit, namespace, filter_redirects, continuation):
+        '''
+        Check the arguments and return a generator of (backlinks, continuation)
+        for each request; the generator stops requesting once `limit` backlinks are returned
+        '''
+        global WIKIPEDIA_GLOBALS
+        if _cmp_major_minor(WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'], [1, 9]):
+            raise WikipediaAPIVersionError(WIKIPEDIA_GLOBALS['API_URL'], WIKIPEDIA_GLOBALS['API_VERSION'], "1.9", 'backlinks')
+        if filter_redirects not in ('nonredirects', 'redirects', 'all'):
+            raise ValueError('filter_redirects must be one of nonredirects, redirects, or all')
+
+        query_params = {
+            'list': 'backlinks',
+            'bltitle': self.title,
+            'blfilterredir': filter_redirects
+        }
+        if isinstance(namespace, (list, tuple)):
+            query_params['blnamespace'] = '|'.join('{0}'.format(ns) for ns in namespace)
+        elif namespace is not None:
+            query_params['blnamespace'] = namespace
+
+        def batches(last_continue):
+            remaining = limit
+            while remaining is None or remaining > 0:
+                params = query_params.copy()
+                params['bllimit'] = 'max' if remaining is None or remaining >= MAX_QUERY_LIMIT else remaining
+                params.update(last_continue or dict())
+
+                request = _wiki_request(params)
+                if 'error' in request:
+                    raise WikipediaException(request['error']['info'])
+
+                links = request['query']['backlinks']
+                last_continue = request.get('continue')
+                yield links, last_continue
+
+                if last_continue is None:
                     break
-                else:
-                    query_params['blcontinue'] = results['continue']['blcontinue']
-        return self._backlinks
+                if remaining is not None:
+                    remaining -= len(links)
+
+        return batches(continuation)
 
     @property
     def sections(self):
@@ -1091,33 +2116,312 @@ class WikipediaPage(object):
                 query_params['page'] = self.title
             request = _wiki_request(query_params)
             self._sections = [section['line'] for section in request['parse']['sections']]
+            # sections transcluded from templates have indexes such as "T-1" and cannot be fetched
+            self._section_indexes = dict()
+            for section in reversed(request['parse']['sections']):
+                if section['index'].isdigit():
+                    self._section_indexes[section['line']] = int(section['index'])
 
         return self._sections
 
-    def section(self, section_title):
+    def fetch_section(self, section):
+        '''
+        Get the plain text of a single section without loading the whole
+        content: only the rendered section is requested, with the parse API.
+        Returns None if the section isn't found, otherwise a whitespace stripped
+        string including the text of the subsections, in the same format as
+        ``section``: subsection headings are kept as "=== Title ===" lines.
+
+        Arguments:
+
+        * section - a section title from `self.sections`, or a section index (0 for the lead section)
+
+        .. note:: Fetched sections are cached by the page
+        '''
+        return self.fetch_sections([section])[section]
+
+    def fetch_sections(self, sections, workers=8):
+        '''
+        Get the plain text of several sections without loading the whole content,
+        as a dict of each section to its text (None if the section isn't found).
+        The sections not fetched before are requested concurrently.
+
+        Arguments:
+
+        * sections - a list of section titles from `self.sections` or section indexes (0 for the lead section)
+
+        Keyword arguments:
+
+        * workers - the maximum number of requests in flight at once
+
+        .. note:: Only missing sections are returned as None; other API errors are raised and not cached
+        '''
+        if not hasattr(self, '_fetched_sections'):
+            self._fetched_sections = dict()
+
+        indexes = dict()
+        for section in sections:
+            if isinstance(section, int):
+                indexes[section] = section
+            else:
+                self.sections
+                indexes[section] = self._section_indexes.get(section)
+
+        missing = sorted(set(index for index in indexes.values()
+                             if index is not None and index not in self._fetched_sections))
+        if len(missing) == 1:
+            self.__store_section(missing[0], self.__request_section(missing[0]))
+        elif missing:
+            executor = ThreadPoolExecutor(max_workers=min(workers, len(missing)))
+            try:
+                futures = [_submit(executor, self.__request_section, index) for index in missing]
+                for index, future in zip(missing, futures):
+                    self.__store_section(index, future.result())
+            finally:
+                executor.shutdown(wait=False)
+
+        texts = dict()
+        for section, index in indexes.items():
+            text = self._fetched_sections.get(index)
+            texts[section] = text.decode() if isinstance(text, CompressedText) else text
+        return texts
+
+    def __request_section(self, index):
+        '''
+        request the rendered section and convert it to plain text; None if there
+        is no such section, any other API error is raised
+        '''
+        query_params = {
+            'action': 'parse',
+            'prop': 'text',
+            'section': index,
+            'disableeditsection': ''
+        }
+        if not getattr(self, 'title', None):
+            query_params['pageid'] = self.pageid
+        else:
+            query_params['page'] = self.title
+        request = _wiki_request(query_params)
+        if 'error' in request:
+            if request['error'].get('code') == 'nosuchsection':
+                return None
+            if request['error']['info'] in ('HTTP request timed out.', 'Pool queue is full'):
+                raise HTTPTimeoutError(self.title)
+            raise WikipediaException(request['error']['info'])
+        return _html_to_text(request['parse']['text']['*'], strip_heading=index > 0)
+
+    def __store_section(self, index, text):
+        ''' cache the text of a fetched section, compressed if compact pages are enabled '''
+        level = WIKIPEDIA_GLOBALS['COMPACT_PAGES']
+        self._fetched_sections[index] = CompressedText(text, level) if level is not None and text else text
+
+    def section(self, section_title, include_subsections=True):
         '''
         Get the plain text content of a section from `self.sections`.
         Returns None if `section_title` isn't found, otherwise returns a whitespace stripped string.
 
         This is a convenience method that wraps self.content.
 
-        .. warning:: Calling `section` on a section that has subheadings will NOT return
-                     the full text of all of the subsections. It only gets the text between
-                     `section_title` and the next subheading, which is often empty.
-        '''
+        Keyword arguments:
 
-        section = u"== {0} ==".format(section_title)
-        try:
-            index = self.content.index(section) + len(section)
-        except ValueError:
+        * include_subsections - if True, include the text (and headings) of the subsections;
+                                otherwise only the text up to the first subheading
+
+        .. note:: The content is parsed into a section tree once; later lookups do not scan or
+                  decompress the content. The tree keeps the decompressed content until ``compact`` is called.
+
+        .. note:: Since version 1.4.5 the subsections are included by default; pass
+                  ``include_subsections=False`` for the text up to the first subheading
+        '''
+        section = self.__section_tree()[1].get(section_title)
+        if section is None:
             return None
+        return section.text(include_subsections)
+
+    @property
+    def section_tree(self):
+        '''
+        The root of the section tree of the plain text content: a ``WikipediaSection``
+        holding the lead text, with the top level sections as its `children`.
+        '''
+        return self.__section_tree()[0][0]
 
+    def iter_sections(self):
+        ''' Iterate over the sections of the plain text content in document order, as ``WikipediaSection`` '''
+        return iter(self.__section_tree()[0][1:])
+
+    def get_section(self, index):
+        '''
+        Get a section of the plain text content by its position: 0 is the lead
+        section and the headings are numbered from 1 in document order.
+        Returns a ``WikipediaSection``, or None if there is no such section.
+        '''
+        sections = self.__section_tree()[0]
+        return sections[index] if 0 <= index < len(sections) else None
+
+    def __section_tree(self):
+        ''' parse the content into sections once; returns the sections in order and a dict of title to section '''
+        if not getattr(self, '_section_tree', None):
+            self._section_tree = _parse_sections(self, self.content)
+        return self._section_tree
+
+
+class WikipediaPageHandle(object):
+    '''
+    Compact, hashable reference to a page: its title, pageid, url, and
+    revision id, stored in slots without a per-instance dict. Use it to keep
+    many pages in memory (or in sets and dict keys) and call ``page`` to get
+    the ``WikipediaPage`` with all of its properties when needed.
+
+    Arguments:
+
+    * title - the title of the page
+    * pageid - the pageid of the page
+
+    Keyword arguments:
+
+    * url - the url of the page
+    * revision_id - the id of the revision of the page
+    '''
+
+    __slots__ = ('title', 'pageid', 'url', 'revision_id')
+
+    def __init__(self, title, pageid, url=None, revision_id=None):
+        self.title = title
+        self.pageid = '{0}'.format(pageid)
+        self.url = url
+        self.revision_id = revision_id
+
+    def __repr__(self):
+        return stdout_encode(u'<WikipediaPageHandle \'{0}\'>'.format(self.title))
+
+    def __eq__(self, other):
         try:
-            next_index = self.content.index("==", index)
-        except ValueError:
-            next_index = len(self.content)
+            return (
+                self.pageid == other.pageid
+                and self.title == other.title
+                and self.url == other.url
+            )
+        except AttributeError as ex:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.pageid, self.title))
+
+    def __getstate__(self):
+        return (self.title, self.pageid, self.url, self.revision_id)
+
+    def __setstate__(self, state):
+        self.title, self.pageid, self.url, self.revision_id = state
+
+    def page(self):
+        '''
+        Get the ``WikipediaPage`` of the handle; no request is made until one of
+        its properties is accessed. The page is not kept by the handle.
+        '''
+        loaded = WikipediaPage.__new__(WikipediaPage)
+        loaded.original_title = self.title
+        loaded.pageid = self.pageid
+        loaded.title = self.title
+        loaded.url = self.url
+        loaded._last_revision_id = self.revision_id
+        return loaded
+
+
+class WikipediaSection(object):
+    '''
+    A section of the plain text content of a page.
+
+    * page - the WikipediaPage of the section
+    * title - the heading of the section; None for the lead section
+    * level - the heading level: 2 for "== Title ==", 3 for "=== Title ===", ...; 1 for the lead section
+    * index - the position of the section: 0 for the lead section, then from 1 in document order
+    * parent - the enclosing section; None for the lead section
+    * children - the direct subsections
+    '''
 
-        return self.content[index:next_index].lstrip("=").strip()
+    __slots__ = ('page', 'content', 'title', 'level', 'index', 'parent', 'children', 'start', 'end', 'subtree_end')
+
+    def __init__(self, page, content, title, level, index, parent, start):
+        self.page = page
+        # the decoded content shared by the whole tree, so the text is sliced without decompressing it
+        self.content = content
+        self.title = title
+        self.level = level
+        self.index = index
+        self.parent = parent
+        self.children = list()
+        self.start = start
+        self.end = None
+        self.subtree_end = None
+
+    def __repr__(self):
+        return stdout_encode(u'<WikipediaSection \'{0}\' level {1}>'.format(self.title, self.level))
+
+    def text(self, include_subsections=True):
+        '''
+        The whitespace stripped plain text of the section
+
+        Keyword arguments:
+
+        * include_subsections - if True, include the text (and headings) of the subsections
+        '''
+        end = self.subtree_end if include_subsections else self.end
+        return self.content[self.start:end].strip()
+
+
+def _html_to_text(html, strip_heading=False):
+    '''
+    Convert rendered HTML to plain text, leaving out the reference markers and
+    styles; if `strip_heading`, the leading section heading is left out too.
+    Headings are written as in the plain text content, e.g. "=== Title ===".
+    '''
+    start = clock()
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup.find_all(['style', 'script']) + soup.find_all('sup', class_='reference'):
+        tag.decompose()
+    headings = soup.find_all(re.compile(r'^h[1-6]$'))
+    if strip_heading and headings:
+        headings.pop(0).decompose()
+    for heading in headings:
+        marks = '=' * max(int(heading.name[1]), 2)
+        heading.replace_with('\n{0} {1} {0}\n'.format(marks, heading.get_text().strip()))
+    text = re.sub(r'\n{3,}', '\n\n', soup.get_text())
+    # as in the plain text content: two blank lines before a heading, none after it
+    text = re.sub(r'\n+(?=(={2,6}) .+ \1$)', '\n\n\n', text, flags=re.MULTILINE)
+    text = re.sub(r'^(={2,6} .+ ={2,6})\n+', '\\1\n', text, flags=re.MULTILINE).strip()
+    WIKIPEDIA_GLOBALS['METRICS'].record_html_parse(clock() - start)
+    return text
+
+def _parse_sections(page, content):
+    '''
+    Parse the headings of the plain text content of the page into a tree of
+    sections; returns the sections in document order (the lead section first)
+    and a dict of each title to its first section
+    '''
+    lead = WikipediaSection(page, content, None, 1, 0, None, 0)
+    sections = [lead]
+    by_title = dict()
+    open_sections = [lead]
+    for match in SECTION_HEADING.finditer(content):
+        level = len(match.group(1))
+        sections[-1].end = match.start()
+        while open_sections[-1].level >= level:
+            open_sections.pop().subtree_end = match.start()
+        parent = open_sections[-1]
+        section = WikipediaSection(page, content, match.group(2), level, len(sections), parent, match.end())
+        parent.children.append(section)
+        sections.append(section)
+        open_sections.append(section)
+        by_title.setdefault(section.title, section)
+
+    sections[-1].end = len(content)
+    for section in open_sections:
+        section.subtree_end = len(content)
+    return sections, by_title
 
 def _get_site_info():
     '''
@@ -1128,14 +2432,19 @@ def _get_site_info():
         'meta': 'siteinfo',
         'siprop': 'extensions|general'
     })
-    WIKIPEDIA_GLOBALS['API_VERSION'] = response['query']['general']['generator'].split(" ")[1].split("-")[0]
-    major_minor = WIKIPEDIA_GLOBALS['API_VERSION'].split('.')
+    api_version = response['query']['general']['generator'].split(" ")[1].split("-")[0]
+    major_minor = api_version.split('.')
     for i, item in enumerate(major_minor):
         major_minor[i] = int(item)
-    WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = major_minor
-    WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'] = set()
+    extensions = set()
     for ext in response['query']['extensions']:
-        WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'].add(ext['name'])
+        extensions.add(ext['name'])
+
+    # API_VERSION_MAJOR_MINOR is checked to see if the site info is loaded;
+    # set it last so other threads never see a partially loaded site
+    WIKIPEDIA_GLOBALS['API_VERSION'] = api_version
+    WIKIPEDIA_GLOBALS['INSTALLED_EXTENSIONS'] = extensions
+    WIKIPEDIA_GLOBALS['API_VERSION_MAJOR_MINOR'] = major_minor
 
 @cache
 def languages():
@@ -1170,41 +2479,99 @@ def donate():
     webbrowser.open('https://donate.wikimedia.org/w/index.php?title=Special:FundraiserLandingPage', new=2)
 
 
-def _wiki_request(params):
+def _wiki_request(params, api_url=None):
     '''
     Make a request to the Wikipedia API using the given search parameters.
     Returns a parsed dict of the JSON response.
+
+    Keyword arguments:
+
+    * api_url - the API URL to request instead of the one in use
     '''
     global WIKIPEDIA_GLOBALS
 
-    rate_limit = WIKIPEDIA_GLOBALS['RATE_LIMIT']
-    last_call = WIKIPEDIA_GLOBALS['RATE_LIMIT_LAST_CALL']
-    wait = WIKIPEDIA_GLOBALS['RATE_LIMIT_MIN_WAIT']
-    url = WIKIPEDIA_GLOBALS['API_URL']
+    url = api_url or WIKIPEDIA_GLOBALS['API_URL']
 
     params['format'] = 'json'
     if not 'action' in params:
         params['action'] = 'query'
 
-    if rate_limit and last_call and last_call + wait > datetime.now():
-        # it hasn't been long enough since the last API call
-        # so wait until we're in the clear to make the request
-        wait_time = (last_call + wait) - datetime.now()
-        time.sleep(int(wait_time.total_seconds()))
-        disambiguation = list()
-        for lis_item in filtered_lis:
-            one_disambiguation = dict()
-            item = lis_item.find_all("a")[0]
-            if item:
-                one_disambiguation["title"] = item["title"]
-                one_disambiguation["description"] = lis_item.text
-                disambiguation.append(one_disambiguation)
-    if WIKIPEDIA_GLOBALS['SESSION'] is None:
-        reset_session()
-
-    r = WIKIPEDIA_GLOBALS['SESSION'].get(url, params=params, timeout=WIKIPEDIA_GLOBALS['TIMEOUT'])
-
-    if rate_limit:
-        WIKIPEDIA_GLOBALS['RATE_LIMIT_LAST_CALL'] = datetime.now()
-
-    return r.json()
+    response_cache = WIKIPEDIA_GLOBALS['RESPONSE_CACHE']
+    if response_cache is not None:
+        content = response_cache.get(url, params)
+        if content is not None:
+            WIKIPEDIA_GLOBALS['METRICS'].record_cache_hit()
+            start = clock()
+            response = WIKIPEDIA_GLOBALS['JSON_DECODER'](content)
+            WIKIPEDIA_GLOBALS['METRICS'].record_json_decode(clock() - start)
+            return response
+
+    r, response = _send_request(url, params)
+
+    # do not persist errors such as timeouts or a full pool queue
+    if response_cache is not None and 'error' not in response:
+        response_cache.set(url, params, r.content, r.status_code)
+
+    return response
+
+def _send_request(url, params):
+    '''
+    Send the request to the API, retrying transient failures according to the
+    retry policy in use. Returns the HTTP response and its parsed JSON.
+    '''
+    global WIKIPEDIA_GLOBALS
+
+    retry_policy = get_retry_policy()
+    metrics = WIKIPEDIA_GLOBALS['METRICS']
+    headers = {'User-Agent': WIKIPEDIA_GLOBALS['USER_AGENT']}
+    attempt = 0
+    waited = 0.0
+    while True:
+        if WIKIPEDIA_GLOBALS['RATE_LIMIT']:
+            limiter = _get_rate_limiter(url)
+            if limiter is not None:
+                metrics.record_rate_limit_wait(limiter.acquire())
+
+        pre_hook = WIKIPEDIA_GLOBALS['PRE_REQUEST_HOOK']
+        post_hook = WIKIPEDIA_GLOBALS['POST_REQUEST_HOOK']
+        if pre_hook is not None:
+            pre_hook(url, params)
+
+        transport = get_transport()
+        start = clock()
+        try:
+            r = transport.send(url, params, headers=headers, timeout=WIKIPEDIA_GLOBALS['TIMEOUT'])
+        except transport.errors:
+            elapsed = clock() - start
+            metrics.record_request(params, elapsed, 0, failed=True)
+            if post_hook is not None:
+                post_hook(url, params, None, elapsed)
+            delay = retry_policy.delay(attempt, waited)
+            if delay is None:
+                raise
+        else:
+            elapsed = clock() - start
+            metrics.record_request(params, elapsed, len(r.content), failed=r.status_code >= 400)
+            if post_hook is not None:
+                post_hook(url, params, r, elapsed)
+
+            # 5xx responses are usually HTML error pages; only parse them if retries are exhausted
+            response = None if r.status_code in retry_policy.status_codes else _decode(r)
+            if response is not None and not retry_policy.is_retryable(response):
+                return r, response
+
+            delay = retry_policy.delay(attempt, waited, r.headers.get('Retry-After'))
+            if delay is None:
+                return r, (_decode(r) if response is None else response)
+
+        metrics.record_retry()
+        time.sleep(delay)
+        waited += delay
+        attempt += 1
+
+def _decode(r):
+    ''' Parse the JSON body of the HTTP response with the JSON decoder in use, timing the decoding '''
+    start = clock()
+    response = WIKIPEDIA_GLOBALS['JSON_DECODER'](r.content)
+    WIKIPEDIA_GLOBALS['METRICS'].record_json_decode(clock() - start)
+    return response